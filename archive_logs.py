@@ -0,0 +1,115 @@
+import argparse
+import datetime
+import gzip
+import os
+import re
+import sys
+
+import db
+
+# Monthly maintenance for the partitioned change logs: create the coming
+# months' partitions, then move months older than the retention window out
+# of the database into gzipped CSV files.
+#
+# usage:
+#   python archive_logs.py                       # keep 24 months, files in ./log_archive
+#   python archive_logs.py --keep-months 12 --dir /var/backups/bread
+#   python archive_logs.py --dry-run             # list what would be archived
+#
+# Each month is detached, written out and dropped in one transaction, so a
+# failed export leaves the partition attached. An existing archive file is
+# never overwritten.
+
+LOGS = ['cost_change_log', 'standing_change_log', 'product_ingredients_changes']
+
+PARTITIONS_SQL = """
+SELECT c.relname
+  FROM pg_inherits AS i
+  JOIN pg_class AS c ON i.inhrelid = c.oid
+ WHERE i.inhparent = %s::regclass
+ ORDER BY c.relname
+"""
+
+
+def month_of(partition):
+    match = re.search(r'_y(\d{4})m(\d{2})$', partition)
+    if match is None:
+        return None
+    return datetime.date(int(match.group(1)), int(match.group(2)), 1)
+
+
+def cutoff(keep_months, today=None):
+    """First day of the oldest month to keep."""
+    today = today or datetime.date.today()
+    months = today.year * 12 + today.month - 1 - keep_months
+    return datetime.date(months // 12, months % 12 + 1, 1)
+
+
+def archive(conn, log, partition, directory):
+    path = os.path.join(directory, f"{partition}.csv.gz")
+    if os.path.exists(path):
+        raise FileExistsError(path)
+    with conn.cursor() as cursor:
+        cursor.execute(f'ALTER TABLE "{log}" DETACH PARTITION "{partition}"')
+        cursor.execute(f'SELECT count(*) FROM "{partition}"')
+        rows = cursor.fetchone()[0]
+        try:
+            with gzip.open(path, 'wt', newline='') as f:
+                cursor.copy_expert(f'COPY "{partition}" TO STDOUT WITH (FORMAT csv, HEADER)', f)
+                f.flush()
+                os.fsync(f.fileno())
+        except BaseException:
+            if os.path.exists(path):
+                os.remove(path)
+            raise
+        cursor.execute(f'DROP TABLE "{partition}"')
+    return path, rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Partition upkeep and archival for the change logs")
+    parser.add_argument('--keep-months', type=int, default=24,
+                        help="months of history to keep in the database (default 24)")
+    parser.add_argument('--ahead', type=int, default=3,
+                        help="future months to create partitions for (default 3)")
+    parser.add_argument('--dir', default='log_archive', help="where archive files go")
+    parser.add_argument('--dry-run', action='store_true',
+                        help="list partitions that would be archived and change nothing")
+    args = parser.parse_args(argv)
+
+    oldest_kept = cutoff(args.keep_months)
+    with db.connection() as conn:
+        if not args.dry_run:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT create_log_partitions(%s)", (args.ahead,))
+                print(f"created {cursor.fetchone()[0]} partitions")
+            conn.commit()
+            os.makedirs(args.dir, exist_ok=True)
+
+        for log in LOGS:
+            with conn.cursor() as cursor:
+                cursor.execute(PARTITIONS_SQL, (log,))
+                partitions = [row[0] for row in cursor.fetchall()]
+            for partition in partitions:
+                month = month_of(partition)
+                if month is None or month >= oldest_kept:
+                    continue
+                if args.dry_run:
+                    print(f"would archive {partition}")
+                    continue
+                try:
+                    path, rows = archive(conn, log, partition, args.dir)
+                except Exception as error:
+                    conn.rollback()
+                    print(f"failed {partition}: {error}", file=sys.stderr)
+                    return 1
+                conn.commit()
+                print(f"archived {partition}: {rows} rows -> {path}")
+    return 0
+
+
+if __name__ == '__main__':
+    try:
+        sys.exit(main())
+    finally:
+        db.close_all()
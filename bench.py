@@ -0,0 +1,177 @@
+import argparse
+import datetime
+import json
+import math
+import sys
+import time
+
+import db
+
+# Latency percentiles and EXPLAIN (ANALYZE, BUFFERS) plans for the formula,
+# order and directory functions and views. Load some volume first with
+# gen_data.py, then:
+#
+# usage:
+#   python bench.py                          # every case, results to bench-<time>.json
+#   python bench.py --runs 50 --only formula --only phone_book
+#   python bench.py --out before.json
+#
+# Parameters (a product with dough on today's plan, a mod, a name prefix)
+# are picked from whatever data is loaded, so runs on the same database are
+# comparable.
+
+FIXTURES_SQL = {
+    'product': """SELECT product_name FROM todays_batch_weights
+                   ORDER BY batch_weight DESC, product_name LIMIT 1""",
+    'any_product': "SELECT product_name FROM products ORDER BY product_name LIMIT 1",
+    'mod': """SELECT pr.product_name, dm.mod_name
+                FROM dough_mods AS dm
+                JOIN products AS pr ON dm.product_id = pr.product_id
+               ORDER BY dm.mod_name LIMIT 1""",
+    'party': "SELECT party_name FROM parties ORDER BY party_name LIMIT 1",
+    'phone': """SELECT phone_no FROM phones WHERE phone_e164 IS NOT NULL
+                 ORDER BY phone_no LIMIT 1""",
+    'hold': """SELECT customer_id, product_id, shape_id, lower(hold)
+                FROM tmp_chng ORDER BY start_date LIMIT 1""",
+}
+
+# name -> (sql, function building its parameters from the fixtures)
+CASES = {
+    'formula': ("SELECT * FROM formula(%s)", lambda f: (f['product'],)),
+    'formula_all': ("SELECT * FROM formula_all()", lambda f: ()),
+    'modded_formula': ("SELECT * FROM modded_formula(%s, %s)", lambda f: f['mod']),
+    'variant_formulas': ("SELECT * FROM variant_formulas(%s)", lambda f: (f['mod'][0],)),
+    'get_batch_weight': ("SELECT get_batch_weight(%s)", lambda f: (f['product'],)),
+    'phone_book': ("SELECT * FROM phone_book", lambda f: ()),
+    'phone_search': ("SELECT * FROM phone_search(%s)", lambda f: (f['party'][:3] + '%',)),
+    'lookup_by_phone': ("SELECT * FROM lookup_by_phone(%s)", lambda f: (f['phone'],)),
+    'fuzzy_search': ("SELECT * FROM fuzzy_search(%s)", lambda f: (f['party'],)),
+    'todays_adjusted_so': ("SELECT * FROM todays_adjusted_so", lambda f: ()),
+    'todays_combined_spec_standing': ("SELECT * FROM todays_combined_spec_standing",
+                                      lambda f: ()),
+    'todays_plan': ("SELECT * FROM todays_plan", lambda f: ()),
+    'hold_multiplier': ("SELECT hold_multiplier(%s, %s, %s, %s)", lambda f: f['hold']),
+    'production_forecast_week': (
+        "SELECT * FROM production_forecast(now()::date, now()::date + 6)", lambda f: ()),
+    'ingredient_demand_week': (
+        "SELECT * FROM ingredient_demand(now()::date, now()::date + 6)", lambda f: ()),
+}
+
+COUNTED_TABLES = ['parties', 'phones', 'products', 'ingredients', 'product_ingredients',
+                  'dough_mods', 'standing_weekly', 'standing_orders', 'tmp_chng',
+                  'special_orders']
+
+
+def percentile(sorted_ms, pct):
+    """Nearest-rank percentile of an ascending list."""
+    rank = max(1, math.ceil(pct / 100 * len(sorted_ms)))
+    return sorted_ms[rank - 1]
+
+
+def fixtures(cursor):
+    found = {}
+    for key, sql in FIXTURES_SQL.items():
+        cursor.execute(sql)
+        row = cursor.fetchone()
+        found[key] = row if key in ('mod', 'hold') else (row[0] if row else None)
+    found['product'] = found['product'] or found['any_product']
+    return found
+
+
+def buffers(plan):
+    """Shared buffer hits and reads for the whole query.
+
+    EXPLAIN's counts for a node already include its children, so the top
+    node's are the query's totals.
+    """
+    return plan.get('Shared Hit Blocks', 0), plan.get('Shared Read Blocks', 0)
+
+
+def run_case(cursor, sql, params, runs, warmup):
+    for _ in range(warmup):
+        cursor.execute(sql, params)
+        cursor.fetchall()
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        cursor.execute(sql, params)
+        rows = len(cursor.fetchall())
+        times.append((time.perf_counter() - start) * 1000)
+    times.sort()
+
+    cursor.execute("EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) " + sql, params)
+    explained = cursor.fetchone()[0]
+    if isinstance(explained, str):
+        explained = json.loads(explained)
+    hit, read = buffers(explained[0]['Plan'])
+    return {
+        'rows': rows,
+        'runs': runs,
+        'min_ms': round(times[0], 3),
+        'p50_ms': round(percentile(times, 50), 3),
+        'p95_ms': round(percentile(times, 95), 3),
+        'p99_ms': round(percentile(times, 99), 3),
+        'max_ms': round(times[-1], 3),
+        'shared_hit': hit,
+        'shared_read': read,
+        'plan': explained,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the bread SQL functions and views")
+    parser.add_argument('--runs', type=int, default=20, help="timed runs per case")
+    parser.add_argument('--warmup', type=int, default=3, help="untimed runs per case")
+    parser.add_argument('--only', action='append', metavar='CASE', choices=sorted(CASES),
+                        help="run just this case (repeatable)")
+    parser.add_argument('--out', help="where to write the JSON results")
+    args = parser.parse_args(argv)
+    if args.runs < 1:
+        parser.error("--runs must be at least 1")
+    if args.warmup < 0:
+        parser.error("--warmup can't be negative")
+
+    started = datetime.datetime.now()
+    out = args.out or f"bench-{started:%Y%m%d-%H%M%S}.json"
+    results = {'started': started.isoformat(timespec='seconds'), 'cases': {}}
+
+    with db.connection() as conn:
+        with conn.cursor() as cursor:
+            cursor.execute("SHOW server_version")
+            results['server_version'] = cursor.fetchone()[0]
+            results['row_counts'] = {}
+            for table in COUNTED_TABLES:
+                cursor.execute(f"SELECT count(*) FROM {table}")
+                results['row_counts'][table] = cursor.fetchone()[0]
+            found = fixtures(cursor)
+            results['fixtures'] = found
+
+            print(f"{'case':<32}{'rows':>8}{'p50':>10}{'p95':>10}{'p99':>10}"
+                  f"{'hit':>10}{'read':>8}")
+            for name in args.only or CASES:
+                sql, make_params = CASES[name]
+                try:
+                    params = make_params(found)
+                except TypeError:
+                    params = None
+                if params is None or None in params:
+                    print(f"{name:<32} skipped, no data for its parameters")
+                    continue
+                case = run_case(cursor, sql, params, args.runs, args.warmup)
+                results['cases'][name] = case
+                print(f"{name:<32}{case['rows']:>8}{case['p50_ms']:>10.2f}"
+                      f"{case['p95_ms']:>10.2f}{case['p99_ms']:>10.2f}"
+                      f"{case['shared_hit']:>10}{case['shared_read']:>8}")
+        conn.rollback()
+
+    with open(out, 'w') as f:
+        json.dump(results, f, indent=2, default=str)
+    print(f"results written to {out}")
+    return 0
+
+
+if __name__ == '__main__':
+    try:
+        sys.exit(main())
+    finally:
+        db.close_all()
@@ -0,0 +1,140 @@
+--benchmark: 10k-row UPDATEs through the statement-level audit triggers
+--against the old one-call-per-row versions
+--usage: psql -d bread -f benchmarks/audit_trigger_bench.sql
+--seeds 60k rows each of ingredient_costs and product_ingredients in six
+--10k slices (a row can only be logged once per transaction, since the log
+--keys end in now()), times each variant on its own slices, checks both
+--wrote the same number of log rows, then rolls everything back.
+--standing orders are now one row per week; see standing_weekly_bench.sql.
+
+BEGIN;
+
+INSERT INTO parties (party_type, party_name)
+SELECT 'o', 'bench party ' || n
+  FROM generate_series(1, 600) AS n;
+
+INSERT INTO ingredients (ingredient_name, is_flour)
+SELECT 'bench ingredient ' || n, n % 5 = 0
+  FROM generate_series(1, 100) AS n;
+
+INSERT INTO products (product_name, lead_time_days, is_dough)
+SELECT 'bench product ' || n, 1, true
+  FROM generate_series(1, 600) AS n;
+
+CREATE TEMP TABLE bench_parties AS
+SELECT party_id, party_type, row_number() OVER (ORDER BY party_id) AS n
+  FROM parties WHERE party_name LIKE 'bench party %';
+CREATE TEMP TABLE bench_ingredients AS
+SELECT ingredient_id FROM ingredients WHERE ingredient_name LIKE 'bench ingredient %';
+CREATE TEMP TABLE bench_products AS
+SELECT product_id FROM products WHERE product_name LIKE 'bench product %';
+
+INSERT INTO ingredient_costs (ingredient_id, maker_id, mio, seller_id, sio, cost, grams)
+SELECT i.ingredient_id, p.party_id, p.party_type, p.party_id, p.party_type,
+       1 + random() * 20, 1000
+  FROM bench_ingredients AS i
+ CROSS JOIN bench_parties AS p
+ WHERE p.n <= 600;
+
+INSERT INTO product_ingredients (product_id, ingredient_id, bakers_percent)
+SELECT pr.product_id, i.ingredient_id, 1 + (random() * 50)::int
+  FROM bench_products AS pr
+ CROSS JOIN bench_ingredients AS i;
+
+--slice 0-2 for the statement triggers, 3-5 for the row triggers
+CREATE TEMP TABLE cost_slices AS
+SELECT ingredient_id, maker_id, seller_id,
+       (row_number() OVER (ORDER BY ingredient_id, seller_id) - 1) % 6 AS slice
+  FROM ingredient_costs
+ WHERE ingredient_id IN (SELECT ingredient_id FROM bench_ingredients);
+CREATE TEMP TABLE di_slices AS
+SELECT product_id, ingredient_id,
+       (row_number() OVER (ORDER BY product_id, ingredient_id) - 1) % 6 AS slice
+  FROM product_ingredients
+ WHERE product_id IN (SELECT product_id FROM bench_products);
+
+ANALYZE ingredient_costs;
+ANALYZE product_ingredients;
+
+--the row-level audit path as it was before the statement triggers
+CREATE FUNCTION pg_temp.row_cost_audit()
+       RETURNS trigger AS
+    $$
+    BEGIN
+        IF NEW.cost <> OLD.cost OR NEW.grams <> OLD.grams THEN
+            INSERT INTO cost_change_log (ingredient_id, maker_id, mio, seller_id, sio,
+                        old_cost, new_cost, old_grams, new_grams, change_time)
+            VALUES (OLD.ingredient_id, OLD.maker_id, OLD.mio, OLD.seller_id, OLD.sio,
+                    OLD.cost, NEW.cost, OLD.grams, NEW.grams, now());
+        END IF;
+        PERFORM refresh_unit_cost(ARRAY[NEW.ingredient_id]);
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql;
+
+CREATE TRIGGER bench_cost_row AFTER UPDATE ON ingredient_costs
+   FOR EACH ROW EXECUTE PROCEDURE pg_temp.row_cost_audit();
+CREATE TRIGGER bench_di_row AFTER UPDATE ON product_ingredients
+   FOR EACH ROW EXECUTE PROCEDURE record_if_di_changed();
+
+ALTER TABLE ingredient_costs DISABLE TRIGGER bench_cost_row;
+ALTER TABLE product_ingredients DISABLE TRIGGER bench_di_row;
+
+CREATE TEMP TABLE bench_times (test_name text, ms numeric);
+CREATE TEMP TABLE bench_logged (variant text, log text, n bigint);
+
+CREATE FUNCTION pg_temp.time_updates(variant text, first_slice int)
+       RETURNS void AS
+    $$
+    DECLARE
+        t0 timestamptz;
+        c0 bigint;
+        d0 bigint;
+    BEGIN
+        SELECT count(*) INTO c0 FROM cost_change_log;
+        SELECT count(*) INTO d0 FROM product_ingredients_changes;
+        FOR s IN first_slice..first_slice + 2 LOOP
+            t0 := clock_timestamp();
+            UPDATE ingredient_costs AS ic SET cost = ic.cost + 0.01
+              FROM cost_slices AS cs
+             WHERE cs.slice = s AND ic.ingredient_id = cs.ingredient_id
+               AND ic.maker_id = cs.maker_id AND ic.seller_id = cs.seller_id;
+            INSERT INTO bench_times VALUES ('ingredient_costs 10k ' || variant,
+                   extract(epoch FROM clock_timestamp() - t0) * 1000);
+
+            t0 := clock_timestamp();
+            UPDATE product_ingredients AS di SET bakers_percent = di.bakers_percent + 1
+              FROM di_slices AS ds
+             WHERE ds.slice = s AND di.product_id = ds.product_id
+               AND di.ingredient_id = ds.ingredient_id;
+            INSERT INTO bench_times VALUES ('product_ingredients 10k ' || variant,
+                   extract(epoch FROM clock_timestamp() - t0) * 1000);
+        END LOOP;
+        INSERT INTO bench_logged
+        SELECT variant, 'cost_change_log', count(*) - c0 FROM cost_change_log
+         UNION ALL
+        SELECT variant, 'product_ingredients_changes', count(*) - d0
+          FROM product_ingredients_changes;
+    END;
+    $$ LANGUAGE plpgsql;
+
+SELECT pg_temp.time_updates('statement', 0);
+
+ALTER TABLE ingredient_costs DISABLE TRIGGER cost_update;
+ALTER TABLE ingredient_costs ENABLE TRIGGER bench_cost_row;
+ALTER TABLE product_ingredients DISABLE TRIGGER di_update;
+ALTER TABLE product_ingredients ENABLE TRIGGER bench_di_row;
+
+SELECT pg_temp.time_updates('row', 3);
+
+SELECT test_name,
+       ROUND(percentile_cont(0.5) WITHIN GROUP (ORDER BY ms)::numeric, 3) AS median,
+       ROUND(max(ms), 3) AS max
+  FROM bench_times
+ GROUP BY test_name
+ ORDER BY test_name;
+
+--both variants should log 30000 rows per table
+SELECT log, variant, n FROM bench_logged ORDER BY log, variant;
+
+ROLLBACK;
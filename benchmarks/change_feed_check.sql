@@ -0,0 +1,49 @@
+--check: bake_change payloads stay under the 8000-byte NOTIFY limit
+--usage: psql -d bread -f benchmarks/change_feed_check.sql
+--builds payloads for growing numbers of products and bake dates, then
+--writes 200 products x 170 delivery dates of special orders in one INSERT,
+--which used to fail with "payload string too long"; everything is rolled
+--back at the end
+
+BEGIN;
+
+--bytes should never pass 7900; dates, then products, go null as it grows
+SELECT c.products, c.dates, octet_length(pl.payload) AS bytes,
+       pl.payload::json -> 'dates' = 'null'::json AS dates_null,
+       pl.payload::json -> 'products' = 'null'::json AS products_null
+  FROM (VALUES (1, 1), (10, 7), (150, 7), (150, 180), (180, 0), (300, 180))
+       AS c (products, dates)
+ CROSS JOIN LATERAL
+       (SELECT bake_change_payload(
+               'special_orders',
+               ARRAY(SELECT gen_random_uuid() FROM generate_series(1, c.products)),
+               ARRAY(SELECT now()::date + k FROM generate_series(1, c.dates) AS k)))
+       AS pl (payload)
+ ORDER BY c.products, c.dates;
+
+INSERT INTO parties (party_type, party_name) VALUES ('o', 'feed check customer');
+
+INSERT INTO shapes (shape_name) VALUES ('feed check shape');
+
+INSERT INTO products (product_name, lead_time_days, is_dough)
+SELECT 'feed check product ' || n, 1, TRUE
+  FROM generate_series(1, 200) AS n;
+
+INSERT INTO product_shapes (product_id, shape_id, grams)
+SELECT pr.product_id, sid('feed check shape'), 500
+  FROM products AS pr
+ WHERE pr.product_name LIKE 'feed check product %';
+
+--one statement, 200 products, 170 bake dates: must not raise
+INSERT INTO special_orders (delivery_date, customer_id, io, product_id, shape_id, amt)
+SELECT now()::date + k, pid('feed check customer'), 'o', pr.product_id,
+       sid('feed check shape'), 1
+  FROM products AS pr
+ CROSS JOIN generate_series(1, 170) AS k
+ WHERE pr.product_name LIKE 'feed check product %';
+
+SELECT count(*) AS special_orders_written
+  FROM special_orders
+ WHERE customer_id = pid('feed check customer');
+
+ROLLBACK;
@@ -0,0 +1,76 @@
+--benchmark: production_forecast() over the 6 month special order horizon
+--usage: psql -d bread -f benchmarks/forecast_bench.sql
+--seeds 500 standing-order customers plus holds and special orders,
+--times the forecast, then rolls everything back
+
+BEGIN;
+
+INSERT INTO parties (party_type, party_name)
+SELECT 'o', 'bench customer ' || n
+  FROM generate_series(1, 500) AS n;
+
+--each day ordered with even odds; the WHERE on p makes the array be drawn
+--per row
+INSERT INTO standing_weekly (customer_id, io, product_id, shape_id, amts)
+SELECT w.*
+  FROM (SELECT p.party_id, p.party_type, ps.product_id, ps.shape_id,
+               ARRAY(SELECT CASE WHEN random() < 0.5 THEN 1 + (random() * 5)::int END
+                       FROM generate_series(0, 6)
+                      WHERE p.party_id IS NOT NULL) AS amts
+          FROM parties AS p
+         CROSS JOIN product_shapes AS ps
+         WHERE p.party_name LIKE 'bench customer %') AS w
+ WHERE cardinality(array_remove(w.amts, NULL)) > 0;
+
+INSERT INTO tmp_chng (day_of_week, customer_id, product_id, shape_id,
+            start_date, resume_date, percent_multiplier)
+SELECT so.day_of_week, so.customer_id, so.product_id, so.shape_id,
+       now()::date + 30, now()::date + 45, 50
+  FROM standing_orders AS so
+  JOIN parties AS p ON so.customer_id = p.party_id
+ WHERE p.party_name LIKE 'bench customer %'
+   AND random() < 0.2;
+
+INSERT INTO special_orders (delivery_date, customer_id, io, product_id,
+            shape_id, amt)
+SELECT DISTINCT ON (1, 2, 4, 5)
+       now()::date + (random() * 170)::int, p.party_id, p.party_type,
+       ps.product_id, ps.shape_id, 1 + (random() * 10)::int
+  FROM parties AS p
+ CROSS JOIN product_shapes AS ps
+ CROSS JOIN generate_series(1, 4)
+ WHERE p.party_name LIKE 'bench customer %';
+
+ANALYZE standing_weekly;
+ANALYZE tmp_chng;
+ANALYZE special_orders;
+
+CREATE TEMP TABLE bench_times (test_name text, ms numeric);
+
+DO $$
+DECLARE
+    t0 timestamptz;
+BEGIN
+    FOR i IN 1..5 LOOP
+        t0 := clock_timestamp();
+        PERFORM * FROM production_forecast(now()::date, now()::date + 6);
+        INSERT INTO bench_times VALUES ('production_forecast 1 week',
+               extract(epoch FROM clock_timestamp() - t0) * 1000);
+
+        t0 := clock_timestamp();
+        PERFORM * FROM production_forecast(now()::date,
+                       (now()::date + interval '6 months')::date);
+        INSERT INTO bench_times VALUES ('production_forecast 6 months',
+               extract(epoch FROM clock_timestamp() - t0) * 1000);
+    END LOOP;
+END;
+$$;
+
+SELECT test_name,
+       ROUND(percentile_cont(0.5) WITHIN GROUP (ORDER BY ms)::numeric, 3) AS median,
+       ROUND(max(ms), 3) AS max
+  FROM bench_times
+ GROUP BY test_name
+ ORDER BY test_name;
+
+ROLLBACK;
@@ -0,0 +1,108 @@
+--benchmark: formula() before and after the single-pass rewrite
+--usage: psql -d bread -f benchmarks/formula_bench.sql
+--seeds a few hundred extra standing-order customers, checks that the new
+--formula() and formula_all() return exactly what the old formula() did,
+--then times them; everything is rolled back at the end
+
+BEGIN;
+
+--the formula() definition from before the rewrite
+CREATE FUNCTION pg_temp.formula_old(my_product VARCHAR)
+       RETURNS TABLE (product character varying, "%" numeric, ingredient character varying,
+       overall numeric, sour numeric, poolish numeric, soaker numeric, final numeric, cost numeric) AS $$
+       BEGIN
+             RETURN QUERY
+                    SELECT din.product_name, din.bakers_percent, din.ingredient,
+                    ROUND(get_batch_weight(my_product) * din.bakers_percent /
+                          bak_per(my_product), 0),
+                    ROUND(get_batch_weight(my_product) * din.bakers_percent /
+                          bak_per(my_product) * din.percent_in_sour /100, 0),
+                    ROUND(get_batch_weight(my_product) * din.bakers_percent /
+                          bak_per(my_product) * din.percent_in_poolish /100, 1),
+                    ROUND(get_batch_weight(my_product) * din.bakers_percent /
+                          bak_per(my_product) * din.percent_in_soaker /100, 0),
+                    ROUND(get_batch_weight(my_product) * din.bakers_percent /
+                          bak_per(my_product) * (1- (din.percent_in_sour + 
+                          din.percent_in_poolish + din.percent_in_soaker)/100), 0),
+                    ROUND(get_batch_weight(my_product) * din.bakers_percent /
+                          bak_per(my_product), 0) * cl.cost_per_g AS cost
+                    FROM product_info AS din
+                    JOIN cost_list as cl on din.ingredient = cl.ingredient_name
+                    WHERE LOWER(din.product_name) LIKE LOWER(my_product);
+      END;
+$$ LANGUAGE plpgsql;
+
+INSERT INTO parties (party_type, party_name)
+SELECT 'o', 'bench customer ' || n
+  FROM generate_series(1, 300) AS n;
+
+INSERT INTO standing_weekly (customer_id, io, product_id, shape_id, amts)
+SELECT p.party_id, p.party_type, ps.product_id, ps.shape_id,
+       ARRAY(SELECT 1 + (random() * 5)::int FROM generate_series(0, 6)
+              WHERE p.party_id IS NOT NULL)
+  FROM parties AS p
+ CROSS JOIN product_shapes AS ps
+ WHERE p.party_name LIKE 'bench customer %';
+
+ANALYZE standing_weekly;
+ANALYZE parties;
+
+--every row should be 0
+SELECT pr.product_name,
+       (SELECT count(*) FROM
+               (SELECT * FROM pg_temp.formula_old(pr.product_name)
+                EXCEPT ALL
+                SELECT * FROM formula(pr.product_name)) AS o) +
+       (SELECT count(*) FROM
+               (SELECT * FROM formula(pr.product_name)
+                EXCEPT ALL
+                SELECT * FROM pg_temp.formula_old(pr.product_name)) AS n) AS formula_diff,
+       (SELECT count(*) FROM
+               (SELECT * FROM pg_temp.formula_old(pr.product_name)
+                EXCEPT ALL
+                SELECT * FROM formula_all() AS fa
+                 WHERE fa.product = pr.product_name) AS a) AS formula_all_missing
+  FROM products AS pr
+  JOIN todays_batch_weights AS bw ON pr.product_id = bw.product_id
+ ORDER BY pr.product_name;
+
+CREATE TEMP TABLE bench_times (test_name text, ms numeric);
+
+DO $$
+DECLARE
+    pr record;
+    t0 timestamptz;
+    t_loop numeric;
+BEGIN
+    FOR i IN 1..5 LOOP
+        t_loop := 0;
+        FOR pr IN SELECT product_name FROM todays_batch_weights LOOP
+            t0 := clock_timestamp();
+            PERFORM * FROM pg_temp.formula_old(pr.product_name);
+            INSERT INTO bench_times VALUES ('formula_old (one product)',
+                   extract(epoch FROM clock_timestamp() - t0) * 1000);
+            t_loop := t_loop + extract(epoch FROM clock_timestamp() - t0) * 1000;
+
+            t0 := clock_timestamp();
+            PERFORM * FROM formula(pr.product_name);
+            INSERT INTO bench_times VALUES ('formula (one product)',
+                   extract(epoch FROM clock_timestamp() - t0) * 1000);
+        END LOOP;
+        INSERT INTO bench_times VALUES ('formula_old (every product)', t_loop);
+
+        t0 := clock_timestamp();
+        PERFORM * FROM formula_all();
+        INSERT INTO bench_times VALUES ('formula_all (every product)',
+               extract(epoch FROM clock_timestamp() - t0) * 1000);
+    END LOOP;
+END;
+$$;
+
+SELECT test_name,
+       ROUND(percentile_cont(0.5) WITHIN GROUP (ORDER BY ms)::numeric, 3) AS median,
+       ROUND(max(ms), 3) AS max
+  FROM bench_times
+ GROUP BY test_name
+ ORDER BY test_name;
+
+ROLLBACK;
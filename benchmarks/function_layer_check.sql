@@ -0,0 +1,150 @@
+--check: the SQL rewrites of formula(), formula_all(), modded_formula() and
+--phone_search() from 0019_function_volatility.sql
+--usage: psql -d bread -f benchmarks/function_layer_check.sql
+--compares each against its plpgsql definition, lists the volatility and
+--parallel marking of every function, and shows that formula() is inlined
+--into a calling query (no Function Scan on formula in the plan);
+--everything is rolled back at the end
+
+BEGIN;
+
+--the plpgsql definitions from before 0019
+CREATE FUNCTION pg_temp.formula_old(my_product VARCHAR)
+       RETURNS TABLE (product character varying, "%" numeric, ingredient character varying,
+       overall numeric, sour numeric, poolish numeric, soaker numeric, final numeric, cost numeric) AS $$
+       BEGIN
+             RETURN QUERY
+                    WITH bw (product_id, batch_weight) AS
+                         (SELECT pr.product_id, sum(tp.amt * tp.grams)
+                            FROM todays_plan AS tp
+                            JOIN products AS pr ON tp.product_id = pr.product_id
+                           WHERE LOWER(pr.product_name) LIKE LOWER(my_product)
+                           GROUP BY pr.product_id),
+
+                    scaled AS
+                         (SELECT fb.*, COALESCE(bw.batch_weight, 0) *
+                                 fb.bakers_percent / fb.total_bp AS g
+                            FROM formula_base AS fb
+                            LEFT JOIN bw ON fb.product_id = bw.product_id
+                           WHERE LOWER(fb.product_name) LIKE LOWER(my_product))
+
+                    SELECT s.product_name, s.bakers_percent, s.ingredient,
+                    ROUND(s.g, 0),
+                    ROUND(s.g * s.percent_in_sour /100, 0),
+                    ROUND(s.g * s.percent_in_poolish /100, 1),
+                    ROUND(s.g * s.percent_in_soaker /100, 0),
+                    ROUND(s.g * (1- (s.percent_in_sour +
+                          s.percent_in_poolish + s.percent_in_soaker)/100), 0),
+                    ROUND(s.g, 0) * s.cost_per_g AS cost
+                    FROM scaled AS s
+                    ORDER BY s.product_id, s.is_flour DESC, s.bakers_percent DESC;
+      END;
+$$ LANGUAGE plpgsql;
+
+CREATE FUNCTION pg_temp.formula_all_old()
+       RETURNS TABLE (product character varying, "%" numeric, ingredient character varying,
+       overall numeric, sour numeric, poolish numeric, soaker numeric, final numeric, cost numeric) AS $$
+       BEGIN
+             RETURN QUERY
+                    WITH scaled AS
+                         (SELECT fb.*, bw.batch_weight *
+                                 fb.bakers_percent / fb.total_bp AS g
+                            FROM formula_base AS fb
+                            JOIN todays_batch_weights AS bw
+                                 ON fb.product_id = bw.product_id)
+
+                    SELECT s.product_name, s.bakers_percent, s.ingredient,
+                    ROUND(s.g, 0),
+                    ROUND(s.g * s.percent_in_sour /100, 0),
+                    ROUND(s.g * s.percent_in_poolish /100, 1),
+                    ROUND(s.g * s.percent_in_soaker /100, 0),
+                    ROUND(s.g * (1- (s.percent_in_sour +
+                          s.percent_in_poolish + s.percent_in_soaker)/100), 0),
+                    ROUND(s.g, 0) * s.cost_per_g AS cost
+                    FROM scaled AS s
+                    ORDER BY s.product_name, s.is_flour DESC, s.bakers_percent DESC;
+      END;
+$$ LANGUAGE plpgsql;
+
+CREATE FUNCTION pg_temp.modded_formula_old(get_dough VARCHAR, get_mod VARCHAR)
+       RETURNS TABLE (dough character varying, "%" numeric, ingredient character varying,
+       overall numeric, sour numeric, poolish numeric, soaker numeric, final numeric) AS $$
+       BEGIN
+             RETURN QUERY
+                    SELECT sf.product, sf."%", sf.ingredient, sf.overall, sf.sour,
+                           sf.poolish, sf.soaker, sf.final
+                      FROM stacked_formula(get_dough, ARRAY[get_mod]) AS sf;
+      END;
+$$ LANGUAGE plpgsql;
+
+CREATE FUNCTION pg_temp.phone_search_old(name_snippet VARCHAR)
+       RETURNS TABLE (name VARCHAR, phone_type text, phone_no VARCHAR) AS $$
+       BEGIN
+              RETURN QUERY
+                 SELECT cd.name::VARCHAR, ph.type, ph.phone_no
+                 FROM contact_directory AS cd
+                 CROSS JOIN LATERAL unnest(cd.phone_types, cd.phone_nos) AS ph (type, phone_no)
+                 WHERE cd.lower_name LIKE LOWER(name_snippet);
+       END;
+$$ LANGUAGE plpgsql;
+
+--every row should be 0
+SELECT pr.product_name,
+       (SELECT count(*) FROM
+               (SELECT * FROM pg_temp.formula_old(pr.product_name)
+                EXCEPT ALL
+                SELECT * FROM formula(pr.product_name)) AS o) +
+       (SELECT count(*) FROM
+               (SELECT * FROM formula(pr.product_name)
+                EXCEPT ALL
+                SELECT * FROM pg_temp.formula_old(pr.product_name)) AS n) AS formula_diff,
+       (SELECT count(*) FROM
+               (SELECT * FROM pg_temp.modded_formula_old(pr.product_name, dm.mod_name)
+                EXCEPT ALL
+                SELECT * FROM modded_formula(pr.product_name, dm.mod_name)) AS o) +
+       (SELECT count(*) FROM
+               (SELECT * FROM modded_formula(pr.product_name, dm.mod_name)
+                EXCEPT ALL
+                SELECT * FROM pg_temp.modded_formula_old(pr.product_name, dm.mod_name)) AS n)
+       AS modded_diff
+  FROM products AS pr
+  LEFT JOIN (SELECT DISTINCT product_id, mod_name FROM dough_mods) AS dm
+       ON pr.product_id = dm.product_id
+ ORDER BY pr.product_name;
+
+--both should be 0
+SELECT (SELECT count(*) FROM
+               (SELECT * FROM pg_temp.formula_all_old()
+                EXCEPT ALL
+                SELECT * FROM formula_all()) AS o) +
+       (SELECT count(*) FROM
+               (SELECT * FROM formula_all()
+                EXCEPT ALL
+                SELECT * FROM pg_temp.formula_all_old()) AS n) AS formula_all_diff,
+       (SELECT count(*) FROM
+               (SELECT * FROM pg_temp.phone_search_old('%')
+                EXCEPT ALL
+                SELECT * FROM phone_search('%')) AS o) +
+       (SELECT count(*) FROM
+               (SELECT * FROM phone_search('%')
+                EXCEPT ALL
+                SELECT * FROM pg_temp.phone_search_old('%')) AS n) AS phone_search_diff;
+
+--i = immutable, s = stable, v = volatile; s = parallel safe, u = unsafe
+SELECT p.proname, pg_get_function_identity_arguments(p.oid) AS args,
+       l.lanname, p.provolatile, p.proparallel
+  FROM pg_proc AS p
+  JOIN pg_language AS l ON p.prolang = l.oid
+ WHERE p.pronamespace = 'public'::regnamespace
+   AND l.lanname IN ('sql', 'plpgsql')
+   AND p.prorettype <> 'trigger'::regtype
+ ORDER BY p.proname;
+
+--the plan should read formula_base and todays_plan directly
+EXPLAIN (COSTS OFF)
+SELECT f.ingredient, sum(f.overall)
+  FROM formula('%') AS f
+ WHERE f.ingredient LIKE '%flour%'
+ GROUP BY f.ingredient;
+
+ROLLBACK;
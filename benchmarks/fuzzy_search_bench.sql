@@ -0,0 +1,58 @@
+--benchmark: fuzzy_search() latency with 100k parties
+--usage: psql -d bread -f benchmarks/fuzzy_search_bench.sql
+--loads 100k made-up party names, times typo'd lookups through the trigram
+--indexes against the LIKE scan the prompts used to need, then rolls back
+
+BEGIN;
+
+INSERT INTO parties (party_type, party_name)
+SELECT 'o',
+       (ARRAY['North', 'South', 'East', 'West', 'Green', 'Golden', 'Prairie',
+              'Lake', 'River', 'Hill', 'Old Town', 'Union'])[1 + (random() * 11)::int]
+       || ' ' ||
+       (ARRAY['Bakery', 'Cafe', 'Market', 'Coop', 'Grocers', 'Deli', 'Kitchen',
+              'Farms', 'Provisions', 'Pantry'])[1 + (random() * 9)::int]
+       || ' ' || n
+  FROM generate_series(1, 100000) AS n;
+
+ANALYZE parties;
+
+CREATE TEMP TABLE bench_times (test_name text, ms numeric);
+
+DO $$
+DECLARE
+    q text;
+    t0 timestamptz;
+BEGIN
+    FOR i IN 1..5 LOOP
+        FOREACH q IN ARRAY ARRAY['madsin sourdoh', 'woodmens', 'golden bakry 4242',
+                                 'willy st co-op', 'meadowlark organic']
+        LOOP
+            t0 := clock_timestamp();
+            PERFORM * FROM fuzzy_search(q, ARRAY['party']);
+            INSERT INTO bench_times VALUES ('fuzzy_search party top 5',
+                   extract(epoch FROM clock_timestamp() - t0) * 1000);
+
+            t0 := clock_timestamp();
+            PERFORM * FROM fuzzy_search(q);
+            INSERT INTO bench_times VALUES ('fuzzy_search all kinds top 5',
+                   extract(epoch FROM clock_timestamp() - t0) * 1000);
+
+            t0 := clock_timestamp();
+            PERFORM party_id FROM parties
+              WHERE LOWER(party_name) LIKE '%' || LOWER(split_part(q, ' ', 1)) || '%';
+            INSERT INTO bench_times VALUES ('LIKE %word% scan',
+                   extract(epoch FROM clock_timestamp() - t0) * 1000);
+        END LOOP;
+    END LOOP;
+END;
+$$;
+
+SELECT test_name,
+       ROUND(percentile_cont(0.5) WITHIN GROUP (ORDER BY ms)::numeric, 3) AS median,
+       ROUND(percentile_cont(0.95) WITHIN GROUP (ORDER BY ms)::numeric, 3) AS p95
+  FROM bench_times
+ GROUP BY test_name
+ ORDER BY test_name;
+
+ROLLBACK;
@@ -0,0 +1,107 @@
+--benchmark: weekly standing orders against the old one-row-per-day table
+--usage: psql -d bread -f benchmarks/standing_weekly_bench.sql
+--seeds 20k customer/product/shape items ordered every day, moves half of
+--them into a temp table laid out like the old standing_orders (with its
+--row-level audit trigger; the log keys end in now(), so the two halves
+--can't share items), then compares table + index size and the time to
+--raise every day's amount by one for 10k items each way. Both variants
+--should log 70000 standing_change_log rows. The plan refresh triggers are
+--switched off so only the storage and audit cost is measured. Everything
+--is rolled back.
+
+BEGIN;
+
+INSERT INTO parties (party_type, party_name)
+SELECT 'o', 'bench customer ' || n
+  FROM generate_series(1, 20000) AS n;
+
+ALTER TABLE standing_weekly DISABLE TRIGGER plan_standing_insert;
+ALTER TABLE standing_weekly DISABLE TRIGGER plan_standing_update;
+ALTER TABLE standing_weekly DISABLE TRIGGER plan_standing_delete;
+
+CREATE TEMP TABLE bench_customers AS
+SELECT party_id, split_part(party_name, ' ', 3)::int <= 10000 AS weekly
+  FROM parties WHERE party_name LIKE 'bench customer %';
+
+INSERT INTO standing_weekly (customer_id, io, product_id, shape_id, amts)
+SELECT p.party_id, p.party_type, ps.product_id, ps.shape_id,
+       ARRAY(SELECT 1 + (random() * 5)::int FROM generate_series(0, 6)
+              WHERE p.party_id IS NOT NULL)
+  FROM parties AS p
+ CROSS JOIN (SELECT product_id, shape_id FROM product_shapes LIMIT 1) AS ps
+ WHERE p.party_id IN (SELECT party_id FROM bench_customers);
+
+--the old layout, filled from the compatibility view
+CREATE TEMP TABLE per_day (
+       day_of_week SMALLINT NOT NULL,
+       customer_id uuid NOT NULL,
+       io text NOT NULL,
+       product_id uuid NOT NULL,
+       shape_id uuid NOT NULL,
+       amt INTEGER NOT NULL,
+       created TIMESTAMPTZ DEFAULT now(),
+       modified TIMESTAMPTZ DEFAULT now(),
+       PRIMARY KEY (day_of_week, customer_id, product_id, shape_id)
+);
+INSERT INTO per_day
+SELECT so.* FROM standing_orders AS so
+  JOIN bench_customers AS bc ON so.customer_id = bc.party_id
+ WHERE NOT bc.weekly;
+
+DELETE FROM standing_weekly AS sw
+ USING bench_customers AS bc
+ WHERE sw.customer_id = bc.party_id AND NOT bc.weekly;
+
+CREATE TEMP TABLE weekly AS
+SELECT sw.* FROM standing_weekly AS sw
+  JOIN bench_customers AS bc ON sw.customer_id = bc.party_id;
+ALTER TABLE weekly ADD PRIMARY KEY (customer_id, product_id, shape_id);
+
+CREATE TRIGGER bench_amt_row AFTER UPDATE ON per_day
+   FOR EACH ROW EXECUTE PROCEDURE record_if_amt_changed();
+
+ANALYZE per_day;
+ANALYZE weekly;
+ANALYZE standing_weekly;
+
+SELECT 'per_day' AS layout, count(*) AS table_rows,
+       pg_size_pretty(pg_total_relation_size('per_day')) AS size
+  FROM per_day
+ UNION ALL
+SELECT 'weekly', count(*), pg_size_pretty(pg_total_relation_size('weekly'))
+  FROM weekly;
+
+CREATE TEMP TABLE bench_times (test_name text, ms numeric);
+CREATE TEMP TABLE bench_logged (variant text, n bigint);
+
+DO $$
+DECLARE
+    t0 timestamptz;
+    c0 bigint;
+BEGIN
+    SELECT count(*) INTO c0 FROM standing_change_log;
+    t0 := clock_timestamp();
+    UPDATE per_day SET amt = amt + 1;
+    INSERT INTO bench_times VALUES ('every day +1, per-day rows',
+           extract(epoch FROM clock_timestamp() - t0) * 1000);
+    INSERT INTO bench_logged SELECT 'per-day rows', count(*) - c0 FROM standing_change_log;
+
+    SELECT count(*) INTO c0 FROM standing_change_log;
+    t0 := clock_timestamp();
+    UPDATE standing_weekly AS sw
+       SET amts = ARRAY(SELECT x.a + 1 FROM unnest(sw.amts) WITH ORDINALITY AS x (a, i)
+                         ORDER BY x.i)
+      FROM bench_customers AS bc
+     WHERE sw.customer_id = bc.party_id;
+    INSERT INTO bench_times VALUES ('every day +1, weekly rows',
+           extract(epoch FROM clock_timestamp() - t0) * 1000);
+    INSERT INTO bench_logged SELECT 'weekly rows', count(*) - c0 FROM standing_change_log;
+END;
+$$;
+
+SELECT test_name, ROUND(ms, 3) AS ms FROM bench_times ORDER BY test_name;
+
+--both should log 70000 rows
+SELECT variant, n FROM bench_logged ORDER BY variant;
+
+ROLLBACK;
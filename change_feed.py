@@ -0,0 +1,268 @@
+import argparse
+import datetime
+import json
+import select
+import time
+
+import psycopg2
+import psycopg2.extras
+
+import db
+
+# Change feed for kitchen and counter screens. The feed_* triggers send one
+# NOTIFY on bake_change per statement that writes special_orders,
+# standing_weekly (and so standing_orders), tmp_chng, product_ingredients or
+# dough_mods, naming the products and bake dates it touched. A Feed waits
+# for those, lets a burst settle, and hands back one Batch for all of them;
+# FormulaCache then reloads formula() for just the products in the batch.
+# One listener per screen costs an idle connection, not a polling query.
+#
+# usage:
+#   feed = Feed()
+#   cache = FormulaCache()
+#   cache.load()
+#   while True:
+#       batch = feed.wait(timeout=60)
+#       for product_id in cache.apply(batch):
+#           redraw(cache.rows[product_id])
+#
+#   python change_feed.py                 # print formulas as they change
+#   python change_feed.py --debounce 2
+
+CHANNEL = 'bake_change'
+
+# wait this long after the last event before handing back a batch, but never
+# hold the first event longer than MAX_DELAY_SECS
+DEBOUNCE_SECS = 0.5
+MAX_DELAY_SECS = 5.0
+
+# tables whose changes can move today's formula(); dough_mods only reach
+# modded_formula() and the variant views
+FORMULA_TABLES = frozenset({'special_orders', 'standing_weekly', 'tmp_chng',
+                            'product_ingredients'})
+
+FORMULA_COLUMNS = """pr.product_id, f.product, f."%%" AS bakers_percent, f.ingredient,
+       f.overall, f.sour, f.poolish, f.soaker, f.final, f.cost"""
+
+FORMULA_ALL_SQL = f"""
+SELECT {FORMULA_COLUMNS}
+  FROM (SELECT row_number() OVER () AS n, fo.* FROM formula(%s) AS fo) AS f
+  JOIN products AS pr ON f.product = pr.product_name
+ ORDER BY f.n
+"""
+
+# formula() is inlined, so this is planned as one query over the products asked for
+FORMULA_SOME_SQL = f"""
+SELECT {FORMULA_COLUMNS}
+  FROM products AS pr
+ CROSS JOIN LATERAL
+       (SELECT row_number() OVER () AS n, fo.*
+          FROM formula(pr.product_name) AS fo) AS f
+ WHERE pr.product_id = ANY(%s::uuid[])
+   AND f.product = pr.product_name
+ ORDER BY pr.product_id, f.n
+"""
+
+
+class Batch:
+    """Coalesced changes: per table, the products and bake dates touched.
+
+    None stands for "all", as in the NOTIFY payload. A batch with
+    everything set means changes may have been missed (the listener
+    reconnected) and the caller should reload in full.
+    """
+
+    def __init__(self):
+        self.events = 0
+        self.everything = False
+        self.tables = {}
+
+    def add(self, table, products, dates):
+        self.events += 1
+        if dates is not None:
+            dates = [datetime.date.fromisoformat(d) for d in dates]
+        seen = self.tables.setdefault(table, (set(), set()))
+        self.tables[table] = (_union(seen[0], products), _union(seen[1], dates))
+
+    def products(self, tables=None, bake_date=None):
+        """Product ids touched by tables (default any) on bake_date (default any).
+
+        Returns None when that could be every product.
+        """
+        if self.everything:
+            return None
+        found = set()
+        for table, (products, dates) in self.tables.items():
+            if tables is not None and table not in tables:
+                continue
+            if bake_date is not None and dates is not None and bake_date not in dates:
+                continue
+            if products is None:
+                return None
+            found |= products
+        return found
+
+    def __bool__(self):
+        return self.everything or self.events > 0
+
+    def __repr__(self):
+        if self.everything:
+            return '<Batch everything>'
+        return f'<Batch {self.events} events on {", ".join(sorted(self.tables))}>'
+
+
+def _union(seen, more):
+    if seen is None or more is None:
+        return None
+    return seen | set(more)
+
+
+class Feed:
+    """LISTEN bake_change on a connection of its own, outside the pool."""
+
+    def __init__(self, channel=CHANNEL):
+        self.channel = channel
+        self.conn = None
+        self.listened = False
+
+    def _connect(self):
+        """Start listening; True if an earlier connection was lost."""
+        self.conn = psycopg2.connect(**db.connect_args())
+        self.conn.autocommit = True
+        with self.conn.cursor() as cursor:
+            cursor.execute(f"LISTEN {self.channel}")
+        lost, self.listened = self.listened, True
+        return lost
+
+    def _read(self, batch, timeout):
+        """Wait up to timeout seconds and fold whatever arrived into batch."""
+        if timeout is None or timeout > 0:
+            if not select.select([self.conn], [], [], timeout)[0]:
+                return
+        self.conn.poll()
+        while self.conn.notifies:
+            note = self.conn.notifies.pop(0)
+            try:
+                change = json.loads(note.payload)
+                batch.add(change['table'], change['products'], change['dates'])
+            except (ValueError, KeyError, TypeError):
+                batch.everything = True
+
+    def wait(self, timeout=None, debounce=DEBOUNCE_SECS, max_delay=MAX_DELAY_SECS):
+        """Block until changes arrive and settle; returns a Batch, or None on timeout.
+
+        Once the first event is in, keeps reading until debounce seconds go
+        by with nothing new or max_delay seconds have passed since it came.
+        """
+        batch = Batch()
+        try:
+            if self.conn is None or self.conn.closed:
+                if self._connect():
+                    batch.everything = True
+                    return batch
+            self._read(batch, timeout)
+            if not batch:
+                return None
+            first = last = time.monotonic()
+            while True:
+                now = time.monotonic()
+                quiet = min(last + debounce, first + max_delay) - now
+                if quiet <= 0:
+                    return batch
+                events = batch.events
+                self._read(batch, quiet)
+                if batch.events > events:
+                    last = time.monotonic()
+        except psycopg2.Error:
+            # anything sent while we were disconnected is lost
+            self.close()
+            batch.everything = True
+            return batch
+
+    def close(self):
+        if self.conn and not self.conn.closed:
+            self.conn.close()
+
+
+class FormulaCache:
+    """formula() rows for every product, keyed by product_id."""
+
+    def __init__(self):
+        self.rows = {}
+        self.bake_date = None
+
+    def _bake_date(self, cursor):
+        cursor.execute("SELECT now()::date")
+        return cursor.fetchone()[0]
+
+    def load(self, product_ids=None):
+        """Reload every product, or just product_ids; returns the ids reloaded."""
+        with db.cursor(cursor_factory=psycopg2.extras.NamedTupleCursor) as cursor:
+            self.bake_date = self._bake_date(cursor)
+            if product_ids is None:
+                cursor.execute(FORMULA_ALL_SQL, ('%',))
+                self.rows = {}
+                product_ids = set()
+            else:
+                product_ids = set(product_ids)
+                cursor.execute(FORMULA_SOME_SQL, (list(product_ids),))
+                for product_id in product_ids:
+                    self.rows.pop(product_id, None)
+            for row in cursor.fetchall():
+                self.rows.setdefault(row.product_id, []).append(row)
+                product_ids.add(row.product_id)
+        return product_ids
+
+    def apply(self, batch):
+        """Reload what batch touched on today's bake; returns the ids reloaded.
+
+        batch may be None (a timeout), which only catches the date rolling over.
+        """
+        with db.cursor() as cursor:
+            today = self._bake_date(cursor)
+        if today != self.bake_date:
+            return self.load()
+        if not batch:
+            return set()
+        products = batch.products(FORMULA_TABLES, today)
+        if products is None:
+            return self.load()
+        if not products:
+            return set()
+        return self.load(products)
+
+
+def print_rows(rows):
+    for r in rows:
+        print(f"  {r.ingredient:<28} {r.bakers_percent:>7}% {r.overall:>8}g "
+              f"{r.sour:>7} {r.poolish:>7} {r.soaker:>7} {r.final:>8}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="print formula() as orders and recipes change")
+    parser.add_argument('--debounce', type=float, default=DEBOUNCE_SECS,
+                        help="seconds of quiet before a batch is applied")
+    args = parser.parse_args(argv)
+
+    feed = Feed()
+    cache = FormulaCache()
+    feed.wait(timeout=0)  # listen before the first load so nothing slips between
+    cache.load()
+    print(f"formulas for {cache.bake_date}: {len(cache.rows)} products; waiting for changes")
+    try:
+        while True:
+            batch = feed.wait(timeout=60, debounce=args.debounce)
+            for product_id in sorted(cache.apply(batch)):
+                rows = cache.rows.get(product_id)
+                if rows:
+                    print(f"\n{rows[0].product} ({batch})")
+                    print_rows(rows)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        feed.close()
+        db.close_all()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+import argparse
+import csv
+import json
+import sys
+from itertools import groupby
+
+import psycopg2.extras
+
+import db
+import resolver
+
+# usage:
+#   python costing.py                        # piece cost of every product and shape
+#   python costing.py --like 'rug%'
+#   python costing.py --what-if prices.csv   # simulate price changes, nothing is saved
+#
+# prices.csv has a header row with scenario and ingredient (a name, as for
+# iid()) and, per row, either cost and grams (a package price), cost_per_g,
+# or factor (a multiplier on today's unit cost):
+#
+#   scenario,ingredient,cost,grams,cost_per_g,factor
+#   flour +10%,kamut%,,,,1.1
+#   new rye supplier,rye%,38.50,22680,,
+
+OVERRIDE_FIELDS = ('cost', 'grams', 'cost_per_g', 'factor')
+
+
+def catalog(pattern=None):
+    """Cost per gram and per piece for every product variant and shape."""
+    with db.cursor(cursor_factory=psycopg2.extras.NamedTupleCursor) as cursor:
+        cursor.execute("SELECT * FROM shape_costs "
+                       "WHERE %(like)s IS NULL OR LOWER(product_name) LIKE LOWER(%(like)s) "
+                       "ORDER BY product_name, mod_name NULLS FIRST, shape_name",
+                       {'like': pattern})
+        return cursor.fetchall()
+
+
+def simulate(overrides):
+    """Run cost_scenarios() for a list of override dicts keyed by ingredient_id."""
+    with db.cursor(cursor_factory=psycopg2.extras.NamedTupleCursor) as cursor:
+        cursor.execute("SELECT * FROM cost_scenarios(%s::jsonb)",
+                       (json.dumps(overrides, default=str),))
+        return cursor.fetchall()
+
+
+def read_overrides(path):
+    with open(path, newline='') as f:
+        rows = list(csv.DictReader(f))
+    ids = resolver.resolve_many('ingredient', [r['ingredient'] for r in rows])
+    overrides = []
+    for n, row in enumerate(rows, start=2):
+        ingredient_id = ids.get(row['ingredient'])
+        if ingredient_id is None:
+            sys.exit(f"line {n}: no ingredient matches {row['ingredient']!r}")
+        override = {'scenario': row['scenario'], 'ingredient_id': ingredient_id}
+        for field in OVERRIDE_FIELDS:
+            if row.get(field):
+                override[field] = float(row[field])
+        overrides.append(override)
+    return overrides
+
+
+def money(value, places=4):
+    return 'n/a' if value is None else f"${value:.{places}f}"
+
+
+def print_catalog(rows):
+    for r in rows:
+        name = r.product_name if r.mod_name is None else f"{r.product_name} / {r.mod_name}"
+        flag = '' if not r.missing_costs else f"  ({r.missing_costs} ingredients uncosted)"
+        print(f"{name:<40} {r.shape_name:<16} {r.grams:>6}g  "
+              f"{money(r.piece_cost):>9}  {money(r.cost_per_g, 5)}/g{flag}")
+
+
+def print_scenarios(rows):
+    for scenario, items in groupby(rows, key=lambda r: r.scenario):
+        items = list(items)
+        print(f"\n{scenario}: {len(items)} product shapes affected")
+        for r in sorted(items, key=lambda r: abs(r.delta or 0), reverse=True):
+            name = r.product_name if r.mod_name is None else f"{r.product_name} / {r.mod_name}"
+            delta = '' if r.delta is None else f"{r.delta:+.4f}"
+            pct = '' if r.delta_pct is None else f"{r.delta_pct:+.2f}%"
+            flag = '' if not r.missing_costs else f"  ({r.missing_costs} ingredients uncosted)"
+            print(f"  {name:<40} {r.shape_name:<16} {money(r.piece_cost):>9} -> "
+                  f"{money(r.new_piece_cost):>9}  {delta} {pct}{flag}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Product costing and what-if pricing")
+    parser.add_argument('--like', help="only products matching this LIKE pattern")
+    parser.add_argument('--what-if', metavar='CSV',
+                        help="price overrides to simulate instead of listing costs")
+    args = parser.parse_args(argv)
+
+    try:
+        if args.what_if:
+            print_scenarios(simulate(read_overrides(args.what_if)))
+        else:
+            print_catalog(catalog(args.like))
+    finally:
+        db.close_all()
+
+
+if __name__ == '__main__':
+    main()
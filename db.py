@@ -0,0 +1,140 @@
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+import psycopg2
+import psycopg2.pool
+
+# pool size can be tuned per machine, e.g. PGPOOL_MAX=4 python insert_data.py
+MIN_CONN = int(os.environ.get('PGPOOL_MIN', 1))
+MAX_CONN = int(os.environ.get('PGPOOL_MAX', 5))
+
+# connections idle longer than this are pinged before being handed out
+HEALTH_CHECK_SECS = float(os.environ.get('PGPOOL_CHECK_SECS', 30))
+
+# how long a caller waits for a free connection before giving up
+CHECKOUT_TIMEOUT_SECS = float(os.environ.get('PGPOOL_TIMEOUT_SECS', 30))
+
+stats = {'checkouts': 0, 'waits': 0, 'handshakes': 0, 'reconnects': 0}
+
+_pool = None
+_pool_lock = threading.Lock()
+_slots = threading.BoundedSemaphore(MAX_CONN)
+_last_used = {}
+# stats are bumped from every thread checking connections in and out
+_stats_lock = threading.Lock()
+
+
+def _count(key):
+    with _stats_lock:
+        stats[key] += 1
+
+
+def connect_args():
+    return dict(user=os.environ['PGUSER'],
+                password=os.environ['PGPASSWD'],
+                host=os.environ['PGHOST'],
+                port=os.environ.get('PGPORT', '5432'),
+                database=os.environ['PGDATABASE'])
+
+
+class CountingPool(psycopg2.pool.ThreadedConnectionPool):
+    def _connect(self, key=None):
+        _count('handshakes')
+        return super()._connect(key)
+
+
+def get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None or _pool.closed:
+            _pool = CountingPool(MIN_CONN, MAX_CONN, **connect_args())
+        return _pool
+
+
+def _healthy(conn):
+    if conn.closed:
+        return False
+    if time.monotonic() - _last_used.get(id(conn), 0) < HEALTH_CHECK_SECS:
+        return True
+    try:
+        with conn.cursor() as cur:
+            cur.execute('SELECT 1')
+        conn.rollback()
+        return True
+    except psycopg2.Error:
+        return False
+
+
+def _checkout():
+    if not _slots.acquire(blocking=False):
+        _count('waits')
+        if not _slots.acquire(timeout=CHECKOUT_TIMEOUT_SECS):
+            raise psycopg2.pool.PoolError(
+                f"no connection free after {CHECKOUT_TIMEOUT_SECS}s")
+    pool = get_pool()
+    try:
+        conn = pool.getconn()
+        if not _healthy(conn):
+            # server restarted or the socket dropped; swap in a fresh one
+            _count('reconnects')
+            _last_used.pop(id(conn), None)
+            pool.putconn(conn, close=True)
+            conn = pool.getconn()
+    except Exception:
+        _slots.release()
+        raise
+    _count('checkouts')
+    return conn
+
+
+def _checkin(conn, broken=False):
+    try:
+        if broken or conn.closed:
+            _last_used.pop(id(conn), None)
+            get_pool().putconn(conn, close=True)
+        else:
+            _last_used[id(conn)] = time.monotonic()
+            get_pool().putconn(conn)
+    finally:
+        _slots.release()
+
+
+@contextmanager
+def connection():
+    """Check a connection out of the shared pool.
+
+    Commits when the block finishes cleanly, rolls back if it raises, and
+    always hands the connection back to the pool.
+    """
+    conn = _checkout()
+    broken = False
+    try:
+        yield conn
+        conn.commit()
+    except psycopg2.OperationalError:
+        broken = True
+        raise
+    except BaseException:
+        if not conn.closed:
+            conn.rollback()
+        raise
+    finally:
+        _checkin(conn, broken)
+
+
+@contextmanager
+def cursor(**kwargs):
+    with connection() as conn:
+        with conn.cursor(**kwargs) as cur:
+            yield cur
+
+
+def close_all():
+    global _pool
+    with _pool_lock:
+        if _pool is not None and not _pool.closed:
+            _pool.closeall()
+        _pool = None
+        _last_used.clear()
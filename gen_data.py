@@ -0,0 +1,189 @@
+import argparse
+import csv
+import datetime
+import io
+import random
+import uuid
+
+import db
+
+# Fill a database with made-up bakery data for benchmarking, using COPY.
+# Run it against a scratch database built with `python bread.py`, not
+# against production: nothing here is tagged for removal.
+#
+# usage:
+#   python gen_data.py                               # defaults below
+#   python gen_data.py --parties 20000 --standing 3000 --special 20000
+
+NAME_FIRST = ['North', 'South', 'East', 'West', 'Green', 'Golden', 'Prairie',
+              'Lake', 'River', 'Hill', 'Old Town', 'Union', 'Maple', 'Cedar']
+NAME_SECOND = ['Bakery', 'Cafe', 'Market', 'Coop', 'Grocers', 'Deli', 'Kitchen',
+               'Farms', 'Provisions', 'Pantry', 'Bistro', 'Mill']
+GIVEN = ['Ann', 'Ben', 'Cal', 'Dee', 'Eli', 'Fay', 'Gus', 'Hal', 'Ida', 'Jo']
+GRAINS = ['kamut', 'rye', 'spelt', 'einkorn', 'emmer', 'red fife', 'turkey red',
+          'durum', 'barley', 'oat']
+STYLES = ['sourdough', 'country loaf', 'pan loaf', 'miche', 'batard', 'rolls',
+          'focaccia', 'flatbread', 'crackers', 'porridge bread']
+SHAPES = ['boule', 'batard', 'pan', 'roll', 'baguette', 'pita', 'slab', 'round']
+
+
+def copy_rows(cursor, table, columns, rows):
+    buf = io.StringIO()
+    csv.writer(buf).writerows(rows)
+    buf.seek(0)
+    cursor.copy_expert(f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)",
+                       buf)
+    return len(rows)
+
+
+def new_id(rnd):
+    """A version 4 uuid drawn from rnd, so the keys follow --seed too."""
+    return uuid.UUID(int=rnd.getrandbits(128), version=4)
+
+
+def generate(args, today):
+    rnd = random.Random(args.seed)
+    data = {}
+
+    parties = []
+    people = []
+    for n in range(args.parties):
+        if rnd.random() < 0.3:
+            parties.append((new_id(rnd), 'i', f"{rnd.choice(NAME_SECOND)}son {n}"))
+            people.append((parties[-1][0], rnd.choice(GIVEN)))
+        else:
+            parties.append((new_id(rnd), 'o',
+                            f"{rnd.choice(NAME_FIRST)} {rnd.choice(NAME_SECOND)} {n}"))
+    data['parties'] = (('party_id', 'party_type', 'party_name'), parties)
+    data['people_st'] = (('party_id', 'first_name'), people)
+
+    phones = []
+    emails = []
+    for n, (pid, _, _) in enumerate(parties):
+        phones.append((pid, rnd.choice('wbm'), f"+1608{n:07d}"))
+        if rnd.random() < 0.5:
+            emails.append((pid, rnd.choice('wbp'), f"contact{n}@example.com"))
+    data['phones'] = (('party_id', 'phone_type', 'phone_no'), phones)
+    data['emails'] = (('party_id', 'email_type', 'email'), emails)
+
+    ingredients = []
+    for n in range(args.ingredients):
+        flour = n % 3 == 0
+        name = f"{rnd.choice(GRAINS)} flour {n}" if flour else f"ingredient {n}"
+        ingredients.append((new_id(rnd), name, flour))
+    data['ingredients'] = (('ingredient_id', 'ingredient_name', 'is_flour'), ingredients)
+
+    orgs = [p for p in parties if p[1] == 'o'] or parties
+    costs = []
+    for ing in ingredients:
+        for seller in rnd.sample(orgs, min(len(orgs), rnd.randint(1, 3))):
+            costs.append((ing[0], seller[0], seller[1], seller[0], seller[1],
+                          round(rnd.uniform(0.5, 30), 2), rnd.choice([454, 907, 1000, 2268, 4536])))
+    data['ingredient_costs'] = (('ingredient_id', 'maker_id', 'mio', 'seller_id', 'sio',
+                                 'cost', 'grams'), costs)
+
+    shapes = [(new_id(rnd), f"{rnd.choice(SHAPES)} {n}") for n in range(args.shapes)]
+    data['shapes'] = (('shape_id', 'shape_name'), shapes)
+
+    products = []
+    product_shapes = []
+    product_ingredients = []
+    dough_mods = []
+    flours = [i for i in ingredients if i[2]] or ingredients
+    others = [i for i in ingredients if not i[2]] or ingredients
+    for n in range(args.products):
+        prid = new_id(rnd)
+        products.append((prid, f"{rnd.choice(GRAINS)} {rnd.choice(STYLES)} {n}",
+                         rnd.randint(0, 5), True))
+        for shape in rnd.sample(shapes, min(len(shapes), rnd.randint(1, 3))):
+            product_shapes.append((prid, shape[0], rnd.randint(80, 2000)))
+        recipe = rnd.sample(flours, min(len(flours), rnd.randint(1, 3))) + \
+            rnd.sample(others, min(len(others), rnd.randint(2, 8)))
+        for ing in recipe:
+            sour = rnd.choice([0, 0, 10, 20, 33])
+            soaker = rnd.choice([0, 0, 20])
+            product_ingredients.append((prid, ing[0], round(rnd.uniform(0.5, 100), 2),
+                                        sour, 0, soaker))
+        if rnd.random() < 0.2:
+            for ing in rnd.sample(recipe, min(len(recipe), 2)):
+                dough_mods.append((f"mod {n}", prid, ing[0],
+                                   round(rnd.uniform(0.5, 100), 2), 0, 0, 0))
+    data['products'] = (('product_id', 'product_name', 'lead_time_days', 'is_dough'), products)
+    data['product_shapes'] = (('product_id', 'shape_id', 'grams'), product_shapes)
+    data['product_ingredients'] = (('product_id', 'ingredient_id', 'bakers_percent',
+                                    'percent_in_sour', 'percent_in_poolish',
+                                    'percent_in_soaker'), product_ingredients)
+    data['dough_mods'] = (('mod_name', 'product_id', 'ingredient_id', 'bakers_percent',
+                           'percent_in_sour', 'percent_in_poolish', 'percent_in_soaker'),
+                          dough_mods)
+
+    # a standing customer orders a few products on most days of the week
+    weekly = []
+    standing = []
+    customers = rnd.sample(parties, min(len(parties), args.standing))
+    for cust in customers:
+        for prid, sid, _ in rnd.sample(product_shapes, min(len(product_shapes), rnd.randint(1, 4))):
+            amts = [rnd.randint(1, 12) if rnd.random() < 0.8 else None for _ in range(7)]
+            if not any(amts):
+                continue
+            weekly.append((cust[0], cust[1], prid, sid,
+                           '{' + ','.join('NULL' if a is None else str(a) for a in amts) + '}'))
+            standing.extend((dow, cust[0], prid, sid) for dow, a in enumerate(amts) if a)
+    data['standing_weekly'] = (('customer_id', 'io', 'product_id', 'shape_id', 'amts'), weekly)
+
+    holds = []
+    for dow, cid, prid, sid in rnd.sample(standing, min(len(standing), args.holds)):
+        start = today + datetime.timedelta(days=rnd.randint(0, 150))
+        resume = start + datetime.timedelta(days=rnd.randint(1, 28))
+        holds.append((dow, cid, prid, sid, start, resume, rnd.choice([0, 50, 150, 200])))
+    data['tmp_chng'] = (('day_of_week', 'customer_id', 'product_id', 'shape_id',
+                         'start_date', 'resume_date', 'percent_multiplier'), holds)
+
+    special = {}
+    while len(special) < args.special and product_shapes:
+        cust = rnd.choice(parties)
+        prid, sid, _ = rnd.choice(product_shapes)
+        delivery = today + datetime.timedelta(days=rnd.randint(0, 175))
+        special[(delivery, cust[0], prid, sid)] = (delivery, cust[0], cust[1], prid, sid,
+                                                   rnd.randint(1, 20))
+    data['special_orders'] = (('delivery_date', 'customer_id', 'io', 'product_id',
+                               'shape_id', 'amt'), list(special.values()))
+    return data
+
+
+# parents before children so the foreign keys hold
+LOAD_ORDER = ['parties', 'people_st', 'phones', 'emails', 'ingredients', 'ingredient_costs',
+              'shapes', 'products', 'product_shapes', 'product_ingredients', 'dough_mods',
+              'standing_weekly', 'tmp_chng', 'special_orders']
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load synthetic bakery data with COPY")
+    parser.add_argument('--parties', type=int, default=5000)
+    parser.add_argument('--ingredients', type=int, default=300)
+    parser.add_argument('--shapes', type=int, default=40)
+    parser.add_argument('--products', type=int, default=500)
+    parser.add_argument('--standing', type=int, default=800,
+                        help="customers with standing orders")
+    parser.add_argument('--holds', type=int, default=500,
+                        help="tmp_chng rows")
+    parser.add_argument('--special', type=int, default=5000,
+                        help="special_orders rows")
+    parser.add_argument('--seed', type=int, default=1, help="random seed")
+    args = parser.parse_args(argv)
+
+    with db.connection() as conn:
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT now()::date")
+            today = cursor.fetchone()[0]
+            data = generate(args, today)
+            for table in LOAD_ORDER:
+                columns, rows = data[table]
+                print(f"{table:<22} {copy_rows(cursor, table, columns, rows):>9}")
+            for table in LOAD_ORDER:
+                cursor.execute(f"ANALYZE {table}")
+    db.close_all()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,255 @@
+import argparse
+import csv
+import datetime
+import io
+import json
+import sys
+from collections import namedtuple
+
+import db
+
+# usage:
+#   python import_orders.py weekly.csv
+#   python import_orders.py standing.jsonl --kind standing
+#
+# special order lines: delivery_date, customer, product, shape, amt
+# standing order lines: day_of_week, customer, product, shape, amt
+# a 'kind' column ('special' or 'standing') may be used to mix both in one file
+
+DAYS = {'sun': 0, 'mon': 1, 'tue': 2, 'wed': 3, 'thu': 4, 'fri': 5, 'sat': 6}
+
+# a JSON line that didn't decode, kept so it can be reported as a reject
+UnreadableLine = namedtuple('UnreadableLine', ['text', 'error'])
+
+STAGING_COLUMNS = ('line', 'kind', 'delivery_date', 'day_of_week',
+                   'customer', 'product', 'shape', 'amt')
+
+CREATE_STAGING = """
+CREATE TEMP TABLE order_staging (
+       line INTEGER PRIMARY KEY,
+       kind text NOT NULL,
+       delivery_date DATE,
+       day_of_week SMALLINT,
+       customer VARCHAR NOT NULL,
+       product VARCHAR NOT NULL,
+       shape VARCHAR NOT NULL,
+       amt INTEGER NOT NULL,
+       customer_id uuid,
+       io text,
+       product_id uuid,
+       shape_id uuid,
+       reject text
+) ON COMMIT DROP;
+"""
+
+# resolve every name in one pass per table instead of pid()/prid()/sid() per row
+RESOLVE_NAMES = """
+UPDATE order_staging AS st
+   SET customer_id = p.party_id, io = p.party_type
+  FROM (SELECT DISTINCT ON (LOWER(party_name)) LOWER(party_name) AS name,
+               party_id, party_type
+          FROM parties
+         ORDER BY LOWER(party_name), party_type) AS p
+ WHERE LOWER(st.customer) = p.name;
+
+UPDATE order_staging AS st
+   SET product_id = pr.product_id
+  FROM products AS pr
+ WHERE LOWER(st.product) = LOWER(pr.product_name);
+
+UPDATE order_staging AS st
+   SET shape_id = s.shape_id
+  FROM shapes AS s
+ WHERE LOWER(st.shape) = LOWER(s.shape_name);
+"""
+
+# mirror the special_orders / standing_orders constraints so a bad line is
+# reported instead of aborting the whole batch
+FLAG_REJECTS = """
+UPDATE order_staging AS st
+   SET reject = CASE
+       WHEN st.customer_id IS NULL THEN 'unknown customer'
+       WHEN st.product_id IS NULL THEN 'unknown product'
+       WHEN st.shape_id IS NULL THEN 'unknown shape'
+       WHEN st.amt <= 0 THEN 'amt_greater_than_0'
+       WHEN st.kind = 'special' AND st.delivery_date < now()::date
+            THEN 'delivery_date_present_or_future'
+       WHEN st.kind = 'special'
+            AND st.delivery_date >= now()::date + interval '6 months'
+            THEN 'delivery_date_in_next_6_mons'
+       WHEN NOT EXISTS (SELECT 1 FROM product_shapes AS ps
+                         WHERE ps.product_id = st.product_id
+                           AND ps.shape_id = st.shape_id)
+            THEN 'shape not made for this product'
+       END;
+
+UPDATE order_staging AS st
+   SET reject = 'duplicate of line ' || d.first_line
+  FROM (SELECT line, first_value(line) OVER w AS first_line
+          FROM order_staging
+         WHERE reject IS NULL
+        WINDOW w AS (PARTITION BY kind, delivery_date, day_of_week,
+                     customer_id, product_id, shape_id ORDER BY line)) AS d
+ WHERE st.line = d.line AND d.line <> d.first_line;
+"""
+
+MERGE_ORDERS = """
+INSERT INTO special_orders (delivery_date, customer_id, io, product_id,
+            shape_id, amt)
+SELECT delivery_date, customer_id, io, product_id, shape_id, amt
+  FROM order_staging
+ WHERE kind = 'special' AND reject IS NULL;
+
+--standing lines fold into one weekly row per item; days the file doesn't
+--mention keep their current amount
+INSERT INTO standing_weekly AS sw (customer_id, io, product_id, shape_id, amts)
+SELECT customer_id, io, product_id, shape_id,
+       ARRAY[max(amt) FILTER (WHERE day_of_week = 0),
+             max(amt) FILTER (WHERE day_of_week = 1),
+             max(amt) FILTER (WHERE day_of_week = 2),
+             max(amt) FILTER (WHERE day_of_week = 3),
+             max(amt) FILTER (WHERE day_of_week = 4),
+             max(amt) FILTER (WHERE day_of_week = 5),
+             max(amt) FILTER (WHERE day_of_week = 6)]
+  FROM order_staging
+ WHERE kind = 'standing' AND reject IS NULL
+ GROUP BY customer_id, io, product_id, shape_id
+    ON CONFLICT (customer_id, product_id, shape_id)
+    DO UPDATE SET amts = ARRAY(SELECT COALESCE(x.new_amt, x.old_amt)
+                                 FROM unnest(EXCLUDED.amts, sw.amts)
+                                      WITH ORDINALITY AS x (new_amt, old_amt, day)
+                                ORDER BY x.day);
+"""
+
+
+def read_records(stream, fmt):
+    if fmt == 'csv':
+        yield from csv.DictReader(stream)
+    else:
+        for line in stream:
+            if line.strip():
+                try:
+                    yield json.loads(line)
+                except ValueError as error:
+                    yield UnreadableLine(line.strip(), str(error))
+
+
+def parse_day(value):
+    value = str(value).strip().lower()
+    if value[:3] in DAYS:
+        return DAYS[value[:3]]
+    day = int(value)
+    if day not in range(7):
+        raise ValueError(f"day_of_week {day} not in 0 thru 6")
+    return day
+
+
+def parse_amt(value):
+    amt = float(str(value).strip())
+    if not amt.is_integer():
+        raise ValueError(f"amt {value!r} is not a whole number")
+    return int(amt)
+
+
+def parse_record(rec, default_kind):
+    if isinstance(rec, UnreadableLine):
+        raise ValueError(f"bad JSON: {rec.error}")
+    if not isinstance(rec, dict):
+        raise ValueError(f"expected a JSON object, got {type(rec).__name__}")
+    kind = str(rec.get('kind') or default_kind or '').strip().lower()
+    if not kind:
+        kind = 'standing' if rec.get('day_of_week') not in (None, '') else 'special'
+    if kind not in ('special', 'standing'):
+        raise ValueError(f"unknown kind {kind!r}")
+    delivery = day = None
+    if kind == 'special':
+        delivery = datetime.date.fromisoformat(str(rec['delivery_date']).strip())
+    else:
+        day = parse_day(rec['day_of_week'])
+    names = [str(rec[k]).strip() for k in ('customer', 'product', 'shape')]
+    if '' in names:
+        raise ValueError("customer, product and shape are required")
+    return (kind, delivery, day, *names, parse_amt(rec['amt']))
+
+
+def stage(records, default_kind=None):
+    """Type-check the raw records and build the COPY buffer.
+
+    Returns (buffer, rejects) where rejects are lines that could not even be
+    parsed; everything else is checked against the database after COPY.
+    """
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    rejects = []
+    for line, rec in enumerate(records, start=1):
+        try:
+            writer.writerow((line, *parse_record(rec, default_kind)))
+        except (KeyError, ValueError, TypeError) as error:
+            rejects.append((line, f"unreadable: {error}", rec))
+    buf.seek(0)
+    return buf, rejects
+
+
+def import_orders(records, default_kind=None, dry_run=False):
+    """Load a batch of order lines in one transaction.
+
+    Returns (loaded, rejects) where rejects is a list of
+    (line, reason, record) for the lines that were skipped.
+    """
+    records = list(records)
+    buf, rejects = stage(records, default_kind)
+    with db.connection() as conn:
+        with conn.cursor() as cursor:
+            cursor.execute(CREATE_STAGING)
+            cursor.copy_expert(
+                f"COPY order_staging ({', '.join(STAGING_COLUMNS)}) "
+                "FROM STDIN WITH (FORMAT csv)", buf)
+            cursor.execute(RESOLVE_NAMES)
+            cursor.execute(FLAG_REJECTS)
+            cursor.execute("SELECT line, reject FROM order_staging "
+                           "WHERE reject IS NOT NULL ORDER BY line")
+            for line, reason in cursor.fetchall():
+                rejects.append((line, reason, records[line - 1]))
+            cursor.execute("SELECT count(*) FROM order_staging WHERE reject IS NULL")
+            loaded = cursor.fetchone()[0]
+            if dry_run:
+                conn.rollback()
+            else:
+                cursor.execute(MERGE_ORDERS)
+    rejects.sort(key=lambda r: r[0])
+    return loaded, rejects
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Bulk import special or standing orders from CSV or JSON lines")
+    parser.add_argument('file', help="order file, or - for stdin")
+    parser.add_argument('--format', choices=('csv', 'json'),
+                        help="defaults to the file extension, csv for stdin")
+    parser.add_argument('--kind', choices=('special', 'standing'),
+                        help="kind for lines without a 'kind' column")
+    parser.add_argument('--dry-run', action='store_true',
+                        help="validate and report without writing")
+    args = parser.parse_args(argv)
+
+    fmt = args.format
+    if fmt is None:
+        fmt = 'json' if args.file.endswith(('.json', '.jsonl')) else 'csv'
+    if args.file == '-':
+        loaded, rejects = import_orders(read_records(sys.stdin, fmt),
+                                        args.kind, args.dry_run)
+    else:
+        with open(args.file, newline='') as stream:
+            loaded, rejects = import_orders(read_records(stream, fmt),
+                                            args.kind, args.dry_run)
+
+    for line, reason, rec in rejects:
+        print(f"line {line}: {reason}: {rec}", file=sys.stderr)
+    verb = "would load" if args.dry_run else "loaded"
+    print(f"{verb} {loaded} orders, rejected {len(rejects)}")
+    db.close_all()
+    return 1 if rejects else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,178 +1,309 @@
+import argparse
+import csv
+import datetime
+import sys
+from collections import namedtuple
+
 import psycopg2
-import os
+from psycopg2.extras import execute_values
 
-def insert_data(SQL, data):
-    connection = psycopg2.connect(user= os.environ['PGUSER'],
-                                  password = os.environ['PGPASSWD'],
-                                  host= os.environ['PGHOST'],
-                                  port="5432",
-                                  database= os.environ['PGDATABASE'])
+import db
+import resolver
+import search
 
-    cursor = connection.cursor()
+# Add rows to the catalog and contact tables, from a menu or in batches.
+#
+# usage:
+#   python insert_data.py                                 # menu
+#   python insert_data.py phones                          # menu for one table
+#   python insert_data.py parties 'Joe Blow,i' 'Acme Mill,o'
+#   python insert_data.py special_orders --file orders.csv
+#   cat shapes.csv | python insert_data.py shapes --file - --dry-run
+#
+# A record given as an argument is one CSV line with the fields in the
+# order listed by --help; a file is CSV with a header row naming them.
+# Names of parties, products and shapes are resolved like pid()/prid()/sid().
+# The whole batch is checked before anything is written, then goes in with
+# one multi-row INSERT per table, in one transaction; any bad record means
+# nothing is written.
 
-    try:
-        cursor.execute(SQL, data)
-        connection.commit()
-        print("Data inserted successfully into PostgreSQL")
-    except (Exception, psycopg2.Error) as error:
-        print("Error while connecting to PostgreSQL", error)
-    finally:
-        # closing database connection.
-            if(connection):
-                cursor.close()
-                connection.close()
-                print("PostgreSQL connection is closed")
-
-def another_one():
-    another = input("""Would you like to enter more data?
-    y) yes
-    n) no\n""")
+Field = namedtuple('Field', ['name', 'prompt', 'parse', 'kind'])
+Table = namedtuple('Table', ['menu', 'label', 'sql', 'fields', 'row'])
+
+PHONE_TYPES = """What type of phone?\n
+        m) mobile
+        w) work
+        b) business
+        e) emergency
+        f) fax
+        h) home
+        \n"""
 
-    if another.upper() == "Y":
-        pick_it()
-    else:
-        exit(0)
-
-def get_pid(party_name):
-    connection = psycopg2.connect(user= os.environ['PGUSER'],
-                                  password = os.environ['PGPASSWD'],
-                                  host= os.environ['PGHOST'],
-                                  port="5432",
-                                  database= os.environ['PGDATABASE'])
-
-    cursor = connection.cursor()
-    cursor.callproc('pid', [party_name])
-    result = cursor.fetchone()
-    cursor.close()
-    return result[0]
-
-
-def get_sid(shape_name):
-    connection = psycopg2.connect(user= os.environ['PGUSER'],
-                                  password = os.environ['PGPASSWD'],
-                                  host= os.environ['PGHOST'],
-                                  port="5432",
-                                  database= os.environ['PGDATABASE'])
-
-    cursor = connection.cursor()
-    cursor.callproc('sid', [shape_name])
-    result = cursor.fetchone()
-    cursor.close()
-    return result[0]
-
-
-def get_did(dough_name):
-    connection = psycopg2.connect(user= os.environ['PGUSER'],
-                                  password = os.environ['PGPASSWD'],
-                                  host= os.environ['PGHOST'],
-                                  port="5432",
-                                  database= os.environ['PGDATABASE'])
-
-    cursor = connection.cursor()
-    cursor.callproc('did', [dough_name])
-    result = cursor.fetchone()
-    cursor.close()
-    return result[0]
-
-
-def dough():
-    which_dough = input("name of dough: \n")
-    leader = int(input(f"Days of lead time for {which_dough}? \n"))
-    SQL = "INSERT INTO doughs (dough_name, lead_time_days) VALUES (%s, %s)"
-    data = (which_dough, leader)
-    insert_data(SQL, data)
-
-def email():
-    party_name = input("what is the name of the party: ")
-    pid = get_pid(party_name)
-    email_type = ''
-    while email_type != 'b' and email_type != 'w' and email_type != 'p':
-        email_type = input("""What is the email type:
+EMAIL_TYPES = """What is the email type:
         b) business
         w) work
-        p) personal\n""")
-        email_type = email_type.lower()
-    email = input("what is the email address: ")
-    SQL = "INSERT INTO emails (party_id, email_type, email) VALUES (%s, %s, %s)"
-    data = (pid, email_type, email)
-    insert_data(SQL, data)
-
-def party():
-    party_name = input("what is the name of the party: ")
-    party_type = ''
-    while party_type != 'i' and party_type != 'o':
-        party_type = input(f"Is {party_name} an individual (i) or an organization (o)? ")
-    SQL = "INSERT INTO parties (party_name, party_type) VALUES (%s, %s)"
-    data = (party_name, party_type)
-    insert_data(SQL, data)
-
-def ingredient():
-    ingredient_name = input("What is the name of the ingredient?\n")
-    is_flour = input(f"{ingredient_name} is flour: 't' = true, 'f' = false\n")
-    SQL = "INSERT INTO ingredients (ingredient_name, is_flour) VALUES (%s, %s)"
-    data = (ingredient_name, is_flour)
-    insert_data(SQL, data)
-
-def shape():
-    shape_input = input("What is the name of the shape?\n")
-    data = (shape_input, )
-    SQL = "INSERT INTO shapes (shape_name) VALUES (%s);"
-    insert_data(SQL, data)
-
-def spec_ord():
-    delivery = input("What is the delivery date?\n")
-    cust_name = ''
-    while cust_name == '':
-        cust_name = input("What is the name of the customer?\n")
-    cid = get_pid(cust_name)
-    cust_type = ''
-    while cust_type != 'i' and cust_type != 'o':
-        cust_type = input("Is the customer an individual 'i' or an organization 'o'?\n")
-    doe = input("What is the name of the dough?\n")
-    did = get_did(doe)
-    shape = input("What is the name of the shape?\n")
-    sid = get_sid(shape)
-    amt = int(input(f"What is the amount of {doe} shaped as {shape}\n"))
-    SQL = """INSERT INTO special_orders (delivery_date, customer_id, io,
-             dough_id, shape_id, amt) VALUES (%s, %s, %s, %s, %s, %s)"""
-    data = (delivery, cid, cust_type, did, sid, amt)
-    insert_data(SQL, data)
-
-def pick_it():
-    pick_table = input("""Insert data in which table?\n
-        d) doughs
-        e) emails
-        i) ingredients
-        p) parties
-        s) shapes
-        so) special orders
-        \n\n""")
-
-    if pick_table.upper() == "D":
-        dough()
-        another_one()
-
-    if pick_table.upper() == "E":
-        email()
-        another_one()
-
-    elif pick_table.upper() == "I":
-        ingredient()
-        another_one()
-
-    elif pick_table.upper() == "P":
-        party()
-        another_one()
-
-    elif pick_table.upper() == "S":
-        shape()
-        another_one()
-
-    elif pick_table.upper() == "SO":
-        spec_ord()
-        another_one()
-
-    else:
-       pick_it()
-
-pick_it()
+        p) personal\n"""
+
+
+def text(value):
+    value = value.strip()
+    if not value:
+        raise ValueError("may not be empty")
+    return value
+
+
+def choice(*options):
+    def parse(value):
+        value = value.strip().lower()
+        if value not in options:
+            raise ValueError(f"must be one of {', '.join(options)}")
+        return value
+    return parse
+
+
+def flag(value):
+    value = value.strip().lower()
+    if value in ('t', 'true', 'y', 'yes', '1'):
+        return True
+    if value in ('f', 'false', 'n', 'no', '0'):
+        return False
+    raise ValueError("must be t or f")
+
+
+def count(value):
+    n = int(value)
+    if n <= 0:
+        raise ValueError("must be greater than 0")
+    return n
+
+
+def lead_time(value):
+    n = int(value)
+    if n not in range(8):
+        raise ValueError("must be 0 thru 7")
+    return n
+
+
+def date(value):
+    return datetime.date.fromisoformat(value.strip())
+
+
+# party fields resolve to (party_id, party_type), the others to an id
+TABLES = {
+    'products': Table('d', 'doughs',
+        "INSERT INTO products (product_name, lead_time_days, is_dough) VALUES %s",
+        [Field('product_name', "name of dough: \n", text, None),
+         Field('lead_time_days', "Days of lead time? \n", lead_time, None)],
+        lambda r: (r['product_name'], r['lead_time_days'], True)),
+    'emails': Table('e', 'emails',
+        "INSERT INTO emails (party_id, email_type, email) VALUES %s",
+        [Field('party', "what is the name of the party: ", text, 'party'),
+         Field('email_type', EMAIL_TYPES, choice('b', 'w', 'p'), None),
+         Field('email', "what is the email address: ", text, None)],
+        lambda r: (r['party'][0], r['email_type'], r['email'])),
+    'ingredients': Table('i', 'ingredients',
+        "INSERT INTO ingredients (ingredient_name, is_flour) VALUES %s",
+        [Field('ingredient_name', "What is the name of the ingredient?\n", text, None),
+         Field('is_flour', "Is it flour: 't' = true, 'f' = false\n", flag, None)],
+        lambda r: (r['ingredient_name'], r['is_flour'])),
+    'parties': Table('p', 'parties',
+        "INSERT INTO parties (party_name, party_type) VALUES %s",
+        [Field('party_name', "what is the name of the party: ", text, None),
+         Field('party_type', "Is it an individual (i) or an organization (o)? ",
+               choice('i', 'o'), None)],
+        lambda r: (r['party_name'], r['party_type'])),
+    'shapes': Table('s', 'shapes',
+        "INSERT INTO shapes (shape_name) VALUES %s",
+        [Field('shape_name', "What is the name of the shape?\n", text, None)],
+        lambda r: (r['shape_name'],)),
+    'special_orders': Table('so', 'special orders',
+        """INSERT INTO special_orders (delivery_date, customer_id, io,
+           product_id, shape_id, amt) VALUES %s""",
+        [Field('delivery_date', "What is the delivery date?\n", date, None),
+         Field('customer', "What is the name of the customer?\n", text, 'party'),
+         Field('product', "What is the name of the dough?\n", text, 'product'),
+         Field('shape', "What is the name of the shape?\n", text, 'shape'),
+         Field('amt', "What is the amount?\n", count, None)],
+        lambda r: (r['delivery_date'], *r['customer'], r['product'], r['shape'], r['amt'])),
+    'phones': Table('ph', 'phones',
+        "INSERT INTO phones (party_id, phone_type, phone_no) VALUES %s",
+        [Field('party', "what is the name of the party: ", text, 'party'),
+         Field('phone_no', "what is the phone number: ", text, None),
+         Field('phone_type', PHONE_TYPES, choice('m', 'w', 'b', 'e', 'f', 'h'), None)],
+        lambda r: (r['party'][0], r['phone_type'], r['phone_no'])),
+}
+
+ALIASES = {'doughs': 'products', 'special': 'special_orders', 'so': 'special_orders'}
+
+
+def parse_records(table, raw):
+    """Type-check raw {field: text} records.
+
+    Returns (parsed, problems); problems are (record number, message).
+    """
+    parsed, problems = [], []
+    for n, rec in enumerate(raw, start=1):
+        out = {}
+        for field in TABLES[table].fields:
+            value = rec.get(field.name)
+            if value is None:
+                problems.append((n, f"{field.name} is missing"))
+                continue
+            try:
+                out[field.name] = field.parse(value)
+            except ValueError as error:
+                problems.append((n, f"{field.name} {value!r}: {error}"))
+        parsed.append(out)
+    return parsed, problems
+
+
+def resolve_names(table, parsed, suggest=False):
+    """Swap names for ids in place, one lookup per kind for the whole batch.
+
+    With suggest, a name that doesn't resolve offers the closest matches.
+    """
+    problems = []
+    for field in TABLES[table].fields:
+        if field.kind is None:
+            continue
+        names = [rec[field.name] for rec in parsed if field.name in rec]
+        found = resolver.resolve_many(field.kind, names)
+        for n, rec in enumerate(parsed, start=1):
+            if field.name not in rec:
+                continue
+            name = rec[field.name]
+            found_id = found.get(name)
+            if found_id is None and suggest:
+                found_id = search.did_you_mean(field.kind, name)
+            if found_id is None:
+                problems.append((n, f"unknown {field.kind} {name!r}"))
+                del rec[field.name]
+            else:
+                rec[field.name] = found_id
+
+    party_fields = [f.name for f in TABLES[table].fields if f.kind == 'party']
+    ids = list({rec[name] for rec in parsed for name in party_fields if name in rec})
+    if ids:
+        with db.cursor() as cursor:
+            cursor.execute("SELECT party_id, party_type FROM parties WHERE party_id = ANY(%s::uuid[])",
+                           (ids,))
+            types = dict(cursor.fetchall())
+        for rec in parsed:
+            for name in party_fields:
+                if name in rec:
+                    rec[name] = (rec[name], types[rec[name]])
+    return problems
+
+
+def insert_records(table, raw, dry_run=False, suggest=False):
+    """Check a batch of raw records and write it in one transaction.
+
+    Returns (written, problems); nothing is written if there are problems.
+    """
+    spec = TABLES[table]
+    parsed, problems = parse_records(table, raw)
+    problems += resolve_names(table, parsed, suggest)
+    if problems:
+        return 0, sorted(problems)
+    rows = [spec.row(rec) for rec in parsed]
+    if not dry_run and rows:
+        with db.cursor() as cursor:
+            execute_values(cursor, spec.sql, rows, page_size=500)
+    return len(rows), []
+
+
+def prompt_record(table):
+    rec = {}
+    for field in TABLES[table].fields:
+        while True:
+            value = input(field.prompt)
+            try:
+                field.parse(value)
+            except ValueError as error:
+                print(f"{field.name}: {error}")
+                continue
+            rec[field.name] = value
+            break
+    return rec
+
+
+def pick_table():
+    menu = "".join(f"        {t.menu}) {t.label}\n" for t in TABLES.values())
+    by_menu = {t.menu: name for name, t in TABLES.items()}
+    while True:
+        picked = input(f"Insert data in which table?\n\n{menu}\n\n").strip().lower()
+        if picked in by_menu:
+            return by_menu[picked]
+
+
+def interactive(table=None):
+    while True:
+        which = table or pick_table()
+        try:
+            written, problems = insert_records(which, [prompt_record(which)], suggest=True)
+        except psycopg2.Error as error:
+            print("Error while inserting into PostgreSQL", error)
+        else:
+            for _, message in problems:
+                print(message)
+            if written:
+                print("Data inserted successfully into PostgreSQL")
+        another = input("""Would you like to enter more data?
+    y) yes
+    n) no\n""")
+        if another.upper() != "Y":
+            return 0
+
+
+def read_file(path):
+    if path == '-':
+        return list(csv.DictReader(sys.stdin))
+    with open(path, newline='') as stream:
+        return list(csv.DictReader(stream))
+
+
+def main(argv=None):
+    field_help = "; ".join(f"{name}: {','.join(f.name for f in t.fields)}"
+                           for name, t in TABLES.items())
+    parser = argparse.ArgumentParser(
+        description="Insert rows from a menu, the command line, or a CSV file",
+        epilog=f"fields in order -- {field_help}")
+    parser.add_argument('table', nargs='?',
+                        choices=sorted([*TABLES, *ALIASES]), help="table to insert into")
+    parser.add_argument('records', nargs='*', help="records as CSV lines")
+    parser.add_argument('--file', help="CSV file with a header row, or - for stdin")
+    parser.add_argument('--dry-run', action='store_true',
+                        help="check the records and write nothing")
+    args = parser.parse_args(argv)
+
+    table = ALIASES.get(args.table, args.table)
+    if not args.records and args.file is None:
+        return interactive(table)
+    if table is None:
+        parser.error("a table is needed with records or --file")
+
+    names = [f.name for f in TABLES[table].fields]
+    raw = [dict(zip(names, row)) for row in csv.reader(args.records)]
+    if args.file is not None:
+        raw += read_file(args.file)
+
+    try:
+        written, problems = insert_records(table, raw, args.dry_run)
+    except psycopg2.Error as error:
+        print(f"nothing written: {error}", file=sys.stderr)
+        return 1
+    for n, message in problems:
+        print(f"record {n}: {message}", file=sys.stderr)
+    if problems:
+        print(f"nothing written, {len(problems)} problems in {len(raw)} records")
+        return 1
+    verb = "would insert" if args.dry_run else "inserted"
+    print(f"{verb} {written} {table} rows")
+    return 0
+
+
+if __name__ == '__main__':
+    try:
+        sys.exit(main())
+    finally:
+        db.close_all()
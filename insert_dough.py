@@ -1,13 +1,7 @@
 import psycopg2
-import os
 
-connection = psycopg2.connect(user= os.environ['PGUSER'],
-                                  password = os.environ['PGPASSWD'],
-                                  host= os.environ['PGHOST'],
-                                  port="5432",
-                                  database= os.environ['PGDATABASE'])
+import db
 
-cursor = connection.cursor()
 
 def dough_insert():
     which_dough = input("name of dough to add to doughs table: ")
@@ -15,17 +9,14 @@ def dough_insert():
     try:
         SQL = "INSERT INTO doughs (dough_name, lead_time_days) VALUES (%s, %s)"
         data = (which_dough, leader)
-        cursor.execute(SQL, data)
-        connection.commit()
+        with db.cursor() as cursor:
+            cursor.execute(SQL, data)
         print("Data inserted successfully into PostgreSQL")
     except (Exception, psycopg2.Error) as error:
         print("Error while connecting to PostgreSQL", error)
     finally:
-        # closing database connection.
-            if(connection):
-                cursor.close()
-                connection.close()
-                print("PostgreSQL connection is closed")
+        db.close_all()
+        print("PostgreSQL connection is closed")
 
 
 pick_table = input("""Insert data in which table?\n
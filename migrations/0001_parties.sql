@@ -0,0 +1,130 @@
+--parties and their subtypes, addresses, phones and emails
+
+--the bakery runs on Madison time; now()::date in the order views and
+--checks depends on it
+DO $$
+BEGIN
+    EXECUTE format('ALTER DATABASE %I SET timezone = %L',
+                   current_database(), 'US/Central');
+END;
+$$;
+
+CREATE EXTENSION IF NOT EXISTS pgcrypto;
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+CREATE EXTENSION IF NOT EXISTS pg_libphonenumber;
+
+CREATE TABLE parties (
+       party_id uuid default gen_random_uuid(),
+       party_type text NOT NULL,
+       party_name VARCHAR NOT NULL,
+       created TIMESTAMPTZ DEFAULT now(),
+       modified TIMESTAMPTZ DEFAULT now(),
+       PRIMARY KEY (party_id, party_type),
+       CONSTRAINT party_type_i_or_o CHECK (party_type in ('i', 'o'))
+);
+
+--CREATE INDEX parties_idx On parties (party_name);
+CREATE INDEX parties_party_name_trgm_idx ON parties 
+ USING GIN (party_name gin_trgm_ops);
+
+-- Ran five tests with 2 indexes + no index on 
+-- party_name and ingredient_name
+--
+--           test_name        | which_index | median 
+--    ------------------------+-------------+--------
+--     ingredient_name_join   | trgm        |  0.245
+--     ingredient_name_join   | b-tree      |  0.412
+--     ingredient_name_join   | none        |  0.464
+--     insert_ingredients     | none        | 20.107
+--     insert_ingredients     | b-tree      | 26.035
+--     insert_ingredients     | trgm        | 34.551
+--     insert_parties         | none        |  21.08
+--     insert_parties         | b-tree      | 27.128
+--     insert_parties         | trgm        |  29.44
+--     party_name_equal       | b-tree      |  0.047
+--     party_name_equal       | trgm        |  0.053
+--     party_name_equal       | none        |  0.057
+--     update_ingredient_cost | trgm        |   0.17
+--     update_ingredient_cost | b-tree      |  0.504
+--     update_ingredient_cost | none        |  0.884
+
+-- For "persons", a subtype of parties
+CREATE TABLE people_st (
+       party_id uuid PRIMARY KEY,
+       party_type text default 'i' NOT NULL,
+       first_name VARCHAR NOT NULL,
+       created TIMESTAMPTZ DEFAULT now(),
+       modified TIMESTAMPTZ DEFAULT now(),
+       FOREIGN KEY (party_id, party_type) references parties (party_id, party_type),
+       CONSTRAINT party_type_is_i check (party_type = 'i')) 
+;
+
+CREATE TABLE zip_codes (
+       zip text PRIMARY KEY,
+       city VARCHAR NOT NULL,
+       state text NOT NULL,
+       CONSTRAINT zip_length_5 CHECK (length(zip)=5),
+       CONSTRAINT st_length_2 CHECK (length(state)=2)
+);
+
+-- For "staff, a subtype of people
+CREATE TABLE staff_st (
+       party_id uuid PRIMARY KEY,
+       party_type text default 'i' NOT NULL,
+       ssn text NOT NULL,
+       hire_date DATE NOT NULL,
+       is_active BOOLEAN NOT NULL,
+       street_no VARCHAR NOT NULL,
+       street VARCHAR NOT NULL,
+       zip text NOT NULL REFERENCES zip_codes(zip),
+       created TIMESTAMPTZ DEFAULT now(),
+       modified TIMESTAMPTZ DEFAULT now(),
+       FOREIGN KEY (party_id, party_type) references parties (party_id, party_type),
+       FOREIGN KEY (party_id) references people_st (party_id),
+       CONSTRAINT hire_date_after_1970 CHECK (hire_date > '1970-01-01'),
+       CONSTRAINT hire_date_within_next_mon CHECK (hire_date < now()::date + interval '1 month'),
+       CONSTRAINT ssn_length_11 CHECK (length(ssn)<=11),
+       CONSTRAINT zip_length_5 CHECK (length(zip)=5),
+       CONSTRAINT party_type_is_i check (party_type = 'i') 
+);
+
+-- For "organizations", a subtype of parties
+CREATE TABLE organization_st (
+       party_id uuid PRIMARY KEY,
+       party_type text default 'o' check (party_type = 'o') NOT NULL,
+       org_type text NOT NULL,
+       CONSTRAINT check_org_in_list CHECK 
+            (org_type in('b', 'c', 'n', 'g')),
+            -- b = Business, c = coop, n = Nonprofit, g = Gov't
+       FOREIGN KEY (party_id, party_type) references parties (party_id, party_type))
+;
+
+CREATE TABLE ein_numbs (
+       ein VARCHAR NOT NULL PRIMARY KEY,
+       party_id uuid,
+       party_type text default 'o' check (party_type = 'o') NOT NULL,
+       FOREIGN KEY (party_id, party_type) references parties (party_id, party_type))
+;
+
+CREATE TABLE phones (
+       party_id uuid,
+       phone_type text not null default 'm' check 
+            (phone_type in ('w', 'h', 'f', 'b', 'm', 'e')),
+            -- work, home, fax, business, mobile, emergency
+       phone_no VARCHAR UNIQUE NOT NULL,
+       created TIMESTAMPTZ DEFAULT now(),
+       modified TIMESTAMPTZ DEFAULT now(),
+       primary key (party_id, phone_type)
+);
+
+CREATE TABLE emails (
+       party_id uuid NOT NULL,
+       email_type text not null default 'p',
+            -- work, business, personal
+       email VARCHAR UNIQUE NOT NULL,
+       created TIMESTAMPTZ DEFAULT now(),
+       modified TIMESTAMPTZ DEFAULT now(),
+       PRIMARY KEY (party_id, email_type),
+       CONSTRAINT email_type_from_list check 
+            (email_type in ('w', 'b', 'p'))
+);
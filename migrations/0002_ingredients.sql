@@ -0,0 +1,86 @@
+--ingredients, what they cost and the cost change log
+
+CREATE TABLE ingredients (
+       ingredient_id uuid PRIMARY KEY default gen_random_uuid(),
+       ingredient_name VARCHAR NOT NULL,
+       is_flour BOOLEAN NOT NULL,
+       created TIMESTAMPTZ DEFAULT now(),
+       modified TIMESTAMPTZ DEFAULT now()
+);
+
+CREATE INDEX ingredients_ingredient_name_trgm_idx ON ingredients
+ USING GIN (ingredient_name gin_trgm_ops);
+--CREATE INDEX ingredients_idx On ingredients (ingredient_name);
+
+CREATE TABLE ingredient_costs (
+       ingredient_id uuid NOT NULL REFERENCES ingredients (ingredient_id),
+       maker_id uuid NOT NULL, 
+       mio text NOT NULL check (mio in ('i', 'o')),
+       seller_id uuid NOT NULL, 
+       sio text NOT NULL check (sio in ('i', 'o')),
+       cost numeric(10,5) NOT NULL,
+       grams numeric NOT NULL,
+       created TIMESTAMPTZ DEFAULT now(),
+       modified TIMESTAMPTZ DEFAULT now(),
+       PRIMARY KEY (ingredient_id, maker_id, seller_id),
+       FOREIGN KEY (maker_id, mio) REFERENCES parties (party_id, party_type),
+       FOREIGN KEY (seller_id, sio) REFERENCES parties (party_id, party_type)
+);
+
+
+CREATE TABLE cost_change_log (
+       ingredient_id uuid NOT NULL REFERENCES ingredients (ingredient_id),
+       maker_id uuid NOT NULL, 
+       mio text NOT NULL check (mio in ('i', 'o')),
+       seller_id uuid NOT NULL, 
+       sio text NOT NULL check (sio in ('i', 'o')),
+       old_cost numeric(10,5) NOT NULL,
+       new_cost numeric(10,5) NOT NULL,
+       old_grams numeric NOT NULL,
+       new_grams numeric NOT NULL,
+       change_time TIMESTAMPTZ DEFAULT now(),
+       PRIMARY KEY (ingredient_id, maker_id, seller_id, change_time),
+       FOREIGN KEY (maker_id, mio) REFERENCES parties (party_id, party_type),
+       FOREIGN KEY (seller_id, sio) REFERENCES parties (party_id, party_type)
+);
+
+
+CREATE OR REPLACE FUNCTION record_if_cost_changed()
+       RETURNS trigger AS
+    $$
+    BEGIN
+          IF NEW.cost <> OLD.cost OR NEW.grams <> OLD.grams THEN
+            INSERT INTO cost_change_log (
+            ingredient_id,
+            maker_id,
+            mio,
+            seller_id,
+            sio,
+            old_cost,
+            new_cost,
+            old_grams,
+            new_grams,
+            change_time)
+        VALUES (
+            OLD.ingredient_id,
+            OLD.maker_id,
+            OLD.mio,
+            OLD.seller_id,
+            OLD.sio,
+            OLD.cost,
+            NEW.cost,
+            OLD.grams,
+            NEW.grams,
+            now()
+        );
+        END IF;
+        RETURN NEW;
+    END;
+    $$ LANGUAGE plpgsql;
+
+
+CREATE TRIGGER cost_update
+       AFTER UPDATE
+          on ingredient_costs
+       FOR EACH ROW
+       EXECUTE PROCEDURE record_if_cost_changed();
@@ -0,0 +1,139 @@
+--products, shapes, formulas and formula mods
+
+CREATE TABLE products (
+       product_id uuid PRIMARY KEY default gen_random_uuid(),
+       product_name VARCHAR UNIQUE NOT NULL,
+       lead_time_days INTEGER NOT NULL,
+       is_dough BOOLEAN NOT NULL,
+       CONSTRAINT lead_time_not_negative CHECK (lead_time_days >= 0),
+       CONSTRAINT lead_time_less_than_8 CHECK (lead_time_days < 8)
+);
+
+CREATE INDEX products_product_name_trgm_idx ON products
+ USING GIN (product_name gin_trgm_ops);
+
+CREATE TABLE product_instructions (
+       product_id uuid NOT NULL REFERENCES products(product_id),
+       sequence integer NOT NULL,
+       directions text NOT NULL,
+       CONSTRAINT sequence_positive CHECK (sequence >= 0)
+);
+
+CREATE TABLE shapes (
+       shape_id uuid PRIMARY KEY default gen_random_uuid(),
+       shape_name VARCHAR UNIQUE NOT NULL
+);
+
+CREATE INDEX shapes_shape_name_trgm_idx ON shapes
+ USING GIN (shape_name gin_trgm_ops);
+
+-- products may be divided into multiple shapes with different weights
+CREATE TABLE product_shapes (
+       product_id uuid NOT NULL REFERENCES products(product_id),
+       shape_id uuid NOT NULL REFERENCES shapes(shape_id),
+       grams INTEGER NOT NULL,
+       CONSTRAINT grams_greater_than_0 CHECK (grams > 0),
+       CONSTRAINT grams_less_than_3000 CHECK (grams < 3000),
+       PRIMARY KEY (product_id, shape_id)
+);
+
+CREATE TABLE product_ingredients (
+       product_id uuid NOT NULL REFERENCES products(product_id),
+       ingredient_id uuid NOT NULL REFERENCES ingredients(ingredient_id),
+       bakers_percent NUMERIC (5, 2) NOT NULL,
+       percent_in_sour NUMERIC DEFAULT 0 NOT NULL,
+       percent_in_poolish NUMERIC (5, 2) DEFAULT 0 NOT NULL,
+       percent_in_soaker NUMERIC DEFAULT 0 NOT NULL,
+       created TIMESTAMPTZ DEFAULT now() NOT NULL,
+       modified TIMESTAMPTZ DEFAULT now() NOT NULL,
+       PRIMARY KEY (product_id, ingredient_id),
+       CONSTRAINT bp_positive CHECK (bakers_percent > 0),
+       CONSTRAINT percent_in_sour_positive CHECK (percent_in_sour >= 0),
+       CONSTRAINT percent_in_sour_max_100 CHECK (percent_in_sour <= 100),
+       CONSTRAINT percent_in_poolish_positive CHECK (percent_in_poolish >= 0),
+       CONSTRAINT percent_in_poolish_max_100 CHECK (percent_in_poolish <= 100),
+       CONSTRAINT percent_in_soaker_positive CHECK (percent_in_soaker >= 0),
+       CONSTRAINT percent_in_soaker_max_100 CHECK (percent_in_soaker <= 100)
+);
+
+
+CREATE TABLE product_ingredients_changes (
+       product_id uuid NOT NULL REFERENCES products(product_id),
+       old_ingredient_id uuid NOT NULL REFERENCES ingredients(ingredient_id),
+       new_ingredient_id uuid NOT NULL REFERENCES ingredients(ingredient_id),
+       old_bakers_percent NUMERIC (5, 2) NOT NULL,
+       new_bakers_percent NUMERIC (5, 2) NOT NULL,
+       percent_in_sour NUMERIC NOT NULL,
+       percent_in_poolish NUMERIC (5, 2) NOT NULL,
+       percent_in_soaker NUMERIC NOT NULL,
+       created TIMESTAMPTZ DEFAULT now() NOT NULL,
+       modified TIMESTAMPTZ DEFAULT now(),
+       PRIMARY KEY (product_id, new_ingredient_id, created),
+       CONSTRAINT bp_positive CHECK (new_bakers_percent > 0),
+       CONSTRAINT percent_in_sour_positive CHECK (percent_in_sour >= 0),
+       CONSTRAINT percent_in_sour_max_100 CHECK (percent_in_sour <= 100),
+       CONSTRAINT percent_in_poolish_positive CHECK (percent_in_poolish >= 0),
+       CONSTRAINT percent_in_poolish_max_100 CHECK (percent_in_poolish <= 100),
+       CONSTRAINT percent_in_soaker_positive CHECK (percent_in_soaker >= 0),
+       CONSTRAINT percent_in_soaker_max_100 CHECK (percent_in_soaker <= 100)
+);
+
+
+CREATE OR REPLACE FUNCTION record_if_di_changed()
+       RETURNS trigger AS
+    $$
+    BEGIN
+          IF NEW.ingredient_id <> OLD.ingredient_id OR 
+             NEW.bakers_percent <> OLD.bakers_percent THEN
+            INSERT INTO product_ingredients_changes (
+            product_id,
+            old_ingredient_id,
+            new_ingredient_id,
+            old_bakers_percent,
+            new_bakers_percent,
+            percent_in_sour,
+            percent_in_poolish,
+            percent_in_soaker,
+            modified)
+        VALUES (
+            OLD.product_id,
+            OLD.ingredient_id,
+            NEW.ingredient_id,
+            OLD.bakers_percent,
+            NEW.bakers_percent,
+            OLD.percent_in_sour,
+            OLD.percent_in_poolish,
+            OLD.percent_in_soaker,
+            now()
+        );
+        END IF;
+        RETURN NEW;
+    END;
+    $$ LANGUAGE plpgsql;
+
+
+CREATE TRIGGER di_update
+       AFTER UPDATE
+          on product_ingredients
+       FOR EACH ROW
+       EXECUTE PROCEDURE record_if_di_changed();
+
+CREATE TABLE dough_mods (                                                 
+       mod_name VARCHAR NOT NULL, 
+       product_id uuid NOT NULL REFERENCES products(product_id),
+       ingredient_id uuid NOT NULL REFERENCES ingredients(ingredient_id),
+       bakers_percent NUMERIC (5, 2) NOT NULL,
+       percent_in_sour NUMERIC NOT NULL,
+       percent_in_poolish NUMERIC (5, 2)NOT NULL,
+       percent_in_soaker NUMERIC NOT NULL,
+       created TIMESTAMPTZ DEFAULT now(),
+       modified TIMESTAMPTZ DEFAULT now(),
+       PRIMARY KEY (mod_name, product_id, ingredient_id),
+       CONSTRAINT bp_positive CHECK (bakers_percent > 0),
+       CONSTRAINT percent_in_sour_positive CHECK (percent_in_sour >= 0),
+       CONSTRAINT percent_in_sour_max_100 CHECK (percent_in_sour <= 100),
+       CONSTRAINT percent_in_poolish_positive CHECK (percent_in_poolish >= 0),
+       CONSTRAINT percent_in_poolish_max_100 CHECK (percent_in_poolish <= 100),
+       CONSTRAINT percent_in_soaker_positive CHECK (percent_in_soaker >= 0),
+       CONSTRAINT percent_in_soaker_max_100 CHECK (percent_in_soaker <= 100)
+);
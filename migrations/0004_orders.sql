@@ -0,0 +1,133 @@
+--special orders, standing orders and temporary changes
+
+CREATE TABLE special_orders (
+       delivery_date DATE NOT NULL,
+       customer_id uuid NOT NULL,
+       io text NOT NULL,
+       product_id uuid NOT NULL REFERENCES products(product_id),
+       shape_id uuid NOT NULL REFERENCES shapes(shape_id),
+       amt INTEGER NOT NULL,
+       created TIMESTAMPTZ DEFAULT now(),
+       modified TIMESTAMPTZ DEFAULT now(),
+       PRIMARY KEY (delivery_date, customer_id, product_id, shape_id, created),
+       FOREIGN KEY (customer_id, io) references parties (party_id, party_type),
+       CONSTRAINT io_i_or_o CHECK (io in ('i', 'o')),
+       CONSTRAINT delivery_date_present_or_future CHECK (delivery_date >= now()::date),
+       CONSTRAINT delivery_date_in_next_6_mons CHECK (delivery_date < now()::date + interval '6 months'),
+       CONSTRAINT amt_greater_than_0 CHECK (amt > 0)
+);
+
+CREATE TABLE days_of_week (
+       dow_id SMALLINT PRIMARY KEY,
+       dow_names text UNIQUE NOT NULL,
+       CONSTRAINT dow_id_between_0_and_6 check (dow_id >= 0 AND dow_id <= 6),
+       CONSTRAINT dow_names_3_letter_abr check (dow_names in ('Mon', 'Tue',
+                 'Wed', 'Thu', 'Fri', 'Sat', 'Sun')
+));
+
+INSERT INTO days_of_week (dow_id, dow_names)
+       VALUES
+            (1, 'Mon'),
+            (2, 'Tue'),
+            (3, 'Wed'),
+            (4, 'Thu'),
+            (5, 'Fri'),
+            (6, 'Sat'),
+            (0, 'Sun')
+;
+
+CREATE TABLE standing_orders (
+       day_of_week SMALLINT NOT NULL REFERENCES days_of_week(dow_id),
+       customer_id uuid NOT NULL,
+       io text NOT NULL,
+       product_id uuid NOT NULL REFERENCES products(product_id),
+       shape_id uuid NOT NULL REFERENCES shapes(shape_id),
+       amt INTEGER NOT NULL,
+       created TIMESTAMPTZ DEFAULT now(),
+       modified TIMESTAMPTZ DEFAULT now(),
+       PRIMARY KEY (day_of_week, customer_id, product_id, shape_id),
+       FOREIGN KEY (customer_id, io) 
+                    references parties (party_id, party_type),
+       CONSTRAINT dow_in_0_thru_6 check (day_of_week IN (0, 1, 2, 3, 4, 5, 6)),
+       CONSTRAINT io_i_or_o CHECK (io in ('i', 'o')),
+       CONSTRAINT amt_greater_than_0 CHECK (amt > 0)
+);
+
+
+CREATE TABLE standing_change_log (
+       old_day_of_week SMALLINT NOT NULL REFERENCES days_of_week(dow_id),
+       new_day_of_week SMALLINT NOT NULL REFERENCES days_of_week(dow_id),
+       customer_id uuid NOT NULL,
+       io text NOT NULL,
+       product_id uuid NOT NULL REFERENCES products(product_id),
+       shape_id uuid NOT NULL REFERENCES shapes(shape_id),
+       old_amt INTEGER NOT NULL,
+       new_amt INTEGER NOT NULL,
+       change_time TIMESTAMPTZ DEFAULT now(),
+       PRIMARY KEY (new_day_of_week, customer_id, product_id, shape_id, change_time),
+       FOREIGN KEY (customer_id, io) 
+                    references parties (party_id, party_type),
+       CONSTRAINT dow_in_0_thru_6 check (new_day_of_week IN (0, 1, 2, 3, 4, 5, 6)),
+       CONSTRAINT io_i_or_o CHECK (io in ('i', 'o'))
+);
+
+CREATE OR REPLACE FUNCTION record_if_amt_changed()
+       RETURNS trigger AS
+    $$
+    BEGIN
+          IF NEW.amt <> OLD.amt OR NEW.day_of_week <> OLD.day_of_week THEN
+            INSERT INTO standing_change_log (
+            old_day_of_week,
+            new_day_of_week,
+            customer_id,
+            io,
+            product_id,
+            shape_id,
+            old_amt,
+            new_amt,
+            change_time)
+        VALUES (
+            OLD.day_of_week,
+            NEW.day_of_week,
+            OLD.customer_id,
+            OLD.io,
+            OLD.product_id,
+            OLD.shape_id,
+            OLD.amt,
+            NEW.amt,
+            now()
+        );
+        END IF;
+        RETURN NEW;
+    END;
+    $$ LANGUAGE plpgsql;
+
+CREATE TRIGGER amt_update
+       AFTER UPDATE
+          on standing_orders
+       FOR EACH ROW
+       EXECUTE PROCEDURE record_if_amt_changed();
+
+  --make temporary changes to standing orders
+CREATE TABLE tmp_chng (
+       day_of_week SMALLINT NOT NULL,
+       customer_id uuid NOT NULL,
+       product_id uuid NOT NULL REFERENCES products(product_id),
+       shape_id uuid NOT NULL REFERENCES shapes(shape_id),
+       start_date DATE NOT NULL,
+       resume_date DATE,
+       --percent * 100 (to be multiplied by standing order amount during tmp change period)
+       percent_multiplier numeric(4,1) NOT NULL,
+       created TIMESTAMPTZ DEFAULT now(),
+       modified TIMESTAMPTZ DEFAULT now(),
+       PRIMARY KEY (day_of_week, customer_id, product_id, shape_id, start_date),
+       FOREIGN KEY (day_of_week, customer_id, product_id, shape_id)
+               REFERENCES standing_orders (day_of_week, customer_id, product_id, shape_id),
+       CONSTRAINT dow_in_0_thru_6 check (day_of_week IN (0, 1, 2, 3, 4, 5, 6)),
+       CONSTRAINT start_date_in_next_6_mos CHECK (start_date >= now()::date AND 
+                  start_date < now()::date + interval '6 months'),
+       CONSTRAINT resume_in_next_6_mos CHECK (resume_date >= now()::date 
+                  AND resume_date < now()::date + interval '6 months'),
+       CONSTRAINT resume_after_start CHECK (resume_date > start_date),
+       CONSTRAINT multiplier_not_negative CHECK (percent_multiplier >=0)
+);
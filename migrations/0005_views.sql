@@ -0,0 +1,208 @@
+--directory, order and costing views
+
+CREATE OR REPLACE VIEW phone_book AS 
+WITH typology (party_id, phone_type_abbr, type) AS
+     (SELECT party_id, phone_type,  
+        CASE WHEN phone_type = 'w' THEN 'work'
+             WHEN phone_type = 'h' THEN 'home'
+             WHEN phone_type = 'f' THEN 'fax'
+             WHEN phone_type = 'b' THEN 'business'
+             WHEN phone_type = 'm' THEN 'mobile'
+             WHEN phone_type = 'e' THEN 'emergency'
+        END
+     FROM phones),
+
+name_join (party_id, new_name) AS
+     (SELECT p.party_id, 
+       CASE WHEN pe.party_type = 'i' THEN pe.first_name || ' ' || p.party_name
+       ELSE p.party_name
+       END 
+     FROM parties AS p
+     FULL JOIN people_st as pe on p.party_id = pe.party_id)
+
+
+SELECT ph.party_id, nm.new_name AS name, p.party_type, t.type, ph.phone_no
+  FROM phones AS ph
+  JOIN name_join as nm on ph.party_id = nm.party_id
+  JOIN typology AS t ON ph.party_id = t.party_id AND ph.phone_type = t.phone_type_abbr
+  JOIN parties AS p on ph.party_id = p.party_id
+  LEFT JOIN people_st AS pe ON ph.party_id = pe.party_id
+ ORDER BY ph.party_id, t.type;
+
+
+CREATE OR REPLACE VIEW staff_phones AS
+WITH mob_ph (
+    party_id, name, party_type, type, phone_no)
+AS (
+    SELECT * FROM phone_book
+    WHERE type = 'mobile'
+)
+
+SELECT COALESCE (ph.name, pe.first_name) AS name, 
+       s.hire_date, s.is_active, COALESCE (ph.phone_no, 'none') AS mobile
+FROM staff_st as s
+LEFT JOIN mob_ph as ph on s.party_id = ph.party_id
+JOIN people_st AS pe on s.party_id = pe.party_id;
+
+
+CREATE OR REPLACE VIEW email_list AS
+  WITH et (party_id, type_code, type) AS
+     (SELECT party_id, email_type,  
+        CASE WHEN email_type = 'w' THEN 'work'
+             WHEN email_type = 'b' THEN 'business'
+             WHEN email_type = 'p' THEN 'personal'
+        END
+     FROM emails),
+
+name_join (party_id, new_name) AS
+     (SELECT p.party_id, 
+       CASE WHEN pe.party_type = 'i' THEN pe.first_name || ' ' || p.party_name
+       ELSE p.party_name
+       END 
+     FROM parties AS p
+     FULL JOIN people_st as pe on p.party_id = pe.party_id)
+
+SELECT e.party_id, nm.new_name AS name, et.type, e.email 
+  FROM emails AS e
+  JOIN name_join as nm on e.party_id = nm.party_id
+  JOIN et ON e.party_id = et.party_id AND e.email_type = et.type_code
+  JOIN parties AS p on e.party_id = p.party_id
+  LEFT JOIN people_st as pe ON e.party_id = pe.party_id;
+
+
+CREATE OR REPLACE VIEW staff_list AS 
+SELECT DISTINCT s.party_id, pe.first_name, p.party_name AS last_name, 
+       s.ssn, s.is_active, s.hire_date, s.street_no, s.street, 
+       z.city, z.state, s.zip, ph.phone_no AS mobile
+FROM staff_st AS s
+JOIN people_st AS pe on s.party_id = pe.party_id
+JOIN parties AS p on s.party_id = p.party_id AND s.party_type = p.party_type
+FULL JOIN phone_book as ph ON s.party_id = ph.party_id
+JOIN zip_codes AS z on s.zip = z.zip;
+
+CREATE OR REPLACE VIEW people_list AS
+SELECT pe.party_id, pe.first_name, p.party_name AS last_name
+  FROM people_st AS pe
+  JOIN parties AS p ON pe.party_id = p.party_id
+;
+
+CREATE OR REPLACE VIEW shape_list AS 
+SELECT pr.product_name AS product, s.shape_name AS shape, 
+       ps.grams
+  FROM product_shapes as ps
+  JOIN products AS pr on ps.product_id = pr.product_id
+  Join shapes as s on ps.shape_id = s.shape_id;
+
+
+CREATE OR REPLACE VIEW ein_list AS 
+SELECT p.party_name as name, ei.ein FROM ein_numbs AS ei 
+  JOIN parties AS p on ei.party_id = p.party_id 
+       AND ei.party_type = p.party_type;
+
+
+CREATE OR REPLACE VIEW todays_orders AS 
+SELECT pr.product_id, p.party_name AS customer, so.delivery_date, 
+       pr.lead_time_days AS lead_time, so.amt, 
+       pr.product_name, s.shape_name, ps.grams AS grams
+    
+  FROM product_shapes AS ps 
+  JOIN products AS pr ON pr.product_id = ps.product_id
+  JOIN shapes AS s ON s.shape_id = ps.shape_id
+  JOIN special_orders as so ON so.product_id = ps.product_id
+       AND s.shape_id = so.shape_id
+  JOIN parties AS p on so.customer_id = p.party_id 
+       AND so.io = p.party_type
+ WHERE now()::date + pr.lead_time_days = so.delivery_date;
+
+
+CREATE OR REPLACE VIEW todays_adjusted_so AS
+WITH
+   current_so_changes (dow, cid, prid, sid, pm)
+  AS
+(
+    SELECT tc.day_of_week, tc.customer_id, tc.product_id, tc.shape_id, tc.percent_multiplier
+    FROM tmp_chng AS tc
+    JOIN products as pr ON tc.product_id = pr.product_id
+    WHERE tc.start_date - pr.lead_time_days <= TIMESTAMP 'now()'::date
+          AND tc.resume_date - pr.lead_time_days > TIMESTAMP 'now()'::date
+)
+
+SELECT so.day_of_week as dow, so.customer_id as cid, so.product_id as prid, pr.product_name, so.shape_id as sid,
+       COALESCE(round(so.amt * csc.pm / 100, 0), so.amt) AS amt, ps.grams as grams
+  FROM standing_orders as so
+  LEFT JOIN current_so_changes as csc
+       ON so.day_of_week = csc.dow AND so.customer_id = csc.cid
+       AND so.product_id = csc.prid AND so.shape_id = csc.sid
+  JOIN products as pr on so.product_id = pr.product_id
+  JOIN product_shapes as ps ON so.product_id = ps.product_id AND so.shape_id = ps.shape_id
+ WHERE 
+       so.day_of_week = (SELECT EXTRACT(DOW FROM TIMESTAMP 'now()')) + pr.lead_time_days 
+       OR
+       so.day_of_week + 7 = (SELECT EXTRACT(DOW FROM TIMESTAMP 'now()')) + pr.lead_time_days
+;
+
+--used by get_batch_weight function, which is called by formula function
+CREATE OR REPLACE VIEW todays_combined_spec_standing AS
+WITH
+    spec (dow, cid, prid, product_name, sid, amt, grams)
+AS
+    (
+SELECT date_part('dow', so.delivery_date), so.customer_id, so.product_id, pr.product_name,
+       so.shape_id, so.amt, ps.grams
+  FROM special_orders AS so
+  JOIN product_shapes as ps ON so.product_id = ps.product_id AND so.shape_id = ps.shape_id
+  JOIN products as pr ON so.product_id = pr.product_id
+ WHERE now()::date + pr.lead_time_days = so.delivery_date
+   )
+
+SELECT dow, cid, prid, product_name, 
+       sid, amt, grams
+  FROM todays_adjusted_so
+ UNION ALL
+SELECT dow, cid, prid, product_name, sid, amt, grams
+  FROM spec
+;
+
+CREATE OR REPLACE VIEW product_info AS 
+SELECT di.product_id, pr.product_name, di.bakers_percent, i.ingredient_name AS ingredient, 
+       i.is_flour, di.percent_in_sour, di.percent_in_poolish, di.percent_in_soaker
+  FROM product_ingredients AS di
+  JOIN ingredients AS i ON di.ingredient_id = i.ingredient_id
+  JOIN products as pr on di.product_id = pr.product_id
+ ORDER BY di.product_id, i.is_flour DESC, di.bakers_percent DESC;
+
+
+CREATE OR REPLACE VIEW standing_change_history AS
+SELECT p.party_name, pr.product_name, s.shape_name, dw.dow_names AS day_of_week,
+       sc.old_amt, sc.new_amt, sc.change_time
+  FROM standing_change_log as sc
+  JOIN parties as p on sc.customer_id = p.party_id AND sc.io = p.party_type
+  JOIN products as pr ON sc.product_id = pr.product_id
+  JOIN shapes AS s on sc.shape_id = s.shape_id
+  JOIN days_of_week AS dw on sc.old_day_of_week = dw.dow_id;
+
+
+CREATE OR REPLACE VIEW cost_change_list AS
+SELECT p.party_name as maker, i.ingredient_name as item, ROUND(cc.old_cost, 2) AS old_cost, 
+       ROUND(cc.new_cost, 2) AS new_cost, ROUND(cc.old_cost / cc.old_grams, 5) AS old_cost_per_g, 
+       ROUND(cc.new_cost / cc.new_grams, 5) as new_cost_per_g, cc.new_grams, cc.change_time
+  FROM cost_change_log as cc
+  JOIN ingredients as i on cc.ingredient_id = i.ingredient_id
+  JOIN parties as p on cc.maker_id = p.party_id
+ WHERE maker_id = p.party_id;
+
+--usage
+--SELECT ingredient_name as ingredient, cost, grams, cost_per_g 
+--FROM cost_list
+--WHERE cost_list.ingredient_name IN (SELECT ingredient FROM formula('rug%')) ORDER BY cost_per_g DESC;
+CREATE OR REPLACE VIEW cost_list AS
+SELECT i.ingredient_id, i.ingredient_name, ROUND(ic.cost, 2) AS cost, ic.grams, 
+       ROUND(ic.cost / ic.grams, 5) AS cost_per_g 
+  FROM ingredient_costs AS ic
+  JOIN ingredients as i on ic.ingredient_id = i.ingredient_id;
+
+
+CREATE OR REPLACE VIEW total_bp AS
+SELECT DISTINCT product_name, sum(bakers_percent) OVER 
+       (partition by product_name) AS total_bp
+  FROM product_info;
@@ -0,0 +1,188 @@
+--production plan: amount of each product/shape to mix on a bake date
+--(bake date = delivery date - lead time), materialized for a window of
+--dates and kept current by the plan_* triggers below
+--usage: SELECT rebuild_production_plan(now()::date, now()::date + 13);
+CREATE TABLE production_plan (
+       bake_date DATE NOT NULL,
+       product_id uuid NOT NULL REFERENCES products(product_id),
+       shape_id uuid NOT NULL REFERENCES shapes(shape_id),
+       amt numeric NOT NULL,
+       grams INTEGER NOT NULL,
+       refreshed TIMESTAMPTZ DEFAULT now(),
+       PRIMARY KEY (bake_date, product_id, shape_id)
+);
+
+--bake dates the triggers keep current; set by rebuild_production_plan
+CREATE TABLE production_plan_window (
+       only_row BOOLEAN PRIMARY KEY DEFAULT TRUE,
+       from_date DATE NOT NULL,
+       to_date DATE NOT NULL,
+       CONSTRAINT one_window CHECK (only_row),
+       CONSTRAINT to_after_from CHECK (to_date >= from_date)
+);
+
+--same rules as todays_adjusted_so + todays_combined_spec_standing, for any
+--range of bake dates: each standing order is expanded straight to the bake
+--dates whose delivery day matches its day_of_week
+CREATE OR REPLACE FUNCTION production_plan_rows(from_date DATE, to_date DATE)
+       RETURNS TABLE (bake_date DATE, product_id uuid, shape_id uuid,
+                      amt numeric, grams INTEGER) AS
+'WITH standing (bake_date, product_id, shape_id, amt) AS
+     (SELECT from_date + k, so.product_id, so.shape_id,
+             COALESCE(round(so.amt * tc.percent_multiplier / 100, 0), so.amt)
+        FROM standing_orders AS so
+        JOIN products AS pr ON so.product_id = pr.product_id
+       CROSS JOIN LATERAL generate_series(
+             (so.day_of_week - EXTRACT(DOW FROM from_date + pr.lead_time_days)::int + 7) % 7,
+             to_date - from_date, 7) AS k
+        LEFT JOIN tmp_chng AS tc
+             ON so.day_of_week = tc.day_of_week AND so.customer_id = tc.customer_id
+            AND so.product_id = tc.product_id AND so.shape_id = tc.shape_id
+            AND tc.start_date <= from_date + k + pr.lead_time_days
+            AND tc.resume_date > from_date + k + pr.lead_time_days),
+
+special (bake_date, product_id, shape_id, amt) AS
+     (SELECT so.delivery_date - pr.lead_time_days, so.product_id, so.shape_id, so.amt
+        FROM special_orders AS so
+        JOIN products AS pr ON so.product_id = pr.product_id
+       WHERE so.delivery_date BETWEEN from_date AND to_date + 7
+         AND so.delivery_date - pr.lead_time_days BETWEEN from_date AND to_date)
+
+SELECT o.bake_date, o.product_id, o.shape_id, sum(o.amt), ps.grams
+  FROM (SELECT * FROM standing UNION ALL SELECT * FROM special) AS o
+  JOIN product_shapes AS ps
+       ON o.product_id = ps.product_id AND o.shape_id = ps.shape_id
+ GROUP BY o.bake_date, o.product_id, o.shape_id, ps.grams;'
+LANGUAGE SQL
+STABLE;
+
+
+--recompute part of the plan; NULL products means every product
+CREATE OR REPLACE FUNCTION refresh_production_plan(from_date DATE, to_date DATE,
+                                                   which_products uuid[] DEFAULT NULL)
+       RETURNS void AS
+    $$
+    BEGIN
+        DELETE FROM production_plan AS pp
+         WHERE pp.bake_date BETWEEN from_date AND to_date
+           AND (which_products IS NULL OR pp.product_id = ANY(which_products));
+
+        INSERT INTO production_plan (bake_date, product_id, shape_id, amt, grams)
+        SELECT r.bake_date, r.product_id, r.shape_id, r.amt, r.grams
+          FROM production_plan_rows(from_date, to_date) AS r
+         WHERE which_products IS NULL OR r.product_id = ANY(which_products);
+    END;
+    $$ LANGUAGE plpgsql;
+
+
+--rebuild a range of bake dates and make it the window the triggers maintain;
+--dates outside the new window keep their rows but are no longer updated
+CREATE OR REPLACE FUNCTION rebuild_production_plan(from_date DATE, to_date DATE)
+       RETURNS void AS
+    $$
+    BEGIN
+        INSERT INTO production_plan_window (from_date, to_date)
+        VALUES (from_date, to_date)
+            ON CONFLICT (only_row)
+            DO UPDATE SET from_date = EXCLUDED.from_date, to_date = EXCLUDED.to_date;
+
+        PERFORM refresh_production_plan(from_date, to_date);
+    END;
+    $$ LANGUAGE plpgsql;
+
+
+--statement-level so a bulk load refreshes each touched product once
+CREATE OR REPLACE FUNCTION production_plan_changed()
+       RETURNS trigger AS
+    $$
+    DECLARE
+        changed uuid[] := '{}';
+        w production_plan_window%ROWTYPE;
+    BEGIN
+        SELECT * INTO w FROM production_plan_window;
+        IF NOT FOUND THEN
+            RETURN NULL;
+        END IF;
+
+        IF TG_OP IN ('INSERT', 'UPDATE') THEN
+            SELECT changed || array_agg(DISTINCT product_id) INTO changed FROM new_rows;
+        END IF;
+        IF TG_OP IN ('UPDATE', 'DELETE') THEN
+            SELECT changed || array_agg(DISTINCT product_id) INTO changed FROM old_rows;
+        END IF;
+
+        IF cardinality(changed) > 0 THEN
+            PERFORM refresh_production_plan(w.from_date, w.to_date, changed);
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql;
+
+
+CREATE TRIGGER plan_special_insert AFTER INSERT ON special_orders
+   REFERENCING NEW TABLE AS new_rows
+   FOR EACH STATEMENT EXECUTE PROCEDURE production_plan_changed();
+
+CREATE TRIGGER plan_special_update AFTER UPDATE ON special_orders
+   REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+   FOR EACH STATEMENT EXECUTE PROCEDURE production_plan_changed();
+
+CREATE TRIGGER plan_special_delete AFTER DELETE ON special_orders
+   REFERENCING OLD TABLE AS old_rows
+   FOR EACH STATEMENT EXECUTE PROCEDURE production_plan_changed();
+
+CREATE TRIGGER plan_standing_insert AFTER INSERT ON standing_orders
+   REFERENCING NEW TABLE AS new_rows
+   FOR EACH STATEMENT EXECUTE PROCEDURE production_plan_changed();
+
+CREATE TRIGGER plan_standing_update AFTER UPDATE ON standing_orders
+   REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+   FOR EACH STATEMENT EXECUTE PROCEDURE production_plan_changed();
+
+CREATE TRIGGER plan_standing_delete AFTER DELETE ON standing_orders
+   REFERENCING OLD TABLE AS old_rows
+   FOR EACH STATEMENT EXECUTE PROCEDURE production_plan_changed();
+
+CREATE TRIGGER plan_tmp_chng_insert AFTER INSERT ON tmp_chng
+   REFERENCING NEW TABLE AS new_rows
+   FOR EACH STATEMENT EXECUTE PROCEDURE production_plan_changed();
+
+CREATE TRIGGER plan_tmp_chng_update AFTER UPDATE ON tmp_chng
+   REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+   FOR EACH STATEMENT EXECUTE PROCEDURE production_plan_changed();
+
+CREATE TRIGGER plan_tmp_chng_delete AFTER DELETE ON tmp_chng
+   REFERENCING OLD TABLE AS old_rows
+   FOR EACH STATEMENT EXECUTE PROCEDURE production_plan_changed();
+
+CREATE TRIGGER plan_product_shapes_insert AFTER INSERT ON product_shapes
+   REFERENCING NEW TABLE AS new_rows
+   FOR EACH STATEMENT EXECUTE PROCEDURE production_plan_changed();
+
+CREATE TRIGGER plan_product_shapes_update AFTER UPDATE ON product_shapes
+   REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+   FOR EACH STATEMENT EXECUTE PROCEDURE production_plan_changed();
+
+CREATE TRIGGER plan_product_shapes_delete AFTER DELETE ON product_shapes
+   REFERENCING OLD TABLE AS old_rows
+   FOR EACH STATEMENT EXECUTE PROCEDURE production_plan_changed();
+
+--lead time moves every order of the product to a different bake date
+CREATE TRIGGER plan_products_update AFTER UPDATE ON products
+   REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+   FOR EACH STATEMENT EXECUTE PROCEDURE production_plan_changed();
+
+
+--today's slice of the plan; computed on the fly if today is not in the
+--materialized window
+CREATE OR REPLACE VIEW todays_plan AS
+SELECT pp.product_id, pp.shape_id, pp.amt, pp.grams
+  FROM production_plan AS pp
+ WHERE pp.bake_date = now()::date
+   AND EXISTS (SELECT 1 FROM production_plan_window AS w
+                WHERE now()::date BETWEEN w.from_date AND w.to_date)
+ UNION ALL
+SELECT r.product_id, r.shape_id, r.amt, r.grams
+  FROM production_plan_rows(now()::date, now()::date) AS r
+ WHERE NOT EXISTS (SELECT 1 FROM production_plan_window AS w
+                    WHERE now()::date BETWEEN w.from_date AND w.to_date);
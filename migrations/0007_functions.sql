@@ -0,0 +1,420 @@
+--formula, lookup and search functions
+
+CREATE OR REPLACE FUNCTION
+get_batch_weight(which_dough VARCHAR)
+RETURNS numeric AS
+'SELECT (SELECT COALESCE (sum(tp.amt * tp.grams), 0)
+   FROM todays_plan AS tp
+   JOIN products AS pr ON tp.product_id = pr.product_id
+  WHERE LOWER(pr.product_name) LIKE LOWER(which_dough))
+;'
+LANGUAGE SQL
+IMMUTABLE
+RETURNS NULL ON NULL INPUT;
+
+--called by formula function
+CREATE OR REPLACE FUNCTION bak_per(which_doe VARCHAR)
+  returns numeric AS
+          'SELECT DISTINCT sum(bakers_percent) OVER (PARTITION BY product_id)
+          FROM product_info WHERE LOWER(product_name) LIKE LOWER(which_doe);'
+ LANGUAGE SQL
+IMMUTABLE
+  RETURNS NULL ON NULL INPUT;
+
+
+--name lookups used by pid, prid, iid and sid and by resolver.py:
+--the b-tree serves exact matches and constant prefixes, the trigram
+--index serves any other LIKE pattern
+CREATE INDEX parties_lower_party_name_idx ON parties
+ (LOWER(party_name) text_pattern_ops);
+CREATE INDEX parties_lower_party_name_trgm_idx ON parties
+ USING GIN (LOWER(party_name) gin_trgm_ops);
+CREATE INDEX products_lower_product_name_idx ON products
+ (LOWER(product_name) text_pattern_ops);
+CREATE INDEX products_lower_product_name_trgm_idx ON products
+ USING GIN (LOWER(product_name) gin_trgm_ops);
+CREATE INDEX ingredients_lower_ingredient_name_idx ON ingredients
+ (LOWER(ingredient_name) text_pattern_ops);
+CREATE INDEX ingredients_lower_ingredient_name_trgm_idx ON ingredients
+ USING GIN (LOWER(ingredient_name) gin_trgm_ops);
+CREATE INDEX shapes_lower_shape_name_idx ON shapes
+ (LOWER(shape_name) text_pattern_ops);
+CREATE INDEX shapes_lower_shape_name_trgm_idx ON shapes
+ USING GIN (LOWER(shape_name) gin_trgm_ops);
+
+--tells resolver.py to drop its cached ids for the table
+CREATE OR REPLACE FUNCTION notify_name_change()
+RETURNS TRIGGER AS $$
+BEGIN
+        PERFORM pg_notify('name_change', TG_TABLE_NAME);
+        RETURN NULL;
+END;
+$$ language 'plpgsql';
+
+CREATE TRIGGER parties_name_change AFTER INSERT OR UPDATE OR DELETE ON parties
+   FOR EACH STATEMENT EXECUTE PROCEDURE notify_name_change();
+
+CREATE TRIGGER products_name_change AFTER INSERT OR UPDATE OR DELETE ON products
+   FOR EACH STATEMENT EXECUTE PROCEDURE notify_name_change();
+
+CREATE TRIGGER ingredients_name_change AFTER INSERT OR UPDATE OR DELETE ON ingredients
+   FOR EACH STATEMENT EXECUTE PROCEDURE notify_name_change();
+
+CREATE TRIGGER shapes_name_change AFTER INSERT OR UPDATE OR DELETE ON shapes
+   FOR EACH STATEMENT EXECUTE PROCEDURE notify_name_change();
+
+--exact (case-insensitive) match wins, otherwise the first LIKE match
+CREATE OR REPLACE FUNCTION pid(p_name VARCHAR)
+  returns uuid AS
+          '(SELECT party_id FROM parties
+            WHERE LOWER(party_name) = LOWER(p_name) LIMIT 1)
+           UNION ALL
+           (SELECT party_id FROM parties
+            WHERE LOWER(party_name) LIKE LOWER(p_name) LIMIT 1)
+           LIMIT 1;'
+ LANGUAGE SQL
+STABLE
+  RETURNS NULL ON NULL INPUT;
+
+
+CREATE OR REPLACE FUNCTION prid(d_name VARCHAR)
+  returns uuid AS
+          '(SELECT product_id FROM products
+            WHERE LOWER(product_name) = LOWER(d_name) LIMIT 1)
+           UNION ALL
+           (SELECT product_id FROM products
+            WHERE LOWER(product_name) LIKE LOWER(d_name) LIMIT 1)
+           LIMIT 1;'
+ LANGUAGE SQL
+STABLE
+  RETURNS NULL ON NULL INPUT;
+
+
+CREATE OR REPLACE FUNCTION iid(i_name VARCHAR)
+  returns uuid AS
+          '(SELECT ingredient_id FROM ingredients
+            WHERE LOWER(ingredient_name) = LOWER(i_name) LIMIT 1)
+           UNION ALL
+           (SELECT ingredient_id FROM ingredients
+            WHERE LOWER(ingredient_name) LIKE LOWER(i_name) LIMIT 1)
+           LIMIT 1;'
+ LANGUAGE SQL
+STABLE
+  RETURNS NULL ON NULL INPUT;
+
+
+CREATE OR REPLACE FUNCTION sid(s_name VARCHAR)
+  returns uuid AS
+          '(SELECT shape_id FROM shapes
+            WHERE LOWER(shape_name) = LOWER(s_name) LIMIT 1)
+           UNION ALL
+           (SELECT shape_id FROM shapes
+            WHERE LOWER(shape_name) LIKE LOWER(s_name) LIMIT 1)
+           LIMIT 1;'
+ LANGUAGE SQL
+STABLE
+  RETURNS NULL ON NULL INPUT;
+
+
+--usage: SELECT bak_per2('kam%', 'cran%');
+CREATE OR REPLACE FUNCTION bak_per2(which_doe VARCHAR, mod VARCHAR)
+  returns numeric AS
+
+          'SELECT (SELECT SUM(dm.bakers_percent) 
+           FROM dough_mods AS dm
+           JOIN products as pr on dm.product_id = pr.product_id
+           WHERE LOWER(pr.product_name) LIKE LOWER(which_doe)) +
+           (SELECT SUM(di.bakers_percent)
+           FROM product_ingredients AS di
+           JOIN products as pr on di.product_id = pr.product_id
+           WHERE LOWER(pr.product_name) LIKE LOWER(which_doe)
+           AND di.ingredient_id NOT IN (SELECT ingredient_id 
+           FROM dough_mods AS dm
+           JOIN products as pr on dm.product_id = pr.product_id
+           WHERE LOWER(pr.product_name) LIKE LOWER(which_doe) 
+           AND LOWER(mod_name) LIKE LOWER(mod)));'
+
+LANGUAGE SQL
+IMMUTABLE
+  RETURNS NULL ON NULL INPUT;
+
+
+--formula function usage: 
+
+--formula with sour and soaker:
+         --SELECT "%", ingredient, overall, sour, soaker, final FROM formula('kam%');
+--formula with poolish:
+         --SELECT "%", ingredient, overall, poolish, final FROM formula('pizza');
+--recipe with no preferments
+         --SELECT product, "%", ingredient, overall as grams FROM formula('cao%');
+--sum of the product cost
+         --SELECT sum(cost) FROM formula('rug%');
+--cost per gram
+         --SELECT sum(overall) AS grams, sum(cost) AS cost, ROUND(sum(cost) / sum(overall),4) AS cost_per_gram FROM formula('rug%');
+
+--all products due today in one query:
+         --SELECT * FROM formula_all();
+
+--one row per product ingredient, with the product's total baker's percent
+--worked out once; used by formula and formula_all
+CREATE OR REPLACE VIEW formula_base AS
+SELECT din.product_id, din.product_name, din.bakers_percent, din.ingredient,
+       din.is_flour, din.percent_in_sour, din.percent_in_poolish,
+       din.percent_in_soaker, din.total_bp, cl.cost_per_g
+  FROM (SELECT pi.*, sum(pi.bakers_percent) OVER
+               (PARTITION BY pi.product_id, pi.product_name) AS total_bp
+          FROM product_info AS pi) AS din
+  JOIN cost_list as cl on din.ingredient = cl.ingredient_name;
+
+--today's total dough weight per product, read from the production plan
+CREATE OR REPLACE VIEW todays_batch_weights AS
+SELECT pr.product_id, pr.product_name, sum(tp.amt * tp.grams) AS batch_weight
+  FROM todays_plan AS tp
+  JOIN products AS pr ON tp.product_id = pr.product_id
+ GROUP BY pr.product_id, pr.product_name;
+
+CREATE OR REPLACE FUNCTION formula(my_product VARCHAR)
+       RETURNS TABLE (product character varying, "%" numeric, ingredient character varying,
+       overall numeric, sour numeric, poolish numeric, soaker numeric, final numeric, cost numeric) AS $$
+       BEGIN
+             RETURN QUERY
+                    WITH bw (product_id, batch_weight) AS
+                         (SELECT pr.product_id, sum(tp.amt * tp.grams)
+                            FROM todays_plan AS tp
+                            JOIN products AS pr ON tp.product_id = pr.product_id
+                           WHERE LOWER(pr.product_name) LIKE LOWER(my_product)
+                           GROUP BY pr.product_id),
+
+                    scaled AS
+                         (SELECT fb.*, COALESCE(bw.batch_weight, 0) *
+                                 fb.bakers_percent / fb.total_bp AS g
+                            FROM formula_base AS fb
+                            LEFT JOIN bw ON fb.product_id = bw.product_id
+                           WHERE LOWER(fb.product_name) LIKE LOWER(my_product))
+
+                    SELECT s.product_name, s.bakers_percent, s.ingredient,
+                    ROUND(s.g, 0),
+                    ROUND(s.g * s.percent_in_sour /100, 0),
+                    ROUND(s.g * s.percent_in_poolish /100, 1),
+                    ROUND(s.g * s.percent_in_soaker /100, 0),
+                    ROUND(s.g * (1- (s.percent_in_sour +
+                          s.percent_in_poolish + s.percent_in_soaker)/100), 0),
+                    ROUND(s.g, 0) * s.cost_per_g AS cost
+                    FROM scaled AS s
+                    ORDER BY s.product_id, s.is_flour DESC, s.bakers_percent DESC;
+      END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION formula_all()
+       RETURNS TABLE (product character varying, "%" numeric, ingredient character varying,
+       overall numeric, sour numeric, poolish numeric, soaker numeric, final numeric, cost numeric) AS $$
+       BEGIN
+             RETURN QUERY
+                    WITH scaled AS
+                         (SELECT fb.*, bw.batch_weight *
+                                 fb.bakers_percent / fb.total_bp AS g
+                            FROM formula_base AS fb
+                            JOIN todays_batch_weights AS bw
+                                 ON fb.product_id = bw.product_id)
+
+                    SELECT s.product_name, s.bakers_percent, s.ingredient,
+                    ROUND(s.g, 0),
+                    ROUND(s.g * s.percent_in_sour /100, 0),
+                    ROUND(s.g * s.percent_in_poolish /100, 1),
+                    ROUND(s.g * s.percent_in_soaker /100, 0),
+                    ROUND(s.g * (1- (s.percent_in_sour +
+                          s.percent_in_poolish + s.percent_in_soaker)/100), 0),
+                    ROUND(s.g, 0) * s.cost_per_g AS cost
+                    FROM scaled AS s
+                    ORDER BY s.product_name, s.is_flour DESC, s.bakers_percent DESC;
+      END;
+$$ LANGUAGE plpgsql;
+
+--forward forecast over a range of bake dates, one row per day, product and
+--ingredient; batch_weight is the product's total dough for that day
+--usage: SELECT * FROM production_forecast(now()::date, now()::date + 6);
+--flour to buy for next week:
+         --SELECT ingredient, sum(overall) FROM production_forecast(now()::date + 7, now()::date + 13)
+         --GROUP BY ingredient ORDER BY 2 DESC;
+CREATE OR REPLACE FUNCTION production_forecast(start_date DATE, end_date DATE)
+       RETURNS TABLE (bake_date DATE, product character varying, batch_weight numeric,
+       "%" numeric, ingredient character varying, overall numeric, sour numeric,
+       poolish numeric, soaker numeric, final numeric) AS
+'WITH bw (bake_date, product_id, batch_weight) AS
+     (SELECT r.bake_date, r.product_id, sum(r.amt * r.grams)
+        FROM production_plan_rows(start_date, end_date) AS r
+       GROUP BY r.bake_date, r.product_id),
+
+recipe AS
+     (SELECT di.product_id, pr.product_name, i.ingredient_name, i.is_flour,
+             di.bakers_percent, di.percent_in_sour, di.percent_in_poolish,
+             di.percent_in_soaker,
+             sum(di.bakers_percent) OVER (PARTITION BY di.product_id) AS total_bp
+        FROM product_ingredients AS di
+        JOIN ingredients AS i ON di.ingredient_id = i.ingredient_id
+        JOIN products AS pr ON di.product_id = pr.product_id
+       WHERE di.product_id IN (SELECT product_id FROM bw))
+
+SELECT bw.bake_date, rc.product_name, bw.batch_weight, rc.bakers_percent,
+       rc.ingredient_name,
+       ROUND(s.g, 0),
+       ROUND(s.g * rc.percent_in_sour /100, 0),
+       ROUND(s.g * rc.percent_in_poolish /100, 1),
+       ROUND(s.g * rc.percent_in_soaker /100, 0),
+       ROUND(s.g * (1- (rc.percent_in_sour +
+             rc.percent_in_poolish + rc.percent_in_soaker)/100), 0)
+  FROM bw
+  JOIN recipe AS rc ON bw.product_id = rc.product_id
+ CROSS JOIN LATERAL (SELECT bw.batch_weight * rc.bakers_percent / rc.total_bp) AS s (g)
+ ORDER BY bw.bake_date, rc.product_name, rc.is_flour DESC, rc.bakers_percent DESC;'
+LANGUAGE SQL
+STABLE;
+
+--ingredient demand across every product baked in a range of dates, split
+--into preferment stages, with the cheapest seller's package size and the
+--packages and spend needed to cover it
+--usage: SELECT * FROM ingredient_demand(now()::date, now()::date + 6);
+--spend per seller:
+         --SELECT seller, sum(spend) FROM ingredient_demand(now()::date, now()::date + 6)
+         --GROUP BY seller;
+CREATE OR REPLACE FUNCTION ingredient_demand(start_date DATE, end_date DATE)
+       RETURNS TABLE (ingredient_id uuid, ingredient character varying, is_flour boolean,
+       overall numeric, sour numeric, poolish numeric, soaker numeric, final numeric,
+       seller character varying, package_grams numeric, package_cost numeric,
+       packages numeric, spend numeric) AS
+'WITH bw (product_id, batch_weight) AS
+     (SELECT r.product_id, sum(r.amt * r.grams)
+        FROM production_plan_rows(start_date, end_date) AS r
+       GROUP BY r.product_id),
+
+recipe AS
+     (SELECT di.*, sum(di.bakers_percent) OVER (PARTITION BY di.product_id) AS total_bp
+        FROM product_ingredients AS di
+       WHERE di.product_id IN (SELECT product_id FROM bw)),
+
+need (ingredient_id, overall, sour, poolish, soaker, final) AS
+     (SELECT rc.ingredient_id, sum(s.g), sum(s.g * rc.percent_in_sour /100),
+             sum(s.g * rc.percent_in_poolish /100),
+             sum(s.g * rc.percent_in_soaker /100),
+             sum(s.g * (1- (rc.percent_in_sour + rc.percent_in_poolish +
+                 rc.percent_in_soaker)/100))
+        FROM bw
+        JOIN recipe AS rc ON bw.product_id = rc.product_id
+       CROSS JOIN LATERAL (SELECT bw.batch_weight * rc.bakers_percent / rc.total_bp) AS s (g)
+       GROUP BY rc.ingredient_id),
+
+source AS
+     (SELECT DISTINCT ON (ic.ingredient_id) ic.ingredient_id, ic.seller_id, ic.sio,
+             ic.cost, ic.grams
+        FROM ingredient_costs AS ic
+       ORDER BY ic.ingredient_id, ic.cost / ic.grams, ic.seller_id)
+
+SELECT n.ingredient_id, i.ingredient_name, i.is_flour, ROUND(n.overall, 0),
+       ROUND(n.sour, 0), ROUND(n.poolish, 1), ROUND(n.soaker, 0), ROUND(n.final, 0),
+       p.party_name, src.grams, src.cost, CEIL(n.overall / src.grams),
+       CEIL(n.overall / src.grams) * src.cost
+  FROM need AS n
+  JOIN ingredients AS i ON n.ingredient_id = i.ingredient_id
+  LEFT JOIN source AS src ON n.ingredient_id = src.ingredient_id
+  LEFT JOIN parties AS p ON src.seller_id = p.party_id AND src.sio = p.party_type
+ ORDER BY p.party_name, i.is_flour DESC, i.ingredient_name;'
+LANGUAGE SQL
+STABLE;
+
+--useage: SELECT * FROM modded_formula('Kam%', 'cran%');
+CREATE OR REPLACE FUNCTION modded_formula(get_dough VARCHAR, get_mod VARCHAR)
+       RETURNS TABLE (dough character varying, "%" numeric, ingredient character varying,
+       overall numeric, sour numeric, poolish numeric, soaker numeric, final numeric) AS $$
+       BEGIN
+             RETURN QUERY
+            WITH dmu (
+                product_name, product_id, ingredient_id, ingredient_name, is_flour, bakers_percent,
+                percent_in_sour, percent_in_poolish, percent_in_soaker
+                ) AS 
+            (SELECT pr.product_name, dm.product_id, dm.ingredient_id, i.ingredient_name, i.is_flour, dm.bakers_percent, 
+            dm.percent_in_sour, dm.percent_in_poolish, dm.percent_in_soaker
+FROM dough_mods as dm 
+JOIN ingredients as i on dm.ingredient_id = i.ingredient_id
+JOIN products as pr on dm.product_id = pr.product_id
+     WHERE LOWER(dm.mod_name) LIKE LOWER(get_mod) AND LOWER(pr.product_name) LIKE LOWER(get_dough)
+     UNION ALL
+SELECT pr.product_name, di.product_id, di.ingredient_id, i.ingredient_name, i.is_flour, di.bakers_percent, 
+             di.percent_in_sour, di.percent_in_poolish, di.percent_in_soaker
+FROM product_ingredients as di 
+JOIN ingredients as i on di.ingredient_id = i.ingredient_id
+JOIN products as pr on di.product_id = pr.product_id
+WHERE LOWER(pr.product_name) LIKE LOWER(get_dough)
+AND di.ingredient_id NOT IN (SELECT ingredient_id FROM dough_mods)
+ORDER BY is_flour DESC, bakers_percent DESC)
+
+                    SELECT product_name, bakers_percent, ingredient_name,
+                    ROUND(get_batch_weight(get_dough) * bakers_percent /
+                          bak_per2(get_dough, get_mod), 0),
+                    ROUND(get_batch_weight(get_dough) * bakers_percent /
+                          bak_per2(get_dough, get_mod) * percent_in_sour /100, 0),
+                    ROUND(get_batch_weight(get_dough) * bakers_percent /
+                          bak_per2(get_dough, get_mod) * percent_in_poolish /100, 1),
+                    ROUND(get_batch_weight(get_dough) * bakers_percent /
+                          bak_per2(get_dough, get_mod) * percent_in_soaker /100, 0),
+                    ROUND(get_batch_weight(get_dough) * bakers_percent /
+                          bak_per2(get_dough, get_mod) * (1- (percent_in_sour + 
+                          percent_in_poolish + percent_in_soaker)/100), 0)
+                    FROM dmu
+                    WHERE LOWER(product_name) LIKE LOWER(get_dough)
+                    ;
+      END;
+$$ LANGUAGE plpgsql;
+
+
+       --Usage: SELECT * FROM fuzzy_search('madsin sourdoh');
+       --        SELECT * FROM fuzzy_search('kamut', ARRAY['product'], 3, 0.2);
+--ranked typo-tolerant lookup across parties, products, ingredients and
+--shapes through the trigram indexes; threshold is the pg_trgm similarity
+--cutoff (0 to 1) and k the number of results
+CREATE OR REPLACE FUNCTION fuzzy_search(query text,
+       kinds text[] DEFAULT ARRAY['party', 'product', 'ingredient', 'shape'],
+       k INTEGER DEFAULT 5, threshold real DEFAULT 0.3)
+       RETURNS TABLE (kind text, id uuid, name VARCHAR, score real) AS $$
+       BEGIN
+              PERFORM set_config('pg_trgm.similarity_threshold', threshold::text, true);
+              RETURN QUERY
+                 SELECT m.kind, m.id, m.name, m.score
+                   FROM ((SELECT 'party'::text, p.party_id, p.party_name,
+                                 similarity(p.party_name, query)
+                            FROM parties AS p
+                           WHERE 'party' = ANY(kinds) AND p.party_name % query
+                           ORDER BY 4 DESC LIMIT k)
+                         UNION ALL
+                         (SELECT 'product'::text, pr.product_id, pr.product_name,
+                                 similarity(pr.product_name, query)
+                            FROM products AS pr
+                           WHERE 'product' = ANY(kinds) AND pr.product_name % query
+                           ORDER BY 4 DESC LIMIT k)
+                         UNION ALL
+                         (SELECT 'ingredient'::text, i.ingredient_id, i.ingredient_name,
+                                 similarity(i.ingredient_name, query)
+                            FROM ingredients AS i
+                           WHERE 'ingredient' = ANY(kinds) AND i.ingredient_name % query
+                           ORDER BY 4 DESC LIMIT k)
+                         UNION ALL
+                         (SELECT 'shape'::text, s.shape_id, s.shape_name,
+                                 similarity(s.shape_name, query)
+                            FROM shapes AS s
+                           WHERE 'shape' = ANY(kinds) AND s.shape_name % query
+                           ORDER BY 4 DESC LIMIT k)) AS m (kind, id, name, score)
+                  ORDER BY m.score DESC, m.name
+                  LIMIT k;
+       END;
+$$ LANGUAGE plpgsql;
+
+
+       --Useage: SELECT * FROM phone_search('mad%');
+CREATE OR REPLACE FUNCTION phone_search(name_snippet VARCHAR)
+       RETURNS TABLE (name VARCHAR, phone_type text, phone_no VARCHAR) AS $$
+       BEGIN
+              RETURN QUERY
+                 SELECT pb.name, pb.type, pb.phone_no
+                 FROM phone_book AS pb
+                 WHERE LOWER(pb.name) LIKE LOWER(name_snippet);
+       END;
+$$ LANGUAGE plpgsql;
@@ -0,0 +1,38 @@
+--function for triggers to update any column named 'modified'
+CREATE OR REPLACE FUNCTION update_modified_column() 
+RETURNS TRIGGER AS $$
+BEGIN
+        NEW.modified = now();
+            RETURN NEW; 
+END;
+$$ language 'plpgsql';
+
+CREATE TRIGGER update_parties_modtime BEFORE UPDATE ON parties 
+   FOR EACH ROW EXECUTE PROCEDURE update_modified_column();
+
+CREATE TRIGGER update_people_modtime BEFORE UPDATE ON people_st
+   FOR EACH ROW EXECUTE PROCEDURE update_modified_column();
+
+CREATE TRIGGER update_phones_modtime BEFORE UPDATE ON phones
+   FOR EACH ROW EXECUTE PROCEDURE update_modified_column();
+
+CREATE TRIGGER update_ingredients_modtime BEFORE UPDATE ON ingredients
+   FOR EACH ROW EXECUTE PROCEDURE update_modified_column();
+
+CREATE TRIGGER update_ingredient_costs_modtime BEFORE UPDATE ON ingredient_costs
+   FOR EACH ROW EXECUTE PROCEDURE update_modified_column();
+
+CREATE TRIGGER update_d_ingredients_modtime BEFORE UPDATE ON product_ingredients
+   FOR EACH ROW EXECUTE PROCEDURE update_modified_column();
+
+CREATE TRIGGER update_dough_mods_modtime BEFORE UPDATE ON dough_mods
+   FOR EACH ROW EXECUTE PROCEDURE update_modified_column();
+
+CREATE TRIGGER update_spec_orders_modtime BEFORE UPDATE ON special_orders
+   FOR EACH ROW EXECUTE PROCEDURE update_modified_column();
+
+CREATE TRIGGER update_tmp_chng_modtime BEFORE UPDATE ON tmp_chng
+   FOR EACH ROW EXECUTE PROCEDURE update_modified_column();
+
+CREATE TRIGGER update_stand_orders_modtime BEFORE UPDATE ON standing_orders
+   FOR EACH ROW EXECUTE PROCEDURE update_modified_column();
@@ -0,0 +1,236 @@
+--contact_directory: one maintained row per party with its display name,
+--phones, emails and staff flags, so directory lookups stop rebuilding the
+--name_join/typology CTEs over every phone and party on each read
+
+CREATE OR REPLACE FUNCTION phone_type_name(code text)
+  RETURNS text AS
+  'SELECT CASE code WHEN ''w'' THEN ''work''
+                    WHEN ''h'' THEN ''home''
+                    WHEN ''f'' THEN ''fax''
+                    WHEN ''b'' THEN ''business''
+                    WHEN ''m'' THEN ''mobile''
+                    WHEN ''e'' THEN ''emergency''
+          END;'
+LANGUAGE SQL
+IMMUTABLE;
+
+CREATE OR REPLACE FUNCTION email_type_name(code text)
+  RETURNS text AS
+  'SELECT CASE code WHEN ''w'' THEN ''work''
+                    WHEN ''b'' THEN ''business''
+                    WHEN ''p'' THEN ''personal''
+          END;'
+LANGUAGE SQL
+IMMUTABLE;
+
+
+--phone_types/phone_nos and email_types/emails are parallel arrays, sorted
+--by type name the way phone_book always listed them
+CREATE TABLE contact_directory (
+       party_id uuid PRIMARY KEY,
+       party_type text NOT NULL,
+       name text NOT NULL,
+       lower_name text NOT NULL,
+       first_name VARCHAR,
+       last_name VARCHAR NOT NULL,
+       phone_types text[] NOT NULL DEFAULT '{}',
+       phone_nos VARCHAR[] NOT NULL DEFAULT '{}',
+       email_types text[] NOT NULL DEFAULT '{}',
+       emails VARCHAR[] NOT NULL DEFAULT '{}',
+       is_staff BOOLEAN NOT NULL DEFAULT false,
+       staff_active BOOLEAN NOT NULL DEFAULT false,
+       refreshed TIMESTAMPTZ DEFAULT now(),
+       FOREIGN KEY (party_id, party_type) REFERENCES parties (party_id, party_type)
+               ON DELETE CASCADE
+);
+
+--prefix LIKE ('mad%') uses the b-tree, infix and typo searches the trigram
+CREATE INDEX contact_directory_lower_name_idx ON contact_directory
+ (lower_name text_pattern_ops);
+CREATE INDEX contact_directory_lower_name_trgm_idx ON contact_directory
+ USING GIN (lower_name gin_trgm_ops);
+CREATE INDEX contact_directory_staff_idx ON contact_directory (party_id)
+ WHERE is_staff;
+
+
+--usage: SELECT refresh_contacts(ARRAY[pid('Madison Sourdough')]);
+CREATE OR REPLACE FUNCTION refresh_contacts(which_parties uuid[])
+       RETURNS void AS
+    $$
+    BEGIN
+        DELETE FROM contact_directory AS cd
+         WHERE cd.party_id = ANY(which_parties)
+           AND NOT EXISTS (SELECT 1 FROM parties AS p WHERE p.party_id = cd.party_id);
+
+        INSERT INTO contact_directory
+               (party_id, party_type, name, lower_name, first_name, last_name,
+                phone_types, phone_nos, email_types, emails, is_staff, staff_active,
+                refreshed)
+        SELECT p.party_id, p.party_type, n.name, LOWER(n.name), pe.first_name, p.party_name,
+               COALESCE(ph.types, '{}'), COALESCE(ph.nos, '{}'),
+               COALESCE(em.types, '{}'), COALESCE(em.addrs, '{}'),
+               s.party_id IS NOT NULL, COALESCE(s.is_active, false), now()
+          FROM parties AS p
+          LEFT JOIN people_st AS pe ON p.party_id = pe.party_id
+          LEFT JOIN staff_st AS s ON p.party_id = s.party_id
+         CROSS JOIN LATERAL
+               (SELECT CASE WHEN pe.party_id IS NOT NULL
+                            THEN pe.first_name || ' ' || p.party_name
+                            ELSE p.party_name
+                       END) AS n (name)
+          LEFT JOIN LATERAL
+               (SELECT array_agg(phone_type_name(x.phone_type) ORDER BY phone_type_name(x.phone_type)),
+                       array_agg(x.phone_no ORDER BY phone_type_name(x.phone_type))
+                  FROM phones AS x
+                 WHERE x.party_id = p.party_id) AS ph (types, nos) ON true
+          LEFT JOIN LATERAL
+               (SELECT array_agg(email_type_name(x.email_type) ORDER BY email_type_name(x.email_type)),
+                       array_agg(x.email ORDER BY email_type_name(x.email_type))
+                  FROM emails AS x
+                 WHERE x.party_id = p.party_id) AS em (types, addrs) ON true
+         WHERE p.party_id = ANY(which_parties)
+            ON CONFLICT (party_id) DO UPDATE
+           SET party_type = EXCLUDED.party_type,
+               name = EXCLUDED.name,
+               lower_name = EXCLUDED.lower_name,
+               first_name = EXCLUDED.first_name,
+               last_name = EXCLUDED.last_name,
+               phone_types = EXCLUDED.phone_types,
+               phone_nos = EXCLUDED.phone_nos,
+               email_types = EXCLUDED.email_types,
+               emails = EXCLUDED.emails,
+               is_staff = EXCLUDED.is_staff,
+               staff_active = EXCLUDED.staff_active,
+               refreshed = EXCLUDED.refreshed;
+    END;
+    $$ LANGUAGE plpgsql;
+
+
+--statement-level, so a bulk load refreshes each touched party once
+CREATE OR REPLACE FUNCTION contact_directory_changed()
+       RETURNS trigger AS
+    $$
+    DECLARE
+        changed uuid[] := '{}';
+    BEGIN
+        IF TG_OP IN ('INSERT', 'UPDATE') THEN
+            SELECT changed || array_agg(DISTINCT party_id) INTO changed FROM new_rows;
+        END IF;
+        IF TG_OP IN ('UPDATE', 'DELETE') THEN
+            SELECT changed || array_agg(DISTINCT party_id) INTO changed FROM old_rows;
+        END IF;
+
+        IF cardinality(changed) > 0 THEN
+            PERFORM refresh_contacts(changed);
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql;
+
+
+CREATE TRIGGER contact_parties_insert AFTER INSERT ON parties
+   REFERENCING NEW TABLE AS new_rows
+   FOR EACH STATEMENT EXECUTE PROCEDURE contact_directory_changed();
+
+CREATE TRIGGER contact_parties_update AFTER UPDATE ON parties
+   REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+   FOR EACH STATEMENT EXECUTE PROCEDURE contact_directory_changed();
+
+CREATE TRIGGER contact_parties_delete AFTER DELETE ON parties
+   REFERENCING OLD TABLE AS old_rows
+   FOR EACH STATEMENT EXECUTE PROCEDURE contact_directory_changed();
+
+CREATE TRIGGER contact_people_insert AFTER INSERT ON people_st
+   REFERENCING NEW TABLE AS new_rows
+   FOR EACH STATEMENT EXECUTE PROCEDURE contact_directory_changed();
+
+CREATE TRIGGER contact_people_update AFTER UPDATE ON people_st
+   REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+   FOR EACH STATEMENT EXECUTE PROCEDURE contact_directory_changed();
+
+CREATE TRIGGER contact_people_delete AFTER DELETE ON people_st
+   REFERENCING OLD TABLE AS old_rows
+   FOR EACH STATEMENT EXECUTE PROCEDURE contact_directory_changed();
+
+CREATE TRIGGER contact_staff_insert AFTER INSERT ON staff_st
+   REFERENCING NEW TABLE AS new_rows
+   FOR EACH STATEMENT EXECUTE PROCEDURE contact_directory_changed();
+
+CREATE TRIGGER contact_staff_update AFTER UPDATE ON staff_st
+   REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+   FOR EACH STATEMENT EXECUTE PROCEDURE contact_directory_changed();
+
+CREATE TRIGGER contact_staff_delete AFTER DELETE ON staff_st
+   REFERENCING OLD TABLE AS old_rows
+   FOR EACH STATEMENT EXECUTE PROCEDURE contact_directory_changed();
+
+CREATE TRIGGER contact_phones_insert AFTER INSERT ON phones
+   REFERENCING NEW TABLE AS new_rows
+   FOR EACH STATEMENT EXECUTE PROCEDURE contact_directory_changed();
+
+CREATE TRIGGER contact_phones_update AFTER UPDATE ON phones
+   REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+   FOR EACH STATEMENT EXECUTE PROCEDURE contact_directory_changed();
+
+CREATE TRIGGER contact_phones_delete AFTER DELETE ON phones
+   REFERENCING OLD TABLE AS old_rows
+   FOR EACH STATEMENT EXECUTE PROCEDURE contact_directory_changed();
+
+CREATE TRIGGER contact_emails_insert AFTER INSERT ON emails
+   REFERENCING NEW TABLE AS new_rows
+   FOR EACH STATEMENT EXECUTE PROCEDURE contact_directory_changed();
+
+CREATE TRIGGER contact_emails_update AFTER UPDATE ON emails
+   REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+   FOR EACH STATEMENT EXECUTE PROCEDURE contact_directory_changed();
+
+CREATE TRIGGER contact_emails_delete AFTER DELETE ON emails
+   REFERENCING OLD TABLE AS old_rows
+   FOR EACH STATEMENT EXECUTE PROCEDURE contact_directory_changed();
+
+
+SELECT refresh_contacts(array_agg(party_id)) FROM parties;
+
+
+--the directory views keep their columns but read the maintained rows
+CREATE OR REPLACE VIEW phone_book AS
+SELECT cd.party_id, cd.name, cd.party_type, ph.type, ph.phone_no
+  FROM contact_directory AS cd
+ CROSS JOIN LATERAL unnest(cd.phone_types, cd.phone_nos) AS ph (type, phone_no)
+ ORDER BY cd.party_id, ph.type;
+
+
+CREATE OR REPLACE VIEW staff_phones AS
+SELECT cd.name, s.hire_date, s.is_active,
+       COALESCE(cd.phone_nos[array_position(cd.phone_types, 'mobile')], 'none') AS mobile
+  FROM staff_st AS s
+  JOIN contact_directory AS cd ON s.party_id = cd.party_id;
+
+
+CREATE OR REPLACE VIEW email_list AS
+SELECT cd.party_id, cd.name, em.type, em.email
+  FROM contact_directory AS cd
+ CROSS JOIN LATERAL unnest(cd.email_types, cd.emails) AS em (type, email);
+
+
+CREATE OR REPLACE VIEW staff_list AS
+SELECT s.party_id, cd.first_name, cd.last_name,
+       s.ssn, s.is_active, s.hire_date, s.street_no, s.street,
+       z.city, z.state, s.zip, ph.phone_no AS mobile
+  FROM staff_st AS s
+  JOIN contact_directory AS cd ON s.party_id = cd.party_id
+  JOIN zip_codes AS z ON s.zip = z.zip
+  LEFT JOIN LATERAL unnest(cd.phone_nos) AS ph (phone_no) ON true;
+
+
+       --Useage: SELECT * FROM phone_search('mad%');
+CREATE OR REPLACE FUNCTION phone_search(name_snippet VARCHAR)
+       RETURNS TABLE (name VARCHAR, phone_type text, phone_no VARCHAR) AS $$
+       BEGIN
+              RETURN QUERY
+                 SELECT cd.name::VARCHAR, ph.type, ph.phone_no
+                 FROM contact_directory AS cd
+                 CROSS JOIN LATERAL unnest(cd.phone_types, cd.phone_nos) AS ph (type, phone_no)
+                 WHERE cd.lower_name LIKE LOWER(name_snippet);
+       END;
+$$ LANGUAGE plpgsql;
@@ -0,0 +1,92 @@
+--reverse caller-ID: every phone gets its E.164 form (+16084428009) from
+--pg_libphonenumber, kept unique and indexed, so any formatting of a number
+--resolves to the party with one index probe
+
+--US numbers unless the raw text carries a +country code; NULL for anything
+--libphonenumber cannot parse (short local numbers like '555-1212')
+--usage: SELECT normalize_phone('(608) 442-8009');
+CREATE OR REPLACE FUNCTION normalize_phone(raw text, region text DEFAULT 'US')
+       RETURNS text AS
+    $$
+    BEGIN
+        RETURN parse_phone_number(raw, region)::text;
+    EXCEPTION WHEN OTHERS THEN
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+IMMUTABLE
+RETURNS NULL ON NULL INPUT;
+
+
+ALTER TABLE phones ADD COLUMN phone_e164 text;
+
+CREATE OR REPLACE FUNCTION set_phone_e164()
+       RETURNS trigger AS
+    $$
+    BEGIN
+        NEW.phone_e164 := normalize_phone(NEW.phone_no);
+        RETURN NEW;
+    END;
+    $$ LANGUAGE plpgsql;
+
+CREATE TRIGGER phones_e164 BEFORE INSERT OR UPDATE OF phone_no ON phones
+   FOR EACH ROW EXECUTE PROCEDURE set_phone_e164();
+
+--backfill without bumping modified on every phone
+ALTER TABLE phones DISABLE TRIGGER update_phones_modtime;
+UPDATE phones SET phone_e164 = normalize_phone(phone_no);
+ALTER TABLE phones ENABLE TRIGGER update_phones_modtime;
+
+--numbers on file twice would fail the index with one example; list them all
+DO $$
+DECLARE
+    dupes text;
+BEGIN
+    SELECT string_agg(format('%s: %s', g.phone_e164, g.held_by), E'\n')
+      INTO dupes
+      FROM (SELECT ph.phone_e164,
+                   string_agg(format('%s (party %s, type %s)', ph.phone_no,
+                                     ph.party_id, ph.phone_type), ', '
+                              ORDER BY ph.party_id, ph.phone_no) AS held_by
+              FROM phones AS ph
+             WHERE ph.phone_e164 IS NOT NULL
+             GROUP BY ph.phone_e164
+            HAVING count(*) > 1) AS g;
+    IF dupes IS NOT NULL THEN
+        RAISE EXCEPTION 'phone numbers stored more than once, fix these first:%', E'\n' || dupes;
+    END IF;
+END;
+$$;
+
+--two spellings of one number ('608-555-1111', '(608) 555 1111') now collide
+CREATE UNIQUE INDEX phones_phone_e164_idx ON phones (phone_e164)
+ WHERE phone_e164 IS NOT NULL;
+
+
+--usage: SELECT * FROM lookup_by_phone('608.442.8009');
+CREATE OR REPLACE FUNCTION lookup_by_phone(raw text)
+       RETURNS TABLE (party_id uuid, name text, party_type text, phone_type text,
+       phone_no VARCHAR, phone_e164 text, emails VARCHAR[], is_staff boolean) AS
+'SELECT cd.party_id, cd.name, cd.party_type, phone_type_name(ph.phone_type), ph.phone_no,
+        ph.phone_e164, cd.emails, cd.is_staff
+   FROM phones AS ph
+   JOIN contact_directory AS cd ON ph.party_id = cd.party_id
+  WHERE ph.phone_e164 = normalize_phone(raw);'
+LANGUAGE SQL
+STABLE;
+
+
+--one row per input in input order; party columns are NULL when the number
+--is unknown or unparsable
+--usage: SELECT * FROM lookup_by_phones(ARRAY['608-442-8009', '+1 608 555 1111']);
+CREATE OR REPLACE FUNCTION lookup_by_phones(raws text[])
+       RETURNS TABLE (raw text, party_id uuid, name text, party_type text, phone_type text,
+       phone_no VARCHAR, phone_e164 text, emails VARCHAR[], is_staff boolean) AS
+'SELECT r.raw, cd.party_id, cd.name, cd.party_type, phone_type_name(ph.phone_type),
+        ph.phone_no, ph.phone_e164, cd.emails, cd.is_staff
+   FROM unnest(raws) WITH ORDINALITY AS r (raw, n)
+   LEFT JOIN phones AS ph ON ph.phone_e164 = normalize_phone(r.raw)
+   LEFT JOIN contact_directory AS cd ON ph.party_id = cd.party_id
+  ORDER BY r.n;'
+LANGUAGE SQL
+STABLE;
@@ -0,0 +1,194 @@
+--ingredient_unit_cost: the current cost per gram of each ingredient from
+--its selected source, kept up to date by the cost_update trigger, so costing
+--is one primary-key lookup per ingredient instead of a name join against
+--every maker and seller in ingredient_costs
+
+--at most one preferred source per ingredient; without one the cheapest
+--per gram wins
+ALTER TABLE ingredient_costs ADD COLUMN is_preferred BOOLEAN NOT NULL DEFAULT false;
+
+CREATE UNIQUE INDEX ingredient_costs_one_preferred_idx ON ingredient_costs (ingredient_id)
+ WHERE is_preferred;
+
+CREATE TABLE ingredient_unit_cost (
+       ingredient_id uuid PRIMARY KEY REFERENCES ingredients (ingredient_id),
+       maker_id uuid NOT NULL,
+       mio text NOT NULL,
+       seller_id uuid NOT NULL,
+       sio text NOT NULL,
+       cost numeric(10,5) NOT NULL,
+       grams numeric NOT NULL,
+       cost_per_g numeric NOT NULL,
+       is_preferred BOOLEAN NOT NULL,
+       changed TIMESTAMPTZ DEFAULT now(),
+       FOREIGN KEY (maker_id, mio) REFERENCES parties (party_id, party_type),
+       FOREIGN KEY (seller_id, sio) REFERENCES parties (party_id, party_type)
+);
+
+
+--usage: SELECT refresh_unit_cost(ARRAY[iid('kamut%')]);
+CREATE OR REPLACE FUNCTION refresh_unit_cost(which_ingredients uuid[])
+       RETURNS void AS
+    $$
+    BEGIN
+        DELETE FROM ingredient_unit_cost AS uc
+         WHERE uc.ingredient_id = ANY(which_ingredients)
+           AND NOT EXISTS (SELECT 1 FROM ingredient_costs AS ic
+                            WHERE ic.ingredient_id = uc.ingredient_id);
+
+        INSERT INTO ingredient_unit_cost AS uc
+               (ingredient_id, maker_id, mio, seller_id, sio, cost, grams, cost_per_g,
+                is_preferred, changed)
+        SELECT DISTINCT ON (ic.ingredient_id)
+               ic.ingredient_id, ic.maker_id, ic.mio, ic.seller_id, ic.sio, ic.cost, ic.grams,
+               ROUND(ic.cost / ic.grams, 5), ic.is_preferred, now()
+          FROM ingredient_costs AS ic
+         WHERE ic.ingredient_id = ANY(which_ingredients)
+         ORDER BY ic.ingredient_id, ic.is_preferred DESC, ic.cost / ic.grams, ic.seller_id
+            ON CONFLICT (ingredient_id) DO UPDATE
+           SET maker_id = EXCLUDED.maker_id,
+               mio = EXCLUDED.mio,
+               seller_id = EXCLUDED.seller_id,
+               sio = EXCLUDED.sio,
+               cost = EXCLUDED.cost,
+               grams = EXCLUDED.grams,
+               cost_per_g = EXCLUDED.cost_per_g,
+               is_preferred = EXCLUDED.is_preferred,
+               changed = EXCLUDED.changed
+         WHERE (uc.maker_id, uc.seller_id, uc.cost, uc.grams, uc.is_preferred)
+               IS DISTINCT FROM
+               (EXCLUDED.maker_id, EXCLUDED.seller_id, EXCLUDED.cost, EXCLUDED.grams,
+                EXCLUDED.is_preferred);
+    END;
+    $$ LANGUAGE plpgsql;
+
+
+--still logs price changes; now also fires on new and dropped sources so
+--the unit cost follows every change to ingredient_costs
+CREATE OR REPLACE FUNCTION record_if_cost_changed()
+       RETURNS trigger AS
+    $$
+    BEGIN
+          IF TG_OP = 'UPDATE' AND (NEW.cost <> OLD.cost OR NEW.grams <> OLD.grams) THEN
+            INSERT INTO cost_change_log (
+            ingredient_id,
+            maker_id,
+            mio,
+            seller_id,
+            sio,
+            old_cost,
+            new_cost,
+            old_grams,
+            new_grams,
+            change_time)
+        VALUES (
+            OLD.ingredient_id,
+            OLD.maker_id,
+            OLD.mio,
+            OLD.seller_id,
+            OLD.sio,
+            OLD.cost,
+            NEW.cost,
+            OLD.grams,
+            NEW.grams,
+            now()
+        );
+        END IF;
+
+        IF TG_OP IN ('INSERT', 'UPDATE') THEN
+            PERFORM refresh_unit_cost(ARRAY[NEW.ingredient_id]);
+        END IF;
+        IF TG_OP = 'DELETE' OR (TG_OP = 'UPDATE' AND NEW.ingredient_id <> OLD.ingredient_id) THEN
+            PERFORM refresh_unit_cost(ARRAY[OLD.ingredient_id]);
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql;
+
+DROP TRIGGER cost_update ON ingredient_costs;
+
+CREATE TRIGGER cost_update
+       AFTER INSERT OR UPDATE OR DELETE
+          on ingredient_costs
+       FOR EACH ROW
+       EXECUTE PROCEDURE record_if_cost_changed();
+
+SELECT refresh_unit_cost(array_agg(DISTINCT ingredient_id)) FROM ingredient_costs;
+
+
+--ingredient_id appended so cost joins can go by id
+CREATE OR REPLACE VIEW product_info AS
+SELECT di.product_id, pr.product_name, di.bakers_percent, i.ingredient_name AS ingredient,
+       i.is_flour, di.percent_in_sour, di.percent_in_poolish, di.percent_in_soaker,
+       di.ingredient_id
+  FROM product_ingredients AS di
+  JOIN ingredients AS i ON di.ingredient_id = i.ingredient_id
+  JOIN products as pr on di.product_id = pr.product_id
+ ORDER BY di.product_id, i.is_flour DESC, di.bakers_percent DESC;
+
+
+--one row per product ingredient whatever the number of sources; an
+--ingredient with no cost on file keeps its row with a NULL cost
+CREATE OR REPLACE VIEW formula_base AS
+SELECT din.product_id, din.product_name, din.bakers_percent, din.ingredient,
+       din.is_flour, din.percent_in_sour, din.percent_in_poolish,
+       din.percent_in_soaker, din.total_bp, uc.cost_per_g
+  FROM (SELECT pi.*, sum(pi.bakers_percent) OVER
+               (PARTITION BY pi.product_id, pi.product_name) AS total_bp
+          FROM product_info AS pi) AS din
+  LEFT JOIN ingredient_unit_cost AS uc ON din.ingredient_id = uc.ingredient_id;
+
+
+--the source costing uses for each ingredient, and when it last changed
+CREATE OR REPLACE VIEW unit_cost_list AS
+SELECT i.ingredient_id, i.ingredient_name, p.party_name AS seller, ROUND(uc.cost, 2) AS cost,
+       uc.grams, uc.cost_per_g, uc.is_preferred, uc.changed
+  FROM ingredient_unit_cost AS uc
+  JOIN ingredients AS i ON uc.ingredient_id = i.ingredient_id
+  JOIN parties AS p ON uc.seller_id = p.party_id AND uc.sio = p.party_type;
+
+
+--ingredient demand across every product baked in a range of dates, split
+--into preferment stages, with the selected seller's package size and the
+--packages and spend needed to cover it
+--usage: SELECT * FROM ingredient_demand(now()::date, now()::date + 6);
+--spend per seller:
+         --SELECT seller, sum(spend) FROM ingredient_demand(now()::date, now()::date + 6)
+         --GROUP BY seller;
+CREATE OR REPLACE FUNCTION ingredient_demand(start_date DATE, end_date DATE)
+       RETURNS TABLE (ingredient_id uuid, ingredient character varying, is_flour boolean,
+       overall numeric, sour numeric, poolish numeric, soaker numeric, final numeric,
+       seller character varying, package_grams numeric, package_cost numeric,
+       packages numeric, spend numeric) AS
+'WITH bw (product_id, batch_weight) AS
+     (SELECT r.product_id, sum(r.amt * r.grams)
+        FROM production_plan_rows(start_date, end_date) AS r
+       GROUP BY r.product_id),
+
+recipe AS
+     (SELECT di.*, sum(di.bakers_percent) OVER (PARTITION BY di.product_id) AS total_bp
+        FROM product_ingredients AS di
+       WHERE di.product_id IN (SELECT product_id FROM bw)),
+
+need (ingredient_id, overall, sour, poolish, soaker, final) AS
+     (SELECT rc.ingredient_id, sum(s.g), sum(s.g * rc.percent_in_sour /100),
+             sum(s.g * rc.percent_in_poolish /100),
+             sum(s.g * rc.percent_in_soaker /100),
+             sum(s.g * (1- (rc.percent_in_sour + rc.percent_in_poolish +
+                 rc.percent_in_soaker)/100))
+        FROM bw
+        JOIN recipe AS rc ON bw.product_id = rc.product_id
+       CROSS JOIN LATERAL (SELECT bw.batch_weight * rc.bakers_percent / rc.total_bp) AS s (g)
+       GROUP BY rc.ingredient_id)
+
+SELECT n.ingredient_id, i.ingredient_name, i.is_flour, ROUND(n.overall, 0),
+       ROUND(n.sour, 0), ROUND(n.poolish, 1), ROUND(n.soaker, 0), ROUND(n.final, 0),
+       p.party_name, uc.grams, uc.cost, CEIL(n.overall / uc.grams),
+       CEIL(n.overall / uc.grams) * uc.cost
+  FROM need AS n
+  JOIN ingredients AS i ON n.ingredient_id = i.ingredient_id
+  LEFT JOIN ingredient_unit_cost AS uc ON n.ingredient_id = uc.ingredient_id
+  LEFT JOIN parties AS p ON uc.seller_id = p.party_id AND uc.sio = p.party_type
+ ORDER BY p.party_name, i.is_flour DESC, i.ingredient_name;'
+LANGUAGE SQL
+STABLE;
@@ -0,0 +1,98 @@
+--catalog costing: cost per gram of dough and per shaped piece for every
+--product and dough_mods variant in one set-based pass, independent of
+--today's orders, plus what-if pricing against hypothetical unit costs
+
+--every recipe variant: the base recipe (mod_name NULL) and each mod laid
+--over its product, a mod row replacing the base row for the same ingredient
+CREATE OR REPLACE VIEW variant_ingredients AS
+SELECT di.product_id, NULL::VARCHAR AS mod_name, di.ingredient_id, di.bakers_percent,
+       di.percent_in_sour, di.percent_in_poolish, di.percent_in_soaker
+  FROM product_ingredients AS di
+ UNION ALL
+SELECT dm.product_id, dm.mod_name, dm.ingredient_id, dm.bakers_percent,
+       dm.percent_in_sour, dm.percent_in_poolish, dm.percent_in_soaker
+  FROM dough_mods AS dm
+ UNION ALL
+SELECT m.product_id, m.mod_name, di.ingredient_id, di.bakers_percent,
+       di.percent_in_sour, di.percent_in_poolish, di.percent_in_soaker
+  FROM (SELECT DISTINCT product_id, mod_name FROM dough_mods) AS m
+  JOIN product_ingredients AS di ON m.product_id = di.product_id
+ WHERE NOT EXISTS (SELECT 1 FROM dough_mods AS x
+                    WHERE x.product_id = m.product_id AND x.mod_name = m.mod_name
+                      AND x.ingredient_id = di.ingredient_id);
+
+
+--cost_per_g is the baker's-percent weighted unit cost of the dough;
+--missing_costs counts ingredients with no source on file (left out of the cost)
+--usage: SELECT * FROM product_costs WHERE product_name LIKE 'rug%';
+CREATE OR REPLACE VIEW product_costs AS
+SELECT vi.product_id, pr.product_name, vi.mod_name, sum(vi.bakers_percent) AS total_bp,
+       ROUND(sum(vi.bakers_percent * uc.cost_per_g) / sum(vi.bakers_percent), 5) AS cost_per_g,
+       count(*) FILTER (WHERE uc.ingredient_id IS NULL) AS missing_costs
+  FROM variant_ingredients AS vi
+  JOIN products AS pr ON vi.product_id = pr.product_id
+  LEFT JOIN ingredient_unit_cost AS uc ON vi.ingredient_id = uc.ingredient_id
+ GROUP BY vi.product_id, pr.product_name, vi.mod_name;
+
+
+--usage: SELECT * FROM shape_costs ORDER BY piece_cost DESC;
+CREATE OR REPLACE VIEW shape_costs AS
+SELECT pc.product_id, pc.product_name, pc.mod_name, s.shape_name, ps.grams,
+       pc.cost_per_g, ROUND(pc.cost_per_g * ps.grams, 4) AS piece_cost, pc.missing_costs
+  FROM product_costs AS pc
+  JOIN product_shapes AS ps ON pc.product_id = ps.product_id
+  JOIN shapes AS s ON ps.shape_id = s.shape_id;
+
+
+--what-if pricing: overrides is a JSON array of
+--  {"scenario": "...", "ingredient_id": "...", and one of
+--   "cost" + "grams" (a package price), "cost_per_g", or "factor" (x current)}
+--Nothing is written. Each scenario returns every product variant and shape
+--using an overridden ingredient, with old and new piece cost; there are no
+--sale prices in the schema, so the cost delta is the margin impact per piece.
+--usage: SELECT * FROM cost_scenarios('[{"scenario": "flour +10%",
+--              "ingredient_id": "...", "factor": 1.1}]');
+CREATE OR REPLACE FUNCTION cost_scenarios(overrides jsonb)
+       RETURNS TABLE (scenario text, product_id uuid, product_name VARCHAR, mod_name VARCHAR,
+       shape_name VARCHAR, grams integer, cost_per_g numeric, new_cost_per_g numeric,
+       piece_cost numeric, new_piece_cost numeric, delta numeric, delta_pct numeric) AS
+'WITH o AS
+     (SELECT * FROM jsonb_to_recordset(overrides)
+          AS o (scenario text, ingredient_id uuid, cost numeric, grams numeric,
+                cost_per_g numeric, factor numeric)),
+
+ov (scenario, ingredient_id, cost_per_g) AS
+     (SELECT o.scenario, o.ingredient_id,
+             COALESCE(o.cost_per_g, o.cost / NULLIF(o.grams, 0), uc.cost_per_g * o.factor)
+        FROM o
+        LEFT JOIN ingredient_unit_cost AS uc ON o.ingredient_id = uc.ingredient_id),
+
+hit (scenario, product_id, mod_key) AS
+     (SELECT DISTINCT ov.scenario, vi.product_id, COALESCE(vi.mod_name, '''')
+        FROM ov
+        JOIN variant_ingredients AS vi ON ov.ingredient_id = vi.ingredient_id),
+
+costed (scenario, product_id, mod_key, old_cpg, new_cpg) AS
+     (SELECT h.scenario, h.product_id, h.mod_key,
+             sum(vi.bakers_percent * uc.cost_per_g) / sum(vi.bakers_percent),
+             sum(vi.bakers_percent * COALESCE(ov.cost_per_g, uc.cost_per_g))
+                 / sum(vi.bakers_percent)
+        FROM hit AS h
+        JOIN variant_ingredients AS vi ON h.product_id = vi.product_id
+             AND h.mod_key = COALESCE(vi.mod_name, '''')
+        LEFT JOIN ingredient_unit_cost AS uc ON vi.ingredient_id = uc.ingredient_id
+        LEFT JOIN ov ON h.scenario = ov.scenario AND vi.ingredient_id = ov.ingredient_id
+       GROUP BY h.scenario, h.product_id, h.mod_key)
+
+SELECT c.scenario, c.product_id, pr.product_name, NULLIF(c.mod_key, '''')::VARCHAR,
+       s.shape_name, ps.grams, ROUND(c.old_cpg, 5), ROUND(c.new_cpg, 5),
+       ROUND(c.old_cpg * ps.grams, 4), ROUND(c.new_cpg * ps.grams, 4),
+       ROUND((c.new_cpg - c.old_cpg) * ps.grams, 4),
+       ROUND(100 * (c.new_cpg - c.old_cpg) / NULLIF(c.old_cpg, 0), 2)
+  FROM costed AS c
+  JOIN products AS pr ON c.product_id = pr.product_id
+  JOIN product_shapes AS ps ON c.product_id = ps.product_id
+  JOIN shapes AS s ON ps.shape_id = s.shape_id
+ ORDER BY c.scenario, pr.product_name, c.mod_key, s.shape_name;'
+LANGUAGE SQL
+STABLE;
@@ -0,0 +1,262 @@
+--point-in-time reads of recipes, ingredient costs and standing orders.
+--
+--A reconstruction starts from the first snapshot taken at or after the
+--requested time (or from the live tables when there is none) and undoes
+--only the logged changes between the two, so its cost depends on the
+--changes since the nearest checkpoint, not on the length of the logs.
+--Each walk step is a lookup on a log primary key, which already leads with
+--the row key and ends with the change time.
+--
+--What the logs can tell: product_ingredients changes of ingredient or
+--baker's percent, standing_orders changes of amount or day, and
+--ingredient_costs changes of cost or grams. Rows created after the
+--requested time are left out by their created column. A row deleted since
+--then only comes back if a snapshot taken before the delete covers it.
+
+CREATE TABLE history_snapshots (
+       snapshot_id SERIAL PRIMARY KEY,
+       taken TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+CREATE INDEX history_snapshots_taken_idx ON history_snapshots (taken);
+
+CREATE TABLE product_ingredients_snapshot (
+       snapshot_id INTEGER NOT NULL REFERENCES history_snapshots ON DELETE CASCADE,
+       product_id uuid NOT NULL,
+       ingredient_id uuid NOT NULL,
+       bakers_percent NUMERIC (5, 2) NOT NULL,
+       percent_in_sour NUMERIC NOT NULL,
+       percent_in_poolish NUMERIC (5, 2) NOT NULL,
+       percent_in_soaker NUMERIC NOT NULL,
+       created TIMESTAMPTZ,
+       PRIMARY KEY (snapshot_id, product_id, ingredient_id)
+);
+
+CREATE TABLE standing_orders_snapshot (
+       snapshot_id INTEGER NOT NULL REFERENCES history_snapshots ON DELETE CASCADE,
+       day_of_week SMALLINT NOT NULL,
+       customer_id uuid NOT NULL,
+       io text NOT NULL,
+       product_id uuid NOT NULL,
+       shape_id uuid NOT NULL,
+       amt INTEGER NOT NULL,
+       created TIMESTAMPTZ,
+       PRIMARY KEY (snapshot_id, day_of_week, customer_id, product_id, shape_id)
+);
+
+CREATE TABLE ingredient_costs_snapshot (
+       snapshot_id INTEGER NOT NULL REFERENCES history_snapshots ON DELETE CASCADE,
+       ingredient_id uuid NOT NULL,
+       maker_id uuid NOT NULL,
+       mio text NOT NULL,
+       seller_id uuid NOT NULL,
+       sio text NOT NULL,
+       cost numeric(10,5) NOT NULL,
+       grams numeric NOT NULL,
+       is_preferred BOOLEAN NOT NULL,
+       created TIMESTAMPTZ,
+       PRIMARY KEY (snapshot_id, ingredient_id, maker_id, seller_id)
+);
+
+
+--run nightly (cron, pg_cron) to bound how far back a reconstruction walks;
+--keep_days drops older checkpoints
+--usage: SELECT take_history_snapshot();
+CREATE OR REPLACE FUNCTION take_history_snapshot(keep_days INTEGER DEFAULT 400)
+       RETURNS INTEGER AS
+    $$
+    DECLARE
+        new_id INTEGER;
+    BEGIN
+        INSERT INTO history_snapshots DEFAULT VALUES RETURNING snapshot_id INTO new_id;
+
+        INSERT INTO product_ingredients_snapshot
+        SELECT new_id, product_id, ingredient_id, bakers_percent, percent_in_sour,
+               percent_in_poolish, percent_in_soaker, created
+          FROM product_ingredients;
+
+        INSERT INTO standing_orders_snapshot
+        SELECT new_id, day_of_week, customer_id, io, product_id, shape_id, amt, created
+          FROM standing_orders;
+
+        INSERT INTO ingredient_costs_snapshot
+        SELECT new_id, ingredient_id, maker_id, mio, seller_id, sio, cost, grams,
+               is_preferred, created
+          FROM ingredient_costs;
+
+        DELETE FROM history_snapshots
+         WHERE taken < now() - make_interval(days => keep_days);
+        RETURN new_id;
+    END;
+    $$ LANGUAGE plpgsql;
+
+
+--usage: SELECT * FROM product_ingredients_as_of(now() - interval '30 days');
+CREATE OR REPLACE FUNCTION product_ingredients_as_of(as_of TIMESTAMPTZ,
+       which_products uuid[] DEFAULT NULL)
+       RETURNS TABLE (product_id uuid, ingredient_id uuid, bakers_percent numeric,
+       percent_in_sour numeric, percent_in_poolish numeric, percent_in_soaker numeric) AS
+'WITH RECURSIVE s AS
+     (SELECT hs.snapshot_id, hs.taken FROM history_snapshots AS hs
+       WHERE hs.taken >= as_of ORDER BY hs.taken LIMIT 1),
+
+base AS
+     (SELECT ps.product_id, ps.ingredient_id, ps.bakers_percent, ps.percent_in_sour,
+             ps.percent_in_poolish, ps.percent_in_soaker, ps.created, s.taken AS at_time
+        FROM s
+        JOIN product_ingredients_snapshot AS ps ON s.snapshot_id = ps.snapshot_id
+       WHERE which_products IS NULL OR ps.product_id = ANY(which_products)
+       UNION ALL
+      SELECT di.product_id, di.ingredient_id, di.bakers_percent, di.percent_in_sour,
+             di.percent_in_poolish, di.percent_in_soaker, di.created,
+             ''infinity''::TIMESTAMPTZ
+        FROM product_ingredients AS di
+       WHERE NOT EXISTS (SELECT 1 FROM s)
+         AND (which_products IS NULL OR di.product_id = ANY(which_products))),
+
+--step back through each row''s changes, newest first; chain_* names the row
+--the walk started from
+walk (chain_product, chain_ingredient, product_id, ingredient_id, bakers_percent,
+      percent_in_sour, percent_in_poolish, percent_in_soaker, created, at_time) AS
+     (SELECT b.product_id, b.ingredient_id, b.product_id, b.ingredient_id,
+             b.bakers_percent::numeric, b.percent_in_sour, b.percent_in_poolish::numeric,
+             b.percent_in_soaker, b.created, b.at_time
+        FROM base AS b
+       UNION ALL
+      SELECT w.chain_product, w.chain_ingredient, c.product_id, c.old_ingredient_id,
+             c.old_bakers_percent::numeric, c.percent_in_sour, c.percent_in_poolish::numeric,
+             c.percent_in_soaker, w.created, c.created
+        FROM walk AS w
+       CROSS JOIN LATERAL
+             (SELECT * FROM product_ingredients_changes AS pic
+               WHERE pic.product_id = w.product_id AND pic.new_ingredient_id = w.ingredient_id
+                 AND pic.created > as_of AND pic.created < w.at_time
+               ORDER BY pic.created DESC LIMIT 1) AS c)
+
+SELECT DISTINCT ON (w.chain_product, w.chain_ingredient)
+       w.product_id, w.ingredient_id, w.bakers_percent, w.percent_in_sour,
+       w.percent_in_poolish, w.percent_in_soaker
+  FROM walk AS w
+ WHERE w.created IS NULL OR w.created <= as_of
+ ORDER BY w.chain_product, w.chain_ingredient, w.at_time;'
+LANGUAGE SQL
+STABLE;
+
+
+--usage: SELECT * FROM ingredient_costs_as_of(now() - interval '1 year');
+CREATE OR REPLACE FUNCTION ingredient_costs_as_of(as_of TIMESTAMPTZ,
+       which_ingredients uuid[] DEFAULT NULL)
+       RETURNS TABLE (ingredient_id uuid, maker_id uuid, seller_id uuid, cost numeric,
+       grams numeric, is_preferred boolean) AS
+'WITH s AS
+     (SELECT hs.snapshot_id, hs.taken FROM history_snapshots AS hs
+       WHERE hs.taken >= as_of ORDER BY hs.taken LIMIT 1),
+
+base AS
+     (SELECT cs.ingredient_id, cs.maker_id, cs.seller_id, cs.cost, cs.grams,
+             cs.is_preferred, cs.created, s.taken AS at_time
+        FROM s
+        JOIN ingredient_costs_snapshot AS cs ON s.snapshot_id = cs.snapshot_id
+       WHERE which_ingredients IS NULL OR cs.ingredient_id = ANY(which_ingredients)
+       UNION ALL
+      SELECT ic.ingredient_id, ic.maker_id, ic.seller_id, ic.cost, ic.grams,
+             ic.is_preferred, ic.created, ''infinity''::TIMESTAMPTZ
+        FROM ingredient_costs AS ic
+       WHERE NOT EXISTS (SELECT 1 FROM s)
+         AND (which_ingredients IS NULL OR ic.ingredient_id = ANY(which_ingredients)))
+
+SELECT b.ingredient_id, b.maker_id, b.seller_id, COALESCE(c.old_cost, b.cost),
+       COALESCE(c.old_grams, b.grams), b.is_preferred
+  FROM base AS b
+  LEFT JOIN LATERAL
+       (SELECT cc.old_cost, cc.old_grams FROM cost_change_log AS cc
+         WHERE cc.ingredient_id = b.ingredient_id AND cc.maker_id = b.maker_id
+           AND cc.seller_id = b.seller_id
+           AND cc.change_time > as_of AND cc.change_time < b.at_time
+         ORDER BY cc.change_time LIMIT 1) AS c ON true
+ WHERE b.created IS NULL OR b.created <= as_of;'
+LANGUAGE SQL
+STABLE;
+
+
+--usage: SELECT * FROM standing_orders_as_of('2020-06-01');
+CREATE OR REPLACE FUNCTION standing_orders_as_of(as_of TIMESTAMPTZ)
+       RETURNS TABLE (day_of_week SMALLINT, customer_id uuid, io text, product_id uuid,
+       shape_id uuid, amt INTEGER) AS
+'WITH RECURSIVE s AS
+     (SELECT hs.snapshot_id, hs.taken FROM history_snapshots AS hs
+       WHERE hs.taken >= as_of ORDER BY hs.taken LIMIT 1),
+
+base AS
+     (SELECT ss.day_of_week, ss.customer_id, ss.io, ss.product_id, ss.shape_id, ss.amt,
+             ss.created, s.taken AS at_time
+        FROM s
+        JOIN standing_orders_snapshot AS ss ON s.snapshot_id = ss.snapshot_id
+       UNION ALL
+      SELECT so.day_of_week, so.customer_id, so.io, so.product_id, so.shape_id, so.amt,
+             so.created, ''infinity''::TIMESTAMPTZ
+        FROM standing_orders AS so
+       WHERE NOT EXISTS (SELECT 1 FROM s)),
+
+walk (chain_dow, customer_id, io, product_id, shape_id, day_of_week, amt, created, at_time) AS
+     (SELECT b.day_of_week, b.customer_id, b.io, b.product_id, b.shape_id, b.day_of_week,
+             b.amt, b.created, b.at_time
+        FROM base AS b
+       UNION ALL
+      SELECT w.chain_dow, w.customer_id, w.io, w.product_id, w.shape_id, c.old_day_of_week,
+             c.old_amt, w.created, c.change_time
+        FROM walk AS w
+       CROSS JOIN LATERAL
+             (SELECT * FROM standing_change_log AS sc
+               WHERE sc.new_day_of_week = w.day_of_week AND sc.customer_id = w.customer_id
+                 AND sc.product_id = w.product_id AND sc.shape_id = w.shape_id
+                 AND sc.change_time > as_of AND sc.change_time < w.at_time
+               ORDER BY sc.change_time DESC LIMIT 1) AS c)
+
+SELECT DISTINCT ON (w.chain_dow, w.customer_id, w.product_id, w.shape_id)
+       w.day_of_week, w.customer_id, w.io, w.product_id, w.shape_id, w.amt
+  FROM walk AS w
+ WHERE w.created IS NULL OR w.created <= as_of
+ ORDER BY w.chain_dow, w.customer_id, w.product_id, w.shape_id, w.at_time;'
+LANGUAGE SQL
+STABLE;
+
+
+--the formula as it stood at a moment, scaled to batch_weight grams of dough
+--and costed at that moment's prices (preferred source, else cheapest)
+--usage: SELECT * FROM formula_as_of('kamut%', now() - interval '1 month');
+--       SELECT sum(cost) FROM formula_as_of('rug%', '2020-06-01', 10000);
+CREATE OR REPLACE FUNCTION formula_as_of(my_product VARCHAR, as_of TIMESTAMPTZ,
+       batch_weight numeric DEFAULT 1000)
+       RETURNS TABLE (product character varying, "%" numeric, ingredient character varying,
+       overall numeric, sour numeric, poolish numeric, soaker numeric, final numeric,
+       cost numeric) AS
+'WITH prs AS
+     (SELECT pr.product_id, pr.product_name FROM products AS pr
+       WHERE LOWER(pr.product_name) LIKE LOWER(my_product)),
+
+recipe AS
+     (SELECT r.*, sum(r.bakers_percent) OVER (PARTITION BY r.product_id) AS total_bp
+        FROM product_ingredients_as_of(as_of, ARRAY(SELECT product_id FROM prs)) AS r),
+
+unit AS
+     (SELECT DISTINCT ON (c.ingredient_id) c.ingredient_id, c.cost / c.grams AS cost_per_g
+        FROM ingredient_costs_as_of(as_of, ARRAY(SELECT DISTINCT ingredient_id FROM recipe)) AS c
+       ORDER BY c.ingredient_id, c.is_preferred DESC, c.cost / c.grams, c.seller_id)
+
+SELECT prs.product_name, r.bakers_percent, i.ingredient_name,
+       ROUND(s.g, 0),
+       ROUND(s.g * r.percent_in_sour /100, 0),
+       ROUND(s.g * r.percent_in_poolish /100, 1),
+       ROUND(s.g * r.percent_in_soaker /100, 0),
+       ROUND(s.g * (1- (r.percent_in_sour +
+             r.percent_in_poolish + r.percent_in_soaker)/100), 0),
+       ROUND(s.g, 0) * ROUND(u.cost_per_g, 5)
+  FROM recipe AS r
+  JOIN prs ON r.product_id = prs.product_id
+  JOIN ingredients AS i ON r.ingredient_id = i.ingredient_id
+  LEFT JOIN unit AS u ON r.ingredient_id = u.ingredient_id
+ CROSS JOIN LATERAL (SELECT batch_weight * r.bakers_percent / r.total_bp) AS s (g)
+ ORDER BY r.product_id, i.is_flour DESC, r.bakers_percent DESC;'
+LANGUAGE SQL
+STABLE;
@@ -0,0 +1,163 @@
+--the three change logs become tables range-partitioned by month on their
+--time column. Each month gets its own small primary key index, and a BRIN
+--index on the time column serves range scans. A default partition catches
+--any row with no month partition yet, so a trigger insert never fails.
+--create_log_partitions() runs monthly (archive_logs.py calls it) to stay
+--ahead; archive_logs.py also detaches, exports and drops old months.
+
+DROP VIEW standing_change_history;
+DROP VIEW cost_change_list;
+
+ALTER TABLE cost_change_log RENAME TO cost_change_log_old;
+ALTER INDEX cost_change_log_pkey RENAME TO cost_change_log_old_pkey;
+ALTER TABLE standing_change_log RENAME TO standing_change_log_old;
+ALTER INDEX standing_change_log_pkey RENAME TO standing_change_log_old_pkey;
+ALTER TABLE product_ingredients_changes RENAME TO product_ingredients_changes_old;
+ALTER INDEX product_ingredients_changes_pkey RENAME TO product_ingredients_changes_old_pkey;
+
+
+CREATE TABLE cost_change_log (
+       ingredient_id uuid NOT NULL REFERENCES ingredients (ingredient_id),
+       maker_id uuid NOT NULL,
+       mio text NOT NULL check (mio in ('i', 'o')),
+       seller_id uuid NOT NULL,
+       sio text NOT NULL check (sio in ('i', 'o')),
+       old_cost numeric(10,5) NOT NULL,
+       new_cost numeric(10,5) NOT NULL,
+       old_grams numeric NOT NULL,
+       new_grams numeric NOT NULL,
+       change_time TIMESTAMPTZ NOT NULL DEFAULT now(),
+       PRIMARY KEY (ingredient_id, maker_id, seller_id, change_time),
+       FOREIGN KEY (maker_id, mio) REFERENCES parties (party_id, party_type),
+       FOREIGN KEY (seller_id, sio) REFERENCES parties (party_id, party_type)
+) PARTITION BY RANGE (change_time);
+
+CREATE TABLE standing_change_log (
+       old_day_of_week SMALLINT NOT NULL REFERENCES days_of_week(dow_id),
+       new_day_of_week SMALLINT NOT NULL REFERENCES days_of_week(dow_id),
+       customer_id uuid NOT NULL,
+       io text NOT NULL,
+       product_id uuid NOT NULL REFERENCES products(product_id),
+       shape_id uuid NOT NULL REFERENCES shapes(shape_id),
+       old_amt INTEGER NOT NULL,
+       new_amt INTEGER NOT NULL,
+       change_time TIMESTAMPTZ NOT NULL DEFAULT now(),
+       PRIMARY KEY (new_day_of_week, customer_id, product_id, shape_id, change_time),
+       FOREIGN KEY (customer_id, io)
+                    references parties (party_id, party_type),
+       CONSTRAINT dow_in_0_thru_6 check (new_day_of_week IN (0, 1, 2, 3, 4, 5, 6)),
+       CONSTRAINT io_i_or_o CHECK (io in ('i', 'o'))
+) PARTITION BY RANGE (change_time);
+
+CREATE TABLE product_ingredients_changes (
+       product_id uuid NOT NULL REFERENCES products(product_id),
+       old_ingredient_id uuid NOT NULL REFERENCES ingredients(ingredient_id),
+       new_ingredient_id uuid NOT NULL REFERENCES ingredients(ingredient_id),
+       old_bakers_percent NUMERIC (5, 2) NOT NULL,
+       new_bakers_percent NUMERIC (5, 2) NOT NULL,
+       percent_in_sour NUMERIC NOT NULL,
+       percent_in_poolish NUMERIC (5, 2) NOT NULL,
+       percent_in_soaker NUMERIC NOT NULL,
+       created TIMESTAMPTZ DEFAULT now() NOT NULL,
+       modified TIMESTAMPTZ DEFAULT now(),
+       PRIMARY KEY (product_id, new_ingredient_id, created),
+       CONSTRAINT bp_positive CHECK (new_bakers_percent > 0),
+       CONSTRAINT percent_in_sour_positive CHECK (percent_in_sour >= 0),
+       CONSTRAINT percent_in_sour_max_100 CHECK (percent_in_sour <= 100),
+       CONSTRAINT percent_in_poolish_positive CHECK (percent_in_poolish >= 0),
+       CONSTRAINT percent_in_poolish_max_100 CHECK (percent_in_poolish <= 100),
+       CONSTRAINT percent_in_soaker_positive CHECK (percent_in_soaker >= 0),
+       CONSTRAINT percent_in_soaker_max_100 CHECK (percent_in_soaker <= 100)
+) PARTITION BY RANGE (created);
+
+CREATE INDEX cost_change_log_change_time_brin ON cost_change_log
+ USING BRIN (change_time);
+CREATE INDEX standing_change_log_change_time_brin ON standing_change_log
+ USING BRIN (change_time);
+CREATE INDEX product_ingredients_changes_created_brin ON product_ingredients_changes
+ USING BRIN (created);
+
+CREATE TABLE cost_change_log_default PARTITION OF cost_change_log DEFAULT;
+CREATE TABLE standing_change_log_default PARTITION OF standing_change_log DEFAULT;
+CREATE TABLE product_ingredients_changes_default PARTITION OF product_ingredients_changes DEFAULT;
+
+
+--month partitions are named <log>_yYYYYmMM, which archive_logs.py relies on;
+--rows that already landed in the default partition for a new month are
+--moved into it
+--usage: SELECT create_log_partitions();          --this month and the next 3
+--       SELECT create_log_partitions(12, '2019-01-01');
+CREATE OR REPLACE FUNCTION create_log_partitions(months_ahead INTEGER DEFAULT 3,
+       since DATE DEFAULT now()::date)
+       RETURNS INTEGER AS
+    $$
+    DECLARE
+        log_name text;
+        time_col text;
+        month_start DATE;
+        month_end DATE;
+        part text;
+        made INTEGER := 0;
+    BEGIN
+        FOREACH log_name IN ARRAY ARRAY['cost_change_log', 'standing_change_log',
+                                        'product_ingredients_changes'] LOOP
+            time_col := CASE log_name WHEN 'product_ingredients_changes' THEN 'created'
+                                      ELSE 'change_time' END;
+            month_start := date_trunc('month', since)::date;
+            WHILE month_start <= date_trunc('month', now()::date + make_interval(months => months_ahead)) LOOP
+                month_end := (month_start + interval '1 month')::date;
+                part := format('%s_y%sm%s', log_name, to_char(month_start, 'YYYY'),
+                               to_char(month_start, 'MM'));
+                IF to_regclass(part) IS NULL THEN
+                    EXECUTE format('CREATE TEMP TABLE log_strays (LIKE %I) ON COMMIT DROP', log_name);
+                    EXECUTE format('WITH moved AS (DELETE FROM %I WHERE %I >= %L AND %I < %L RETURNING *) '
+                                   'INSERT INTO log_strays SELECT * FROM moved',
+                                   log_name || '_default', time_col, month_start::timestamptz,
+                                   time_col, month_end::timestamptz);
+                    EXECUTE format('CREATE TABLE %I PARTITION OF %I FOR VALUES FROM (%L) TO (%L)',
+                                   part, log_name, month_start::timestamptz,
+                                   month_end::timestamptz);
+                    EXECUTE format('INSERT INTO %I SELECT * FROM log_strays', log_name);
+                    DROP TABLE log_strays;
+                    made := made + 1;
+                END IF;
+                month_start := month_end;
+            END LOOP;
+        END LOOP;
+        RETURN made;
+    END;
+    $$ LANGUAGE plpgsql;
+
+
+SELECT create_log_partitions(3, LEAST((SELECT min(change_time) FROM cost_change_log_old),
+                                      (SELECT min(change_time) FROM standing_change_log_old),
+                                      (SELECT min(created) FROM product_ingredients_changes_old),
+                                      now())::date);
+
+INSERT INTO cost_change_log SELECT * FROM cost_change_log_old;
+INSERT INTO standing_change_log SELECT * FROM standing_change_log_old;
+INSERT INTO product_ingredients_changes SELECT * FROM product_ingredients_changes_old;
+
+DROP TABLE cost_change_log_old;
+DROP TABLE standing_change_log_old;
+DROP TABLE product_ingredients_changes_old;
+
+
+CREATE OR REPLACE VIEW standing_change_history AS
+SELECT p.party_name, pr.product_name, s.shape_name, dw.dow_names AS day_of_week,
+       sc.old_amt, sc.new_amt, sc.change_time
+  FROM standing_change_log as sc
+  JOIN parties as p on sc.customer_id = p.party_id AND sc.io = p.party_type
+  JOIN products as pr ON sc.product_id = pr.product_id
+  JOIN shapes AS s on sc.shape_id = s.shape_id
+  JOIN days_of_week AS dw on sc.old_day_of_week = dw.dow_id;
+
+
+CREATE OR REPLACE VIEW cost_change_list AS
+SELECT p.party_name as maker, i.ingredient_name as item, ROUND(cc.old_cost, 2) AS old_cost,
+       ROUND(cc.new_cost, 2) AS new_cost, ROUND(cc.old_cost / cc.old_grams, 5) AS old_cost_per_g,
+       ROUND(cc.new_cost / cc.new_grams, 5) as new_cost_per_g, cc.new_grams, cc.change_time
+  FROM cost_change_log as cc
+  JOIN ingredients as i on cc.ingredient_id = i.ingredient_id
+  JOIN parties as p on cc.maker_id = p.party_id
+ WHERE maker_id = p.party_id;
@@ -0,0 +1,210 @@
+--audit logging for ingredient_costs, product_ingredients and standing_orders
+--moves to statement-level triggers over transition tables: a bulk UPDATE
+--writes all of its log rows with one INSERT ... SELECT, pairing each old
+--row with its new row on the primary key.
+--
+--An update that changes a row's key can't be paired that way, so those
+--rows still go through the old row-level functions, behind a WHEN on the
+--key so untouched keys never call into plpgsql. The log rows are the same
+--as before either way.
+--Edge case: a single UPDATE that swaps the keys of two rows (A -> B and
+--B -> A) pairs the wrong rows and is logged twice; swap in two statements.
+--
+--The modified-column triggers have to stay BEFORE ROW, since only a row
+--trigger can change the row being written; they now skip rows an UPDATE
+--leaves unchanged.
+
+--key changes only; cost changes on an unchanged key are logged by log_cost_changes
+CREATE OR REPLACE FUNCTION record_if_cost_changed()
+       RETURNS trigger AS
+    $$
+    BEGIN
+          IF NEW.cost <> OLD.cost OR NEW.grams <> OLD.grams THEN
+            INSERT INTO cost_change_log (
+            ingredient_id,
+            maker_id,
+            mio,
+            seller_id,
+            sio,
+            old_cost,
+            new_cost,
+            old_grams,
+            new_grams,
+            change_time)
+        VALUES (
+            OLD.ingredient_id,
+            OLD.maker_id,
+            OLD.mio,
+            OLD.seller_id,
+            OLD.sio,
+            OLD.cost,
+            NEW.cost,
+            OLD.grams,
+            NEW.grams,
+            now()
+        );
+        END IF;
+        RETURN NEW;
+    END;
+    $$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION log_cost_changes()
+       RETURNS trigger AS
+    $$
+    DECLARE
+        changed uuid[] := '{}';
+    BEGIN
+        IF TG_OP = 'UPDATE' THEN
+            INSERT INTO cost_change_log (ingredient_id, maker_id, mio, seller_id, sio,
+                        old_cost, new_cost, old_grams, new_grams, change_time)
+            SELECT o.ingredient_id, o.maker_id, o.mio, o.seller_id, o.sio,
+                   o.cost, n.cost, o.grams, n.grams, now()
+              FROM old_rows AS o
+              JOIN new_rows AS n ON o.ingredient_id = n.ingredient_id
+                   AND o.maker_id = n.maker_id AND o.seller_id = n.seller_id
+             WHERE n.cost <> o.cost OR n.grams <> o.grams;
+        END IF;
+
+        IF TG_OP IN ('INSERT', 'UPDATE') THEN
+            SELECT changed || array_agg(DISTINCT ingredient_id) INTO changed FROM new_rows;
+        END IF;
+        IF TG_OP IN ('UPDATE', 'DELETE') THEN
+            SELECT changed || array_agg(DISTINCT ingredient_id) INTO changed FROM old_rows;
+        END IF;
+        IF cardinality(changed) > 0 THEN
+            PERFORM refresh_unit_cost(changed);
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql;
+
+DROP TRIGGER cost_update ON ingredient_costs;
+
+CREATE TRIGGER cost_insert AFTER INSERT ON ingredient_costs
+   REFERENCING NEW TABLE AS new_rows
+   FOR EACH STATEMENT EXECUTE PROCEDURE log_cost_changes();
+
+CREATE TRIGGER cost_update AFTER UPDATE ON ingredient_costs
+   REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+   FOR EACH STATEMENT EXECUTE PROCEDURE log_cost_changes();
+
+CREATE TRIGGER cost_delete AFTER DELETE ON ingredient_costs
+   REFERENCING OLD TABLE AS old_rows
+   FOR EACH STATEMENT EXECUTE PROCEDURE log_cost_changes();
+
+CREATE TRIGGER cost_key_update AFTER UPDATE ON ingredient_costs
+   FOR EACH ROW
+   WHEN (OLD.ingredient_id <> NEW.ingredient_id OR OLD.maker_id <> NEW.maker_id
+         OR OLD.seller_id <> NEW.seller_id)
+   EXECUTE PROCEDURE record_if_cost_changed();
+
+
+CREATE OR REPLACE FUNCTION log_di_changes()
+       RETURNS trigger AS
+    $$
+    BEGIN
+        INSERT INTO product_ingredients_changes (product_id, old_ingredient_id,
+                    new_ingredient_id, old_bakers_percent, new_bakers_percent,
+                    percent_in_sour, percent_in_poolish, percent_in_soaker, modified)
+        SELECT o.product_id, o.ingredient_id, n.ingredient_id, o.bakers_percent,
+               n.bakers_percent, o.percent_in_sour, o.percent_in_poolish,
+               o.percent_in_soaker, now()
+          FROM old_rows AS o
+          JOIN new_rows AS n ON o.product_id = n.product_id
+               AND o.ingredient_id = n.ingredient_id
+         WHERE n.bakers_percent <> o.bakers_percent;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql;
+
+DROP TRIGGER di_update ON product_ingredients;
+
+CREATE TRIGGER di_update AFTER UPDATE ON product_ingredients
+   REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+   FOR EACH STATEMENT EXECUTE PROCEDURE log_di_changes();
+
+CREATE TRIGGER di_key_update AFTER UPDATE ON product_ingredients
+   FOR EACH ROW
+   WHEN (OLD.product_id <> NEW.product_id OR OLD.ingredient_id <> NEW.ingredient_id)
+   EXECUTE PROCEDURE record_if_di_changed();
+
+
+CREATE OR REPLACE FUNCTION log_amt_changes()
+       RETURNS trigger AS
+    $$
+    BEGIN
+        INSERT INTO standing_change_log (old_day_of_week, new_day_of_week, customer_id,
+                    io, product_id, shape_id, old_amt, new_amt, change_time)
+        SELECT o.day_of_week, n.day_of_week, o.customer_id, o.io, o.product_id,
+               o.shape_id, o.amt, n.amt, now()
+          FROM old_rows AS o
+          JOIN new_rows AS n ON o.day_of_week = n.day_of_week
+               AND o.customer_id = n.customer_id AND o.product_id = n.product_id
+               AND o.shape_id = n.shape_id
+         WHERE n.amt <> o.amt;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql;
+
+DROP TRIGGER amt_update ON standing_orders;
+
+CREATE TRIGGER amt_update AFTER UPDATE ON standing_orders
+   REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+   FOR EACH STATEMENT EXECUTE PROCEDURE log_amt_changes();
+
+CREATE TRIGGER amt_key_update AFTER UPDATE ON standing_orders
+   FOR EACH ROW
+   WHEN (OLD.day_of_week <> NEW.day_of_week OR OLD.customer_id <> NEW.customer_id
+         OR OLD.product_id <> NEW.product_id OR OLD.shape_id <> NEW.shape_id)
+   EXECUTE PROCEDURE record_if_amt_changed();
+
+
+DROP TRIGGER update_parties_modtime ON parties;
+CREATE TRIGGER update_parties_modtime BEFORE UPDATE ON parties
+   FOR EACH ROW WHEN (OLD.* IS DISTINCT FROM NEW.*)
+   EXECUTE PROCEDURE update_modified_column();
+
+DROP TRIGGER update_people_modtime ON people_st;
+CREATE TRIGGER update_people_modtime BEFORE UPDATE ON people_st
+   FOR EACH ROW WHEN (OLD.* IS DISTINCT FROM NEW.*)
+   EXECUTE PROCEDURE update_modified_column();
+
+DROP TRIGGER update_phones_modtime ON phones;
+CREATE TRIGGER update_phones_modtime BEFORE UPDATE ON phones
+   FOR EACH ROW WHEN (OLD.* IS DISTINCT FROM NEW.*)
+   EXECUTE PROCEDURE update_modified_column();
+
+DROP TRIGGER update_ingredients_modtime ON ingredients;
+CREATE TRIGGER update_ingredients_modtime BEFORE UPDATE ON ingredients
+   FOR EACH ROW WHEN (OLD.* IS DISTINCT FROM NEW.*)
+   EXECUTE PROCEDURE update_modified_column();
+
+DROP TRIGGER update_ingredient_costs_modtime ON ingredient_costs;
+CREATE TRIGGER update_ingredient_costs_modtime BEFORE UPDATE ON ingredient_costs
+   FOR EACH ROW WHEN (OLD.* IS DISTINCT FROM NEW.*)
+   EXECUTE PROCEDURE update_modified_column();
+
+DROP TRIGGER update_d_ingredients_modtime ON product_ingredients;
+CREATE TRIGGER update_d_ingredients_modtime BEFORE UPDATE ON product_ingredients
+   FOR EACH ROW WHEN (OLD.* IS DISTINCT FROM NEW.*)
+   EXECUTE PROCEDURE update_modified_column();
+
+DROP TRIGGER update_dough_mods_modtime ON dough_mods;
+CREATE TRIGGER update_dough_mods_modtime BEFORE UPDATE ON dough_mods
+   FOR EACH ROW WHEN (OLD.* IS DISTINCT FROM NEW.*)
+   EXECUTE PROCEDURE update_modified_column();
+
+DROP TRIGGER update_spec_orders_modtime ON special_orders;
+CREATE TRIGGER update_spec_orders_modtime BEFORE UPDATE ON special_orders
+   FOR EACH ROW WHEN (OLD.* IS DISTINCT FROM NEW.*)
+   EXECUTE PROCEDURE update_modified_column();
+
+DROP TRIGGER update_tmp_chng_modtime ON tmp_chng;
+CREATE TRIGGER update_tmp_chng_modtime BEFORE UPDATE ON tmp_chng
+   FOR EACH ROW WHEN (OLD.* IS DISTINCT FROM NEW.*)
+   EXECUTE PROCEDURE update_modified_column();
+
+DROP TRIGGER update_stand_orders_modtime ON standing_orders;
+CREATE TRIGGER update_stand_orders_modtime BEFORE UPDATE ON standing_orders
+   FOR EACH ROW WHEN (OLD.* IS DISTINCT FROM NEW.*)
+   EXECUTE PROCEDURE update_modified_column();
@@ -0,0 +1,150 @@
+--recipe variants: a product's effective recipe is its product_ingredients
+--with one or more dough_mods laid over it, in order. All layers are read in
+--one pass and merged with DISTINCT ON, so each ingredient takes its row from
+--the last layer that has it. modded_formula and bak_per2 now go through
+--this, instead of a NOT IN over every mod of every product and five calls
+--each to get_batch_weight and bak_per2 per row.
+
+--mod lookups by product; the primary key leads with mod_name
+CREATE INDEX dough_mods_product_id_idx ON dough_mods (product_id, mod_name);
+
+
+--stack holds LIKE patterns for mod names; the first pattern is the bottom
+--layer. Only products with a matching mod for every pattern are returned,
+--and an empty stack gives the base recipe. from_mod is the mod a row came
+--from (NULL for the base recipe).
+--usage: SELECT * FROM stacked_recipe('kam%', ARRAY['cran%']);
+--       SELECT * FROM stacked_recipe('rug%', ARRAY['seeded', 'cran%']);
+CREATE OR REPLACE FUNCTION stacked_recipe(my_product VARCHAR, stack VARCHAR[])
+       RETURNS TABLE (product_id uuid, product_name VARCHAR, ingredient_id uuid,
+       ingredient VARCHAR, is_flour boolean, from_mod VARCHAR, bakers_percent numeric,
+       percent_in_sour numeric, percent_in_poolish numeric, percent_in_soaker numeric,
+       total_bp numeric, cost_per_g numeric) AS
+'WITH pr AS
+     (SELECT p.product_id, p.product_name
+        FROM products AS p
+       WHERE LOWER(p.product_name) LIKE LOWER(my_product)
+         AND NOT EXISTS (SELECT 1 FROM unnest(stack) AS l (pattern)
+                          WHERE NOT EXISTS (SELECT 1 FROM dough_mods AS dm
+                                             WHERE dm.product_id = p.product_id
+                                               AND LOWER(dm.mod_name) LIKE LOWER(l.pattern)))),
+
+layers AS
+     (SELECT di.product_id, 0::bigint AS layer, NULL::VARCHAR AS mod_name, di.ingredient_id,
+             di.bakers_percent, di.percent_in_sour, di.percent_in_poolish,
+             di.percent_in_soaker
+        FROM product_ingredients AS di
+       WHERE di.product_id IN (SELECT pr.product_id FROM pr)
+       UNION ALL
+      SELECT dm.product_id, l.layer, dm.mod_name, dm.ingredient_id, dm.bakers_percent,
+             dm.percent_in_sour, dm.percent_in_poolish, dm.percent_in_soaker
+        FROM unnest(stack) WITH ORDINALITY AS l (pattern, layer)
+        JOIN dough_mods AS dm ON LOWER(dm.mod_name) LIKE LOWER(l.pattern)
+       WHERE dm.product_id IN (SELECT pr.product_id FROM pr)),
+
+merged AS
+     (SELECT DISTINCT ON (ly.product_id, ly.ingredient_id) ly.*
+        FROM layers AS ly
+       ORDER BY ly.product_id, ly.ingredient_id, ly.layer DESC, ly.mod_name DESC)
+
+SELECT m.product_id, pr.product_name, m.ingredient_id, i.ingredient_name, i.is_flour,
+       m.mod_name, m.bakers_percent, m.percent_in_sour, m.percent_in_poolish,
+       m.percent_in_soaker, sum(m.bakers_percent) OVER (PARTITION BY m.product_id),
+       uc.cost_per_g
+  FROM merged AS m
+  JOIN pr ON m.product_id = pr.product_id
+  JOIN ingredients AS i ON m.ingredient_id = i.ingredient_id
+  LEFT JOIN ingredient_unit_cost AS uc ON m.ingredient_id = uc.ingredient_id;'
+LANGUAGE SQL
+STABLE;
+
+
+--formula() for a stacked variant, scaled by each product's batch weight
+--in today's plan
+--usage: SELECT * FROM stacked_formula('rug%', ARRAY['seeded', 'cran%']);
+CREATE OR REPLACE FUNCTION stacked_formula(my_product VARCHAR, stack VARCHAR[])
+       RETURNS TABLE (product character varying, "%" numeric, ingredient character varying,
+       overall numeric, sour numeric, poolish numeric, soaker numeric, final numeric,
+       cost numeric) AS
+'WITH bw (product_id, batch_weight) AS
+     (SELECT tp.product_id, sum(tp.amt * tp.grams)
+        FROM todays_plan AS tp
+       GROUP BY tp.product_id)
+
+SELECT r.product_name, r.bakers_percent, r.ingredient,
+       ROUND(s.g, 0),
+       ROUND(s.g * r.percent_in_sour /100, 0),
+       ROUND(s.g * r.percent_in_poolish /100, 1),
+       ROUND(s.g * r.percent_in_soaker /100, 0),
+       ROUND(s.g * (1- (r.percent_in_sour + r.percent_in_poolish + r.percent_in_soaker)/100), 0),
+       ROUND(s.g, 0) * r.cost_per_g
+  FROM stacked_recipe(my_product, stack) AS r
+  LEFT JOIN bw ON r.product_id = bw.product_id
+ CROSS JOIN LATERAL (SELECT COALESCE(bw.batch_weight, 0) * r.bakers_percent / r.total_bp) AS s (g)
+ ORDER BY r.product_id, r.is_flour DESC, r.bakers_percent DESC;'
+LANGUAGE SQL
+STABLE;
+
+
+--every variant of the matching products at once, the base recipe
+--(mod NULL) and each single mod, from variant_ingredients
+--usage: SELECT * FROM variant_formulas('kam%');
+CREATE OR REPLACE FUNCTION variant_formulas(my_product VARCHAR)
+       RETURNS TABLE (product character varying, "mod" character varying, "%" numeric,
+       ingredient character varying, overall numeric, sour numeric, poolish numeric,
+       soaker numeric, final numeric, cost numeric) AS
+'WITH pr AS
+     (SELECT p.product_id, p.product_name
+        FROM products AS p
+       WHERE LOWER(p.product_name) LIKE LOWER(my_product)),
+
+bw (product_id, batch_weight) AS
+     (SELECT tp.product_id, sum(tp.amt * tp.grams)
+        FROM todays_plan AS tp
+       WHERE tp.product_id IN (SELECT pr.product_id FROM pr)
+       GROUP BY tp.product_id),
+
+vi AS
+     (SELECT v.*, sum(v.bakers_percent) OVER (PARTITION BY v.product_id, v.mod_name) AS total_bp
+        FROM variant_ingredients AS v
+       WHERE v.product_id IN (SELECT pr.product_id FROM pr))
+
+SELECT pr.product_name, vi.mod_name, vi.bakers_percent, i.ingredient_name,
+       ROUND(s.g, 0),
+       ROUND(s.g * vi.percent_in_sour /100, 0),
+       ROUND(s.g * vi.percent_in_poolish /100, 1),
+       ROUND(s.g * vi.percent_in_soaker /100, 0),
+       ROUND(s.g * (1- (vi.percent_in_sour + vi.percent_in_poolish + vi.percent_in_soaker)/100), 0),
+       ROUND(s.g, 0) * uc.cost_per_g
+  FROM vi
+  JOIN pr ON vi.product_id = pr.product_id
+  JOIN ingredients AS i ON vi.ingredient_id = i.ingredient_id
+  LEFT JOIN ingredient_unit_cost AS uc ON vi.ingredient_id = uc.ingredient_id
+  LEFT JOIN bw ON vi.product_id = bw.product_id
+ CROSS JOIN LATERAL (SELECT COALESCE(bw.batch_weight, 0) * vi.bakers_percent / vi.total_bp) AS s (g)
+ ORDER BY vi.product_id, vi.mod_name NULLS FIRST, i.is_flour DESC, vi.bakers_percent DESC;'
+LANGUAGE SQL
+STABLE;
+
+
+--usage: SELECT bak_per2('kam%', 'cran%');
+CREATE OR REPLACE FUNCTION bak_per2(which_doe VARCHAR, mod VARCHAR)
+  returns numeric AS
+          'SELECT sum(bakers_percent) FROM stacked_recipe(which_doe, ARRAY[mod]);'
+LANGUAGE SQL
+STABLE
+  RETURNS NULL ON NULL INPUT;
+
+
+--each product is scaled by its own batch weight, as formula() does
+--useage: SELECT * FROM modded_formula('Kam%', 'cran%');
+CREATE OR REPLACE FUNCTION modded_formula(get_dough VARCHAR, get_mod VARCHAR)
+       RETURNS TABLE (dough character varying, "%" numeric, ingredient character varying,
+       overall numeric, sour numeric, poolish numeric, soaker numeric, final numeric) AS $$
+       BEGIN
+             RETURN QUERY
+                    SELECT sf.product, sf."%", sf.ingredient, sf.overall, sf.sour,
+                           sf.poolish, sf.soaker, sf.final
+                      FROM stacked_formula(get_dough, ARRAY[get_mod]) AS sf;
+      END;
+$$ LANGUAGE plpgsql;
@@ -0,0 +1,228 @@
+--standing orders are stored one row per customer/product/shape, with the
+--amount for each day of the week in a 7-slot array: amts[day_of_week + 1],
+--NULL for days with no order. A weekly change is one row written, logged
+--and refreshed, not seven.
+--
+--standing_orders stays as a view with the old per-day rows, and writes to
+--it still work through INSTEAD OF triggers, one day at a time. Bulk writers
+--(seed.sql, import_orders.py, gen_data.py) go straight to standing_weekly.
+--tmp_chng now references the weekly row; its day_of_week picks the slot.
+
+CREATE TABLE standing_weekly (
+       customer_id uuid NOT NULL,
+       io text NOT NULL,
+       product_id uuid NOT NULL REFERENCES products(product_id),
+       shape_id uuid NOT NULL REFERENCES shapes(shape_id),
+       amts INTEGER[] NOT NULL,
+       created TIMESTAMPTZ DEFAULT now(),
+       modified TIMESTAMPTZ DEFAULT now(),
+       PRIMARY KEY (customer_id, product_id, shape_id),
+       FOREIGN KEY (customer_id, io)
+                    references parties (party_id, party_type),
+       CONSTRAINT io_i_or_o CHECK (io in ('i', 'o')),
+       CONSTRAINT one_slot_per_day CHECK (array_lower(amts, 1) = 1
+                  AND array_length(amts, 1) = 7 AND array_ndims(amts) = 1),
+       CONSTRAINT amt_greater_than_0 CHECK (0 < ALL (amts)),
+       CONSTRAINT some_day_ordered CHECK (cardinality(array_remove(amts, NULL)) > 0)
+);
+
+CREATE INDEX standing_weekly_product_id_idx ON standing_weekly (product_id);
+
+INSERT INTO standing_weekly (customer_id, io, product_id, shape_id, amts, created, modified)
+SELECT so.customer_id, so.io, so.product_id, so.shape_id,
+       ARRAY[max(so.amt) FILTER (WHERE so.day_of_week = 0),
+             max(so.amt) FILTER (WHERE so.day_of_week = 1),
+             max(so.amt) FILTER (WHERE so.day_of_week = 2),
+             max(so.amt) FILTER (WHERE so.day_of_week = 3),
+             max(so.amt) FILTER (WHERE so.day_of_week = 4),
+             max(so.amt) FILTER (WHERE so.day_of_week = 5),
+             max(so.amt) FILTER (WHERE so.day_of_week = 6)],
+       min(so.created), max(so.modified)
+  FROM standing_orders AS so
+ GROUP BY so.customer_id, so.io, so.product_id, so.shape_id;
+
+
+ALTER TABLE tmp_chng DROP CONSTRAINT tmp_chng_day_of_week_customer_id_product_id_shape_id_fkey;
+ALTER TABLE standing_orders RENAME TO standing_orders_old;
+
+CREATE VIEW standing_orders AS
+SELECT d.dow::SMALLINT AS day_of_week, sw.customer_id, sw.io, sw.product_id, sw.shape_id,
+       sw.amts[d.dow + 1] AS amt, sw.created, sw.modified
+  FROM standing_weekly AS sw
+ CROSS JOIN generate_series(0, 6) AS d (dow)
+ WHERE sw.amts[d.dow + 1] IS NOT NULL;
+
+
+--per-day writes through the view. Moving an order to another day or item
+--clears the old slot and fills the new one, and is logged here the way
+--record_if_amt_changed logged it; a same-slot amount change is logged by
+--log_weekly_changes.
+CREATE OR REPLACE FUNCTION write_standing_orders()
+       RETURNS trigger AS
+    $$
+    DECLARE
+        week INTEGER[];
+    BEGIN
+        IF TG_OP = 'UPDATE' AND NEW.day_of_week = OLD.day_of_week
+           AND NEW.customer_id = OLD.customer_id AND NEW.product_id = OLD.product_id
+           AND NEW.shape_id = OLD.shape_id THEN
+            UPDATE standing_weekly AS sw SET amts[NEW.day_of_week + 1] = NEW.amt
+             WHERE sw.customer_id = OLD.customer_id AND sw.product_id = OLD.product_id
+               AND sw.shape_id = OLD.shape_id;
+            RETURN NEW;
+        END IF;
+
+        IF TG_OP IN ('UPDATE', 'DELETE') THEN
+            UPDATE standing_weekly AS sw SET amts[OLD.day_of_week + 1] = NULL
+             WHERE sw.customer_id = OLD.customer_id AND sw.product_id = OLD.product_id
+               AND sw.shape_id = OLD.shape_id
+               AND cardinality(array_remove(sw.amts, NULL)) > 1;
+            IF NOT FOUND THEN
+                DELETE FROM standing_weekly AS sw
+                 WHERE sw.customer_id = OLD.customer_id AND sw.product_id = OLD.product_id
+                   AND sw.shape_id = OLD.shape_id;
+            END IF;
+            IF TG_OP = 'DELETE' THEN
+                RETURN OLD;
+            END IF;
+        END IF;
+
+        IF EXISTS (SELECT 1 FROM standing_weekly AS sw
+                    WHERE sw.customer_id = NEW.customer_id AND sw.product_id = NEW.product_id
+                      AND sw.shape_id = NEW.shape_id
+                      AND sw.amts[NEW.day_of_week + 1] IS NOT NULL) THEN
+            RAISE unique_violation USING MESSAGE =
+                  format('standing order for day %s already exists', NEW.day_of_week);
+        END IF;
+
+        week := array_fill(NULL::INTEGER, ARRAY[7]);
+        week[NEW.day_of_week + 1] := NEW.amt;
+        INSERT INTO standing_weekly AS sw (customer_id, io, product_id, shape_id, amts)
+        VALUES (NEW.customer_id, NEW.io, NEW.product_id, NEW.shape_id, week)
+            ON CONFLICT (customer_id, product_id, shape_id)
+            DO UPDATE SET amts[NEW.day_of_week + 1] = NEW.amt;
+
+        IF TG_OP = 'UPDATE' AND (NEW.amt <> OLD.amt OR NEW.day_of_week <> OLD.day_of_week) THEN
+            INSERT INTO standing_change_log (old_day_of_week, new_day_of_week, customer_id,
+                        io, product_id, shape_id, old_amt, new_amt, change_time)
+            VALUES (OLD.day_of_week, NEW.day_of_week, OLD.customer_id, OLD.io,
+                    OLD.product_id, OLD.shape_id, OLD.amt, NEW.amt, now());
+        END IF;
+        RETURN NEW;
+    END;
+    $$ LANGUAGE plpgsql;
+
+CREATE TRIGGER standing_orders_write INSTEAD OF INSERT OR UPDATE OR DELETE ON standing_orders
+   FOR EACH ROW EXECUTE PROCEDURE write_standing_orders();
+
+
+--one standing_change_log row per day whose amount changed, in the same
+--format as before
+CREATE OR REPLACE FUNCTION log_weekly_changes()
+       RETURNS trigger AS
+    $$
+    BEGIN
+        INSERT INTO standing_change_log (old_day_of_week, new_day_of_week, customer_id,
+                    io, product_id, shape_id, old_amt, new_amt, change_time)
+        SELECT d.dow, d.dow, o.customer_id, o.io, o.product_id, o.shape_id,
+               o.amts[d.dow + 1], n.amts[d.dow + 1], now()
+          FROM old_rows AS o
+          JOIN new_rows AS n ON o.customer_id = n.customer_id
+               AND o.product_id = n.product_id AND o.shape_id = n.shape_id
+         CROSS JOIN generate_series(0, 6) AS d (dow)
+         WHERE n.amts[d.dow + 1] <> o.amts[d.dow + 1];
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql;
+
+CREATE TRIGGER amt_update AFTER UPDATE ON standing_weekly
+   REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+   FOR EACH STATEMENT EXECUTE PROCEDURE log_weekly_changes();
+
+CREATE TRIGGER update_stand_orders_modtime BEFORE UPDATE ON standing_weekly
+   FOR EACH ROW WHEN (OLD.* IS DISTINCT FROM NEW.*)
+   EXECUTE PROCEDURE update_modified_column();
+
+CREATE TRIGGER plan_standing_insert AFTER INSERT ON standing_weekly
+   REFERENCING NEW TABLE AS new_rows
+   FOR EACH STATEMENT EXECUTE PROCEDURE production_plan_changed();
+
+CREATE TRIGGER plan_standing_update AFTER UPDATE ON standing_weekly
+   REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+   FOR EACH STATEMENT EXECUTE PROCEDURE production_plan_changed();
+
+CREATE TRIGGER plan_standing_delete AFTER DELETE ON standing_weekly
+   REFERENCING OLD TABLE AS old_rows
+   FOR EACH STATEMENT EXECUTE PROCEDURE production_plan_changed();
+
+
+--the delivery day's slot is read straight from the array; the dates also
+--come from now() at query time (the TIMESTAMP 'now()' literals were fixed
+--when the view was created)
+CREATE OR REPLACE VIEW todays_adjusted_so AS
+WITH
+   current_so_changes (dow, cid, prid, sid, pm)
+  AS
+(
+    SELECT tc.day_of_week, tc.customer_id, tc.product_id, tc.shape_id, tc.percent_multiplier
+    FROM tmp_chng AS tc
+    JOIN products as pr ON tc.product_id = pr.product_id
+    WHERE tc.start_date - pr.lead_time_days <= now()::date
+          AND tc.resume_date - pr.lead_time_days > now()::date
+)
+
+SELECT d.dow, sw.customer_id as cid, sw.product_id as prid, pr.product_name, sw.shape_id as sid,
+       COALESCE(round(sw.amts[d.dow + 1] * csc.pm / 100, 0), sw.amts[d.dow + 1]) AS amt,
+       ps.grams as grams
+  FROM standing_weekly as sw
+  JOIN products as pr on sw.product_id = pr.product_id
+ CROSS JOIN LATERAL
+       (SELECT ((EXTRACT(DOW FROM now())::int + pr.lead_time_days) % 7)::SMALLINT) AS d (dow)
+  LEFT JOIN current_so_changes as csc
+       ON d.dow = csc.dow AND sw.customer_id = csc.cid
+       AND sw.product_id = csc.prid AND sw.shape_id = csc.sid
+  JOIN product_shapes as ps ON sw.product_id = ps.product_id AND sw.shape_id = ps.shape_id
+ WHERE sw.amts[d.dow + 1] IS NOT NULL
+;
+
+DROP TABLE standing_orders_old;
+
+ALTER TABLE tmp_chng ADD FOREIGN KEY (customer_id, product_id, shape_id)
+      REFERENCES standing_weekly (customer_id, product_id, shape_id);
+
+
+--each weekly row is walked day by day over the range and the delivery
+--day's slot read from the array
+CREATE OR REPLACE FUNCTION production_plan_rows(from_date DATE, to_date DATE)
+       RETURNS TABLE (bake_date DATE, product_id uuid, shape_id uuid,
+                      amt numeric, grams INTEGER) AS
+'WITH standing (bake_date, product_id, shape_id, amt) AS
+     (SELECT from_date + k, sw.product_id, sw.shape_id,
+             COALESCE(round(sw.amts[d.dow + 1] * tc.percent_multiplier / 100, 0),
+                      sw.amts[d.dow + 1])
+        FROM standing_weekly AS sw
+        JOIN products AS pr ON sw.product_id = pr.product_id
+       CROSS JOIN LATERAL generate_series(0, to_date - from_date) AS k
+       CROSS JOIN LATERAL
+             (SELECT EXTRACT(DOW FROM from_date + k + pr.lead_time_days)::int) AS d (dow)
+        LEFT JOIN tmp_chng AS tc
+             ON tc.day_of_week = d.dow AND sw.customer_id = tc.customer_id
+            AND sw.product_id = tc.product_id AND sw.shape_id = tc.shape_id
+            AND tc.start_date <= from_date + k + pr.lead_time_days
+            AND tc.resume_date > from_date + k + pr.lead_time_days
+       WHERE sw.amts[d.dow + 1] IS NOT NULL),
+
+special (bake_date, product_id, shape_id, amt) AS
+     (SELECT so.delivery_date - pr.lead_time_days, so.product_id, so.shape_id, so.amt
+        FROM special_orders AS so
+        JOIN products AS pr ON so.product_id = pr.product_id
+       WHERE so.delivery_date BETWEEN from_date AND to_date + 7
+         AND so.delivery_date - pr.lead_time_days BETWEEN from_date AND to_date)
+
+SELECT o.bake_date, o.product_id, o.shape_id, sum(o.amt), ps.grams
+  FROM (SELECT * FROM standing UNION ALL SELECT * FROM special) AS o
+  JOIN product_shapes AS ps
+       ON o.product_id = ps.product_id AND o.shape_id = ps.shape_id
+ GROUP BY o.bake_date, o.product_id, o.shape_id, ps.grams;'
+LANGUAGE SQL
+STABLE;
@@ -0,0 +1,111 @@
+--temporary changes (holds) are looked up as a daterange. hold is
+--[start_date, resume_date), generated from the two date columns so writers
+--don't change. A hold with no resume_date gets an empty range, so it
+--still never matches a date (resume_date > date was NULL before).
+--An exclusion constraint rejects overlapping holds on the same standing
+--order day, so a delivery date matches at most one hold. Its GiST index
+--serves the per-item lookups, and a second GiST index on hold alone serves
+--"every hold on date D".
+
+CREATE EXTENSION IF NOT EXISTS btree_gist;
+
+ALTER TABLE tmp_chng ADD COLUMN hold daterange
+      GENERATED ALWAYS AS (CASE WHEN resume_date IS NULL THEN 'empty'::daterange
+                                ELSE daterange(start_date, resume_date) END) STORED;
+
+--overlaps on file would fail the constraint with one example; list them all
+DO $$
+DECLARE
+    overlaps text;
+BEGIN
+    SELECT string_agg(format('day %s customer %s product %s shape %s: %s and %s',
+                             a.day_of_week, a.customer_id, a.product_id, a.shape_id,
+                             a.hold, b.hold), E'\n')
+      INTO overlaps
+      FROM tmp_chng AS a
+      JOIN tmp_chng AS b ON a.day_of_week = b.day_of_week
+           AND a.customer_id = b.customer_id AND a.product_id = b.product_id
+           AND a.shape_id = b.shape_id AND a.start_date < b.start_date
+           AND a.hold && b.hold;
+    IF overlaps IS NOT NULL THEN
+        RAISE EXCEPTION 'overlapping holds in tmp_chng, fix these first:%', E'\n' || overlaps;
+    END IF;
+END;
+$$;
+
+ALTER TABLE tmp_chng ADD CONSTRAINT no_overlapping_holds EXCLUDE USING GIST
+      (day_of_week WITH =, customer_id WITH =, product_id WITH =, shape_id WITH =,
+       hold WITH &&);
+
+CREATE INDEX tmp_chng_hold_idx ON tmp_chng USING GIST (hold);
+
+
+--the percent to apply to a standing order delivered on on_date: the hold's
+--percent_multiplier, or 100 when no hold covers that date
+--usage: SELECT hold_multiplier(pid('Blow'), prid('kamut%'), sid('12" boule'),
+--                              now()::date + 3);
+CREATE OR REPLACE FUNCTION hold_multiplier(which_customer uuid, which_product uuid,
+       which_shape uuid, on_date DATE)
+       RETURNS numeric AS
+'SELECT COALESCE((SELECT tc.percent_multiplier
+                    FROM tmp_chng AS tc
+                   WHERE tc.day_of_week = EXTRACT(DOW FROM on_date)::SMALLINT
+                     AND tc.customer_id = which_customer
+                     AND tc.product_id = which_product
+                     AND tc.shape_id = which_shape
+                     AND tc.hold @> on_date), 100.0);'
+LANGUAGE SQL
+STABLE
+RETURNS NULL ON NULL INPUT;
+
+
+CREATE OR REPLACE VIEW todays_adjusted_so AS
+SELECT d.dow, sw.customer_id as cid, sw.product_id as prid, pr.product_name, sw.shape_id as sid,
+       COALESCE(round(sw.amts[d.dow + 1] * tc.percent_multiplier / 100, 0),
+                sw.amts[d.dow + 1]) AS amt,
+       ps.grams as grams
+  FROM standing_weekly as sw
+  JOIN products as pr on sw.product_id = pr.product_id
+ CROSS JOIN LATERAL
+       (SELECT ((EXTRACT(DOW FROM now())::int + pr.lead_time_days) % 7)::SMALLINT) AS d (dow)
+  LEFT JOIN tmp_chng as tc
+       ON tc.day_of_week = d.dow AND sw.customer_id = tc.customer_id
+       AND sw.product_id = tc.product_id AND sw.shape_id = tc.shape_id
+       AND tc.hold @> (now()::date + pr.lead_time_days)
+  JOIN product_shapes as ps ON sw.product_id = ps.product_id AND sw.shape_id = ps.shape_id
+ WHERE sw.amts[d.dow + 1] IS NOT NULL
+;
+
+
+CREATE OR REPLACE FUNCTION production_plan_rows(from_date DATE, to_date DATE)
+       RETURNS TABLE (bake_date DATE, product_id uuid, shape_id uuid,
+                      amt numeric, grams INTEGER) AS
+'WITH standing (bake_date, product_id, shape_id, amt) AS
+     (SELECT from_date + k, sw.product_id, sw.shape_id,
+             COALESCE(round(sw.amts[d.dow + 1] * tc.percent_multiplier / 100, 0),
+                      sw.amts[d.dow + 1])
+        FROM standing_weekly AS sw
+        JOIN products AS pr ON sw.product_id = pr.product_id
+       CROSS JOIN LATERAL generate_series(0, to_date - from_date) AS k
+       CROSS JOIN LATERAL
+             (SELECT EXTRACT(DOW FROM from_date + k + pr.lead_time_days)::SMALLINT) AS d (dow)
+        LEFT JOIN tmp_chng AS tc
+             ON tc.day_of_week = d.dow AND sw.customer_id = tc.customer_id
+            AND sw.product_id = tc.product_id AND sw.shape_id = tc.shape_id
+            AND tc.hold @> (from_date + k + pr.lead_time_days)
+       WHERE sw.amts[d.dow + 1] IS NOT NULL),
+
+special (bake_date, product_id, shape_id, amt) AS
+     (SELECT so.delivery_date - pr.lead_time_days, so.product_id, so.shape_id, so.amt
+        FROM special_orders AS so
+        JOIN products AS pr ON so.product_id = pr.product_id
+       WHERE so.delivery_date BETWEEN from_date AND to_date + 7
+         AND so.delivery_date - pr.lead_time_days BETWEEN from_date AND to_date)
+
+SELECT o.bake_date, o.product_id, o.shape_id, sum(o.amt), ps.grams
+  FROM (SELECT * FROM standing UNION ALL SELECT * FROM special) AS o
+  JOIN product_shapes AS ps
+       ON o.product_id = ps.product_id AND o.shape_id = ps.shape_id
+ GROUP BY o.bake_date, o.product_id, o.shape_id, ps.grams;'
+LANGUAGE SQL
+STABLE;
@@ -0,0 +1,120 @@
+--function layer cleanup:
+--  * get_batch_weight and bak_per read tables (and, through todays_plan,
+--    now()), so they are STABLE, not IMMUTABLE; the planner could fold an
+--    IMMUTABLE call to a constant and reuse a stale result
+--  * read-only functions are PARALLEL SAFE so queries calling them can
+--    still get a parallel plan
+--  * formula, formula_all, modded_formula and phone_search are LANGUAGE SQL,
+--    so the planner inlines them into the calling query instead of running
+--    an opaque function scan; WHERE clauses and joins around them are
+--    planned with the body
+--Left as they were: normalize_phone and everything calling it
+--(lookup_by_phone, lookup_by_phones) are PARALLEL UNSAFE because of the
+--plpgsql EXCEPTION block, fuzzy_search sets pg_trgm.similarity_threshold,
+--and the trigger and refresh functions write.
+--benchmarks/function_layer_check.sql compares results with the old
+--definitions and shows the inlined plan.
+
+ALTER FUNCTION get_batch_weight(VARCHAR) STABLE PARALLEL SAFE;
+ALTER FUNCTION bak_per(VARCHAR) STABLE PARALLEL SAFE;
+ALTER FUNCTION bak_per2(VARCHAR, VARCHAR) STABLE PARALLEL SAFE;
+
+ALTER FUNCTION pid(VARCHAR) PARALLEL SAFE;
+ALTER FUNCTION prid(VARCHAR) PARALLEL SAFE;
+ALTER FUNCTION iid(VARCHAR) PARALLEL SAFE;
+ALTER FUNCTION sid(VARCHAR) PARALLEL SAFE;
+ALTER FUNCTION phone_type_name(text) PARALLEL SAFE;
+ALTER FUNCTION email_type_name(text) PARALLEL SAFE;
+
+ALTER FUNCTION production_plan_rows(DATE, DATE) PARALLEL SAFE;
+ALTER FUNCTION production_forecast(DATE, DATE) PARALLEL SAFE;
+ALTER FUNCTION ingredient_demand(DATE, DATE) PARALLEL SAFE;
+ALTER FUNCTION cost_scenarios(jsonb) PARALLEL SAFE;
+ALTER FUNCTION product_ingredients_as_of(TIMESTAMPTZ, uuid[]) PARALLEL SAFE;
+ALTER FUNCTION ingredient_costs_as_of(TIMESTAMPTZ, uuid[]) PARALLEL SAFE;
+ALTER FUNCTION standing_orders_as_of(TIMESTAMPTZ) PARALLEL SAFE;
+ALTER FUNCTION formula_as_of(VARCHAR, TIMESTAMPTZ, numeric) PARALLEL SAFE;
+ALTER FUNCTION stacked_recipe(VARCHAR, VARCHAR[]) PARALLEL SAFE;
+ALTER FUNCTION stacked_formula(VARCHAR, VARCHAR[]) PARALLEL SAFE;
+ALTER FUNCTION variant_formulas(VARCHAR) PARALLEL SAFE;
+ALTER FUNCTION hold_multiplier(uuid, uuid, uuid, DATE) PARALLEL SAFE;
+
+
+--usage: SELECT * FROM formula('rug%');
+CREATE OR REPLACE FUNCTION formula(my_product VARCHAR)
+       RETURNS TABLE (product character varying, "%" numeric, ingredient character varying,
+       overall numeric, sour numeric, poolish numeric, soaker numeric, final numeric, cost numeric) AS
+'WITH bw (product_id, batch_weight) AS
+     (SELECT pr.product_id, sum(tp.amt * tp.grams)
+        FROM todays_plan AS tp
+        JOIN products AS pr ON tp.product_id = pr.product_id
+       WHERE LOWER(pr.product_name) LIKE LOWER(my_product)
+       GROUP BY pr.product_id),
+
+scaled AS
+     (SELECT fb.*, COALESCE(bw.batch_weight, 0) * fb.bakers_percent / fb.total_bp AS g
+        FROM formula_base AS fb
+        LEFT JOIN bw ON fb.product_id = bw.product_id
+       WHERE LOWER(fb.product_name) LIKE LOWER(my_product))
+
+SELECT s.product_name, s.bakers_percent, s.ingredient,
+       ROUND(s.g, 0),
+       ROUND(s.g * s.percent_in_sour /100, 0),
+       ROUND(s.g * s.percent_in_poolish /100, 1),
+       ROUND(s.g * s.percent_in_soaker /100, 0),
+       ROUND(s.g * (1- (s.percent_in_sour +
+             s.percent_in_poolish + s.percent_in_soaker)/100), 0),
+       ROUND(s.g, 0) * s.cost_per_g
+  FROM scaled AS s
+ ORDER BY s.product_id, s.is_flour DESC, s.bakers_percent DESC;'
+LANGUAGE SQL
+STABLE
+PARALLEL SAFE;
+
+
+--usage: SELECT * FROM formula_all();
+CREATE OR REPLACE FUNCTION formula_all()
+       RETURNS TABLE (product character varying, "%" numeric, ingredient character varying,
+       overall numeric, sour numeric, poolish numeric, soaker numeric, final numeric, cost numeric) AS
+'WITH scaled AS
+     (SELECT fb.*, bw.batch_weight * fb.bakers_percent / fb.total_bp AS g
+        FROM formula_base AS fb
+        JOIN todays_batch_weights AS bw ON fb.product_id = bw.product_id)
+
+SELECT s.product_name, s.bakers_percent, s.ingredient,
+       ROUND(s.g, 0),
+       ROUND(s.g * s.percent_in_sour /100, 0),
+       ROUND(s.g * s.percent_in_poolish /100, 1),
+       ROUND(s.g * s.percent_in_soaker /100, 0),
+       ROUND(s.g * (1- (s.percent_in_sour +
+             s.percent_in_poolish + s.percent_in_soaker)/100), 0),
+       ROUND(s.g, 0) * s.cost_per_g
+  FROM scaled AS s
+ ORDER BY s.product_name, s.is_flour DESC, s.bakers_percent DESC;'
+LANGUAGE SQL
+STABLE
+PARALLEL SAFE;
+
+
+--useage: SELECT * FROM modded_formula('Kam%', 'cran%');
+CREATE OR REPLACE FUNCTION modded_formula(get_dough VARCHAR, get_mod VARCHAR)
+       RETURNS TABLE (dough character varying, "%" numeric, ingredient character varying,
+       overall numeric, sour numeric, poolish numeric, soaker numeric, final numeric) AS
+'SELECT sf.product, sf."%", sf.ingredient, sf.overall, sf.sour, sf.poolish, sf.soaker,
+        sf.final
+   FROM stacked_formula(get_dough, ARRAY[get_mod]) AS sf;'
+LANGUAGE SQL
+STABLE
+PARALLEL SAFE;
+
+
+       --Useage: SELECT * FROM phone_search('mad%');
+CREATE OR REPLACE FUNCTION phone_search(name_snippet VARCHAR)
+       RETURNS TABLE (name VARCHAR, phone_type text, phone_no VARCHAR) AS
+'SELECT cd.name::VARCHAR, ph.type, ph.phone_no
+   FROM contact_directory AS cd
+  CROSS JOIN LATERAL unnest(cd.phone_types, cd.phone_nos) AS ph (type, phone_no)
+  WHERE cd.lower_name LIKE LOWER(name_snippet);'
+LANGUAGE SQL
+STABLE
+PARALLEL SAFE;
@@ -0,0 +1,242 @@
+--change feed for screens that show today's bake: every statement that writes
+--orders, holds or recipes sends one NOTIFY on the bake_change channel
+--listing the products it touched and the bake dates it moved, e.g.
+--  {"table" : "special_orders", "products" : ["9c1e..."], "dates" : ["2021-03-04"]}
+--change_feed.py listens, coalesces bursts and reloads only those products.
+--
+--products is null when a statement touched more than 150 products (NOTIFY
+--payloads are capped at 8000 bytes); read it as "all".
+--dates is null for recipe changes, which move every bake date.
+--Standing orders and holds repeat weekly, so their dates are the next bake
+--date for each changed weekday, today through today + 6; a hold that
+--covers none of those dates sends nothing.
+--Triggers go on standing_weekly, since writes through the standing_orders
+--view land there. NOTIFY is sent at commit, and PostgreSQL drops duplicate
+--payloads within a transaction.
+
+--the next bake date, today or later, whose delivery falls on delivery_dow
+--usage: SELECT next_bake_date(3, 2);
+CREATE OR REPLACE FUNCTION next_bake_date(delivery_dow INTEGER, lead_time_days INTEGER)
+       RETURNS DATE AS
+'SELECT now()::date
+        + ((delivery_dow - EXTRACT(DOW FROM now()::date + lead_time_days)::int) % 7 + 7) % 7;'
+LANGUAGE SQL
+STABLE
+PARALLEL SAFE
+RETURNS NULL ON NULL INPUT;
+
+
+--bake_dates NULL means every date
+CREATE OR REPLACE FUNCTION notify_bake_change(source text, products uuid[], bake_dates DATE[])
+       RETURNS void AS
+    $$
+    DECLARE
+        feed_max_products CONSTANT INTEGER := 150;
+    BEGIN
+        products := ARRAY(SELECT DISTINCT p FROM unnest(products) AS p
+                           WHERE p IS NOT NULL ORDER BY p);
+        IF cardinality(products) = 0 THEN
+            RETURN;
+        END IF;
+        IF bake_dates IS NOT NULL THEN
+            bake_dates := ARRAY(SELECT DISTINCT d FROM unnest(bake_dates) AS d
+                                 WHERE d IS NOT NULL ORDER BY d);
+            IF cardinality(bake_dates) = 0 THEN
+                RETURN;
+            END IF;
+        END IF;
+        IF cardinality(products) > feed_max_products THEN
+            products := NULL;
+        END IF;
+        PERFORM pg_notify('bake_change',
+                          json_build_object('table', source, 'products', products,
+                                            'dates', bake_dates)::text);
+    END;
+    $$ LANGUAGE plpgsql;
+
+
+CREATE OR REPLACE FUNCTION feed_special_orders()
+       RETURNS trigger AS
+    $$
+    DECLARE
+        changed uuid[] := '{}';
+        moved DATE[] := '{}';
+        p uuid[];
+        d DATE[];
+    BEGIN
+        IF TG_OP IN ('INSERT', 'UPDATE') THEN
+            SELECT array_agg(n.product_id), array_agg(n.delivery_date - pr.lead_time_days)
+              INTO p, d
+              FROM new_rows AS n
+              JOIN products AS pr ON n.product_id = pr.product_id;
+            changed := changed || p;
+            moved := moved || d;
+        END IF;
+        IF TG_OP IN ('UPDATE', 'DELETE') THEN
+            SELECT array_agg(o.product_id), array_agg(o.delivery_date - pr.lead_time_days)
+              INTO p, d
+              FROM old_rows AS o
+              JOIN products AS pr ON o.product_id = pr.product_id;
+            changed := changed || p;
+            moved := moved || d;
+        END IF;
+        PERFORM notify_bake_change(TG_TABLE_NAME, changed, moved);
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql;
+
+
+--an UPDATE reports only the weekdays whose amount changed
+CREATE OR REPLACE FUNCTION feed_standing_weekly()
+       RETURNS trigger AS
+    $$
+    DECLARE
+        changed uuid[];
+        dows INTEGER[];
+        moved DATE[];
+    BEGIN
+        IF TG_OP = 'INSERT' THEN
+            SELECT array_agg(n.product_id), array_agg(k) INTO changed, dows
+              FROM new_rows AS n
+             CROSS JOIN generate_series(0, 6) AS k
+             WHERE n.amts[k + 1] IS NOT NULL;
+        ELSIF TG_OP = 'DELETE' THEN
+            SELECT array_agg(o.product_id), array_agg(k) INTO changed, dows
+              FROM old_rows AS o
+             CROSS JOIN generate_series(0, 6) AS k
+             WHERE o.amts[k + 1] IS NOT NULL;
+        ELSE
+            SELECT array_agg(COALESCE(n.product_id, o.product_id)), array_agg(k)
+              INTO changed, dows
+              FROM old_rows AS o
+              FULL JOIN new_rows AS n ON o.customer_id = n.customer_id
+                   AND o.product_id = n.product_id AND o.shape_id = n.shape_id
+             CROSS JOIN generate_series(0, 6) AS k
+             WHERE o.amts[k + 1] IS DISTINCT FROM n.amts[k + 1];
+        END IF;
+
+        SELECT array_agg(next_bake_date(c.dow, pr.lead_time_days)) INTO moved
+          FROM unnest(changed, dows) AS c (product_id, dow)
+          JOIN products AS pr ON c.product_id = pr.product_id;
+        PERFORM notify_bake_change(TG_TABLE_NAME, changed, COALESCE(moved, '{}'));
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql;
+
+
+CREATE OR REPLACE FUNCTION feed_tmp_chng()
+       RETURNS trigger AS
+    $$
+    DECLARE
+        changed uuid[] := '{}';
+        moved DATE[] := '{}';
+        p uuid[];
+        d DATE[];
+    BEGIN
+        IF TG_OP IN ('INSERT', 'UPDATE') THEN
+            SELECT array_agg(n.product_id), array_agg(b.bake_date) INTO p, d
+              FROM new_rows AS n
+              JOIN products AS pr ON n.product_id = pr.product_id
+             CROSS JOIN LATERAL
+                   (SELECT next_bake_date(n.day_of_week, pr.lead_time_days)) AS b (bake_date)
+             WHERE n.hold @> (b.bake_date + pr.lead_time_days);
+            changed := changed || p;
+            moved := moved || d;
+        END IF;
+        IF TG_OP IN ('UPDATE', 'DELETE') THEN
+            SELECT array_agg(o.product_id), array_agg(b.bake_date) INTO p, d
+              FROM old_rows AS o
+              JOIN products AS pr ON o.product_id = pr.product_id
+             CROSS JOIN LATERAL
+                   (SELECT next_bake_date(o.day_of_week, pr.lead_time_days)) AS b (bake_date)
+             WHERE o.hold @> (b.bake_date + pr.lead_time_days);
+            changed := changed || p;
+            moved := moved || d;
+        END IF;
+        PERFORM notify_bake_change(TG_TABLE_NAME, changed, moved);
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql;
+
+
+--product_ingredients and dough_mods: every bake date of the products
+CREATE OR REPLACE FUNCTION feed_recipe()
+       RETURNS trigger AS
+    $$
+    DECLARE
+        changed uuid[] := '{}';
+        p uuid[];
+    BEGIN
+        IF TG_OP IN ('INSERT', 'UPDATE') THEN
+            SELECT array_agg(product_id) INTO p FROM new_rows;
+            changed := changed || p;
+        END IF;
+        IF TG_OP IN ('UPDATE', 'DELETE') THEN
+            SELECT array_agg(product_id) INTO p FROM old_rows;
+            changed := changed || p;
+        END IF;
+        PERFORM notify_bake_change(TG_TABLE_NAME, changed, NULL);
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql;
+
+
+CREATE TRIGGER feed_special_insert AFTER INSERT ON special_orders
+   REFERENCING NEW TABLE AS new_rows
+   FOR EACH STATEMENT EXECUTE PROCEDURE feed_special_orders();
+
+CREATE TRIGGER feed_special_update AFTER UPDATE ON special_orders
+   REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+   FOR EACH STATEMENT EXECUTE PROCEDURE feed_special_orders();
+
+CREATE TRIGGER feed_special_delete AFTER DELETE ON special_orders
+   REFERENCING OLD TABLE AS old_rows
+   FOR EACH STATEMENT EXECUTE PROCEDURE feed_special_orders();
+
+CREATE TRIGGER feed_standing_insert AFTER INSERT ON standing_weekly
+   REFERENCING NEW TABLE AS new_rows
+   FOR EACH STATEMENT EXECUTE PROCEDURE feed_standing_weekly();
+
+CREATE TRIGGER feed_standing_update AFTER UPDATE ON standing_weekly
+   REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+   FOR EACH STATEMENT EXECUTE PROCEDURE feed_standing_weekly();
+
+CREATE TRIGGER feed_standing_delete AFTER DELETE ON standing_weekly
+   REFERENCING OLD TABLE AS old_rows
+   FOR EACH STATEMENT EXECUTE PROCEDURE feed_standing_weekly();
+
+CREATE TRIGGER feed_tmp_chng_insert AFTER INSERT ON tmp_chng
+   REFERENCING NEW TABLE AS new_rows
+   FOR EACH STATEMENT EXECUTE PROCEDURE feed_tmp_chng();
+
+CREATE TRIGGER feed_tmp_chng_update AFTER UPDATE ON tmp_chng
+   REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+   FOR EACH STATEMENT EXECUTE PROCEDURE feed_tmp_chng();
+
+CREATE TRIGGER feed_tmp_chng_delete AFTER DELETE ON tmp_chng
+   REFERENCING OLD TABLE AS old_rows
+   FOR EACH STATEMENT EXECUTE PROCEDURE feed_tmp_chng();
+
+CREATE TRIGGER feed_product_ingredients_insert AFTER INSERT ON product_ingredients
+   REFERENCING NEW TABLE AS new_rows
+   FOR EACH STATEMENT EXECUTE PROCEDURE feed_recipe();
+
+CREATE TRIGGER feed_product_ingredients_update AFTER UPDATE ON product_ingredients
+   REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+   FOR EACH STATEMENT EXECUTE PROCEDURE feed_recipe();
+
+CREATE TRIGGER feed_product_ingredients_delete AFTER DELETE ON product_ingredients
+   REFERENCING OLD TABLE AS old_rows
+   FOR EACH STATEMENT EXECUTE PROCEDURE feed_recipe();
+
+CREATE TRIGGER feed_dough_mods_insert AFTER INSERT ON dough_mods
+   REFERENCING NEW TABLE AS new_rows
+   FOR EACH STATEMENT EXECUTE PROCEDURE feed_recipe();
+
+CREATE TRIGGER feed_dough_mods_update AFTER UPDATE ON dough_mods
+   REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+   FOR EACH STATEMENT EXECUTE PROCEDURE feed_recipe();
+
+CREATE TRIGGER feed_dough_mods_delete AFTER DELETE ON dough_mods
+   REFERENCING OLD TABLE AS old_rows
+   FOR EACH STATEMENT EXECUTE PROCEDURE feed_recipe();
@@ -0,0 +1,52 @@
+--bake_change payloads are held under the 8000-byte NOTIFY limit by size,
+--not by product count: one statement can touch 150 products and months of
+--bake dates (import_orders.py merges a whole file in one INSERT), and an
+--oversized pg_notify would roll back the write that fired it. Past
+--7900 bytes dates goes to null, then products, which listeners already
+--read as "all".
+
+--usage: SELECT bake_change_payload('special_orders', ARRAY[prid('rug%')], ARRAY[now()::date]);
+CREATE OR REPLACE FUNCTION bake_change_payload(source text, products uuid[], bake_dates DATE[])
+       RETURNS text AS
+    $$
+    DECLARE
+        max_bytes CONSTANT INTEGER := 7900;
+        payload text;
+    BEGIN
+        payload := json_build_object('table', source, 'products', products,
+                                     'dates', bake_dates)::text;
+        IF octet_length(payload) > max_bytes THEN
+            payload := json_build_object('table', source, 'products', products,
+                                         'dates', NULL)::text;
+        END IF;
+        IF octet_length(payload) > max_bytes THEN
+            payload := json_build_object('table', source, 'products', NULL,
+                                         'dates', NULL)::text;
+        END IF;
+        RETURN payload;
+    END;
+    $$ LANGUAGE plpgsql
+IMMUTABLE
+PARALLEL SAFE;
+
+
+--bake_dates NULL means every date
+CREATE OR REPLACE FUNCTION notify_bake_change(source text, products uuid[], bake_dates DATE[])
+       RETURNS void AS
+    $$
+    BEGIN
+        products := ARRAY(SELECT DISTINCT p FROM unnest(products) AS p
+                           WHERE p IS NOT NULL ORDER BY p);
+        IF cardinality(products) = 0 THEN
+            RETURN;
+        END IF;
+        IF bake_dates IS NOT NULL THEN
+            bake_dates := ARRAY(SELECT DISTINCT d FROM unnest(bake_dates) AS d
+                                 WHERE d IS NOT NULL ORDER BY d);
+            IF cardinality(bake_dates) = 0 THEN
+                RETURN;
+            END IF;
+        END IF;
+        PERFORM pg_notify('bake_change', bake_change_payload(source, products, bake_dates));
+    END;
+    $$ LANGUAGE plpgsql;
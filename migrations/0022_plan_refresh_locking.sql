@@ -0,0 +1,38 @@
+--refresh_production_plan serializes writers of the same product. Before,
+--two transactions writing orders for one product both ran DELETE then
+--INSERT; the second DELETE couldn't see the first one's uncommitted rows,
+--so its INSERT failed on production_plan_pkey and the order was lost.
+--Now each refresh takes a transaction-level advisory lock per product
+--(in a fixed order, so two refreshes can't deadlock on each other) before
+--it deletes. The DELETE and INSERT that follow start after the lock is
+--granted, so they see the other transaction's orders and plan rows.
+--A refresh of every product, or of more than 64, locks production_plan
+--itself instead of taking that many advisory locks.
+
+CREATE OR REPLACE FUNCTION refresh_production_plan(from_date DATE, to_date DATE,
+                                                   which_products uuid[] DEFAULT NULL)
+       RETURNS void AS
+    $$
+    DECLARE
+        plan_lock_class CONSTANT INTEGER := 4204;
+    BEGIN
+        IF which_products IS NULL OR cardinality(which_products) > 64 THEN
+            --conflicts with itself and with the row locks of any other refresh
+            LOCK TABLE production_plan IN SHARE ROW EXCLUSIVE MODE;
+        ELSE
+            PERFORM pg_advisory_xact_lock(plan_lock_class, k.h)
+               FROM (SELECT DISTINCT hashtext(p::text) AS h
+                       FROM unnest(which_products) AS p
+                      ORDER BY 1) AS k;
+        END IF;
+
+        DELETE FROM production_plan AS pp
+         WHERE pp.bake_date BETWEEN from_date AND to_date
+           AND (which_products IS NULL OR pp.product_id = ANY(which_products));
+
+        INSERT INTO production_plan (bake_date, product_id, shape_id, amt, grams)
+        SELECT r.bake_date, r.product_id, r.shape_id, r.amt, r.grams
+          FROM production_plan_rows(from_date, to_date) AS r
+         WHERE which_products IS NULL OR r.product_id = ANY(which_products);
+    END;
+    $$ LANGUAGE plpgsql;
@@ -0,0 +1,63 @@
+--the materialized plan window now starts out set and moves forward daily.
+--Only seed.sql used to call rebuild_production_plan, so a database built
+--with --baseline or without seed data never had a window, and on any
+--database the 14 days ran out two weeks after seeding; todays_plan then
+--quietly went back to computing the whole plan on every read.
+--roll_production_plan() moves the window to start today, filling only the
+--new dates; roll_plan.py runs it from cron. It runs once here as well.
+--production_plan_changed reads the window FOR SHARE, so a trigger can't
+--refresh with a window that a roll is in the middle of replacing.
+
+--usage: SELECT roll_production_plan();      -- today through today + 13
+CREATE OR REPLACE FUNCTION roll_production_plan(days INTEGER DEFAULT 14)
+       RETURNS void AS
+    $$
+    DECLARE
+        w production_plan_window%ROWTYPE;
+        new_from DATE := now()::date;
+        new_to DATE := now()::date + days - 1;
+    BEGIN
+        SELECT * INTO w FROM production_plan_window FOR UPDATE;
+        IF NOT FOUND OR w.from_date > new_from OR w.to_date < new_from THEN
+            PERFORM rebuild_production_plan(new_from, new_to);
+            RETURN;
+        END IF;
+
+        UPDATE production_plan_window
+           SET from_date = new_from, to_date = GREATEST(w.to_date, new_to);
+        IF new_to > w.to_date THEN
+            PERFORM refresh_production_plan(w.to_date + 1, new_to);
+        END IF;
+    END;
+    $$ LANGUAGE plpgsql;
+
+
+--statement-level so a bulk load refreshes each touched product once
+CREATE OR REPLACE FUNCTION production_plan_changed()
+       RETURNS trigger AS
+    $$
+    DECLARE
+        changed uuid[] := '{}';
+        w production_plan_window%ROWTYPE;
+    BEGIN
+        SELECT * INTO w FROM production_plan_window FOR SHARE;
+        IF NOT FOUND THEN
+            RETURN NULL;
+        END IF;
+
+        IF TG_OP IN ('INSERT', 'UPDATE') THEN
+            SELECT changed || array_agg(DISTINCT product_id) INTO changed FROM new_rows;
+        END IF;
+        IF TG_OP IN ('UPDATE', 'DELETE') THEN
+            SELECT changed || array_agg(DISTINCT product_id) INTO changed FROM old_rows;
+        END IF;
+
+        IF cardinality(changed) > 0 THEN
+            PERFORM refresh_production_plan(w.from_date, w.to_date, changed);
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql;
+
+
+SELECT roll_production_plan();
@@ -0,0 +1,33 @@
+--stacked_formula summed all of todays_plan on every call to find batch
+--weights, then kept the few it needed. Like formula() and
+--variant_formulas(), it now sums only the products matching my_product,
+--so a variant formula costs about what the base formula does.
+
+--formula() for a stacked variant, scaled by each product's batch weight
+--in today's plan
+--usage: SELECT * FROM stacked_formula('rug%', ARRAY['seeded', 'cran%']);
+CREATE OR REPLACE FUNCTION stacked_formula(my_product VARCHAR, stack VARCHAR[])
+       RETURNS TABLE (product character varying, "%" numeric, ingredient character varying,
+       overall numeric, sour numeric, poolish numeric, soaker numeric, final numeric,
+       cost numeric) AS
+'WITH bw (product_id, batch_weight) AS
+     (SELECT pr.product_id, sum(tp.amt * tp.grams)
+        FROM todays_plan AS tp
+        JOIN products AS pr ON tp.product_id = pr.product_id
+       WHERE LOWER(pr.product_name) LIKE LOWER(my_product)
+       GROUP BY pr.product_id)
+
+SELECT r.product_name, r.bakers_percent, r.ingredient,
+       ROUND(s.g, 0),
+       ROUND(s.g * r.percent_in_sour /100, 0),
+       ROUND(s.g * r.percent_in_poolish /100, 1),
+       ROUND(s.g * r.percent_in_soaker /100, 0),
+       ROUND(s.g * (1- (r.percent_in_sour + r.percent_in_poolish + r.percent_in_soaker)/100), 0),
+       ROUND(s.g, 0) * r.cost_per_g
+  FROM stacked_recipe(my_product, stack) AS r
+  LEFT JOIN bw ON r.product_id = bw.product_id
+ CROSS JOIN LATERAL (SELECT COALESCE(bw.batch_weight, 0) * r.bakers_percent / r.total_bp) AS s (g)
+ ORDER BY r.product_id, r.is_flour DESC, r.bakers_percent DESC;'
+LANGUAGE SQL
+STABLE
+PARALLEL SAFE;
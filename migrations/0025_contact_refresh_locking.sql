@@ -0,0 +1,74 @@
+--refresh_contacts serializes refreshes of the same party. Two READ
+--COMMITTED transactions adding a phone or email for one party each built
+--the directory row from a snapshot without the other's write; the second
+--ON CONFLICT DO UPDATE waited for the first to commit and then overwrote
+--its row with stale arrays, dropping a phone or email until the party was
+--next written. Now each refresh takes a transaction-level advisory lock per
+--party, in a fixed order, before it reads; the statements that follow start
+--after the lock is granted and see the other transaction's rows. As in
+--0022_plan_refresh_locking.sql, more than 64 parties lock contact_directory
+--itself instead.
+
+--usage: SELECT refresh_contacts(ARRAY[pid('Madison Sourdough')]);
+CREATE OR REPLACE FUNCTION refresh_contacts(which_parties uuid[])
+       RETURNS void AS
+    $$
+    DECLARE
+        contact_lock_class CONSTANT INTEGER := 4205;
+    BEGIN
+        IF cardinality(which_parties) > 64 THEN
+            --conflicts with itself and with the row locks of any other refresh
+            LOCK TABLE contact_directory IN SHARE ROW EXCLUSIVE MODE;
+        ELSE
+            PERFORM pg_advisory_xact_lock(contact_lock_class, k.h)
+               FROM (SELECT DISTINCT hashtext(p::text) AS h
+                       FROM unnest(which_parties) AS p
+                      ORDER BY 1) AS k;
+        END IF;
+
+        DELETE FROM contact_directory AS cd
+         WHERE cd.party_id = ANY(which_parties)
+           AND NOT EXISTS (SELECT 1 FROM parties AS p WHERE p.party_id = cd.party_id);
+
+        INSERT INTO contact_directory
+               (party_id, party_type, name, lower_name, first_name, last_name,
+                phone_types, phone_nos, email_types, emails, is_staff, staff_active,
+                refreshed)
+        SELECT p.party_id, p.party_type, n.name, LOWER(n.name), pe.first_name, p.party_name,
+               COALESCE(ph.types, '{}'), COALESCE(ph.nos, '{}'),
+               COALESCE(em.types, '{}'), COALESCE(em.addrs, '{}'),
+               s.party_id IS NOT NULL, COALESCE(s.is_active, false), now()
+          FROM parties AS p
+          LEFT JOIN people_st AS pe ON p.party_id = pe.party_id
+          LEFT JOIN staff_st AS s ON p.party_id = s.party_id
+         CROSS JOIN LATERAL
+               (SELECT CASE WHEN pe.party_id IS NOT NULL
+                            THEN pe.first_name || ' ' || p.party_name
+                            ELSE p.party_name
+                       END) AS n (name)
+          LEFT JOIN LATERAL
+               (SELECT array_agg(phone_type_name(x.phone_type) ORDER BY phone_type_name(x.phone_type)),
+                       array_agg(x.phone_no ORDER BY phone_type_name(x.phone_type))
+                  FROM phones AS x
+                 WHERE x.party_id = p.party_id) AS ph (types, nos) ON true
+          LEFT JOIN LATERAL
+               (SELECT array_agg(email_type_name(x.email_type) ORDER BY email_type_name(x.email_type)),
+                       array_agg(x.email ORDER BY email_type_name(x.email_type))
+                  FROM emails AS x
+                 WHERE x.party_id = p.party_id) AS em (types, addrs) ON true
+         WHERE p.party_id = ANY(which_parties)
+            ON CONFLICT (party_id) DO UPDATE
+           SET party_type = EXCLUDED.party_type,
+               name = EXCLUDED.name,
+               lower_name = EXCLUDED.lower_name,
+               first_name = EXCLUDED.first_name,
+               last_name = EXCLUDED.last_name,
+               phone_types = EXCLUDED.phone_types,
+               phone_nos = EXCLUDED.phone_nos,
+               email_types = EXCLUDED.email_types,
+               emails = EXCLUDED.emails,
+               is_staff = EXCLUDED.is_staff,
+               staff_active = EXCLUDED.staff_active,
+               refreshed = EXCLUDED.refreshed;
+    END;
+    $$ LANGUAGE plpgsql;
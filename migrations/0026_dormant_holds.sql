@@ -0,0 +1,58 @@
+--tmp_chng rows with no resume_date never matched a date before 0018, and
+--0018 as first written made them open-ended holds, applying their
+--percent_multiplier (often 0) to every later delivery. hold is rebuilt so
+--those rows get an empty range again: they match nothing and overlap
+--nothing. A generated column's expression can't be altered, so the column,
+--its exclusion constraint and index are recreated; todays_adjusted_so is
+--pointed at the date columns while hold is gone.
+--On a database that ran the corrected 0018 this rebuilds the same column.
+
+CREATE OR REPLACE VIEW todays_adjusted_so AS
+SELECT d.dow, sw.customer_id as cid, sw.product_id as prid, pr.product_name, sw.shape_id as sid,
+       COALESCE(round(sw.amts[d.dow + 1] * tc.percent_multiplier / 100, 0),
+                sw.amts[d.dow + 1]) AS amt,
+       ps.grams as grams
+  FROM standing_weekly as sw
+  JOIN products as pr on sw.product_id = pr.product_id
+ CROSS JOIN LATERAL
+       (SELECT ((EXTRACT(DOW FROM now())::int + pr.lead_time_days) % 7)::SMALLINT) AS d (dow)
+  LEFT JOIN tmp_chng as tc
+       ON tc.day_of_week = d.dow AND sw.customer_id = tc.customer_id
+       AND sw.product_id = tc.product_id AND sw.shape_id = tc.shape_id
+       AND tc.start_date <= now()::date + pr.lead_time_days
+       AND tc.resume_date > now()::date + pr.lead_time_days
+  JOIN product_shapes as ps ON sw.product_id = ps.product_id AND sw.shape_id = ps.shape_id
+ WHERE sw.amts[d.dow + 1] IS NOT NULL
+;
+
+--takes no_overlapping_holds and tmp_chng_hold_idx with it
+ALTER TABLE tmp_chng DROP COLUMN hold;
+
+ALTER TABLE tmp_chng ADD COLUMN hold daterange
+      GENERATED ALWAYS AS (CASE WHEN resume_date IS NULL THEN 'empty'::daterange
+                                ELSE daterange(start_date, resume_date) END) STORED;
+
+--the ranges only got narrower, so rows that passed 0018 still pass
+ALTER TABLE tmp_chng ADD CONSTRAINT no_overlapping_holds EXCLUDE USING GIST
+      (day_of_week WITH =, customer_id WITH =, product_id WITH =, shape_id WITH =,
+       hold WITH &&);
+
+CREATE INDEX tmp_chng_hold_idx ON tmp_chng USING GIST (hold);
+
+
+CREATE OR REPLACE VIEW todays_adjusted_so AS
+SELECT d.dow, sw.customer_id as cid, sw.product_id as prid, pr.product_name, sw.shape_id as sid,
+       COALESCE(round(sw.amts[d.dow + 1] * tc.percent_multiplier / 100, 0),
+                sw.amts[d.dow + 1]) AS amt,
+       ps.grams as grams
+  FROM standing_weekly as sw
+  JOIN products as pr on sw.product_id = pr.product_id
+ CROSS JOIN LATERAL
+       (SELECT ((EXTRACT(DOW FROM now())::int + pr.lead_time_days) % 7)::SMALLINT) AS d (dow)
+  LEFT JOIN tmp_chng as tc
+       ON tc.day_of_week = d.dow AND sw.customer_id = tc.customer_id
+       AND sw.product_id = tc.product_id AND sw.shape_id = tc.shape_id
+       AND tc.hold @> (now()::date + pr.lead_time_days)
+  JOIN product_shapes as ps ON sw.product_id = ps.product_id AND sw.shape_id = ps.shape_id
+ WHERE sw.amts[d.dow + 1] IS NOT NULL
+;
@@ -0,0 +1,67 @@
+--cost_scenarios fixes:
+--  * an ingredient overridden twice in one scenario joined twice in
+--    costed, counting its baker's percent twice in both sums; the last
+--    override for a (scenario, ingredient) now wins, the way a later row
+--    in a price sheet replaces an earlier one
+--  * an ingredient with no unit cost, or a factor override on one, was left
+--    out of the sums without a word, and a variant with nothing costed got
+--    a NULL new cost; missing_costs now counts the ingredients left out of
+--    either cost, as product_costs does, so callers can tell
+--The result gains a column, so the function is dropped and recreated.
+
+DROP FUNCTION cost_scenarios(jsonb);
+
+--usage: SELECT * FROM cost_scenarios('[{"scenario": "flour +10%",
+--              "ingredient_id": "...", "factor": 1.1}]');
+CREATE OR REPLACE FUNCTION cost_scenarios(overrides jsonb)
+       RETURNS TABLE (scenario text, product_id uuid, product_name VARCHAR, mod_name VARCHAR,
+       shape_name VARCHAR, grams integer, cost_per_g numeric, new_cost_per_g numeric,
+       piece_cost numeric, new_piece_cost numeric, delta numeric, delta_pct numeric,
+       missing_costs bigint) AS
+'WITH o AS
+     (SELECT DISTINCT ON (o.scenario, o.ingredient_id) o.*
+        FROM jsonb_array_elements(overrides) WITH ORDINALITY AS e (elem, n)
+       CROSS JOIN LATERAL jsonb_to_record(e.elem)
+             AS o (scenario text, ingredient_id uuid, cost numeric, grams numeric,
+                   cost_per_g numeric, factor numeric)
+       ORDER BY o.scenario, o.ingredient_id, e.n DESC),
+
+ov (scenario, ingredient_id, cost_per_g) AS
+     (SELECT o.scenario, o.ingredient_id,
+             COALESCE(o.cost_per_g, o.cost / NULLIF(o.grams, 0), uc.cost_per_g * o.factor)
+        FROM o
+        LEFT JOIN ingredient_unit_cost AS uc ON o.ingredient_id = uc.ingredient_id),
+
+hit (scenario, product_id, mod_key) AS
+     (SELECT DISTINCT ov.scenario, vi.product_id, COALESCE(vi.mod_name, '''')
+        FROM ov
+        JOIN variant_ingredients AS vi ON ov.ingredient_id = vi.ingredient_id),
+
+costed (scenario, product_id, mod_key, old_cpg, new_cpg, missing_costs) AS
+     (SELECT h.scenario, h.product_id, h.mod_key,
+             sum(vi.bakers_percent * uc.cost_per_g) / sum(vi.bakers_percent),
+             sum(vi.bakers_percent * COALESCE(ov.cost_per_g, uc.cost_per_g))
+                 / sum(vi.bakers_percent),
+             count(*) FILTER (WHERE uc.cost_per_g IS NULL
+                                 OR COALESCE(ov.cost_per_g, uc.cost_per_g) IS NULL)
+        FROM hit AS h
+        JOIN variant_ingredients AS vi ON h.product_id = vi.product_id
+             AND h.mod_key = COALESCE(vi.mod_name, '''')
+        LEFT JOIN ingredient_unit_cost AS uc ON vi.ingredient_id = uc.ingredient_id
+        LEFT JOIN ov ON h.scenario = ov.scenario AND vi.ingredient_id = ov.ingredient_id
+       GROUP BY h.scenario, h.product_id, h.mod_key)
+
+SELECT c.scenario, c.product_id, pr.product_name, NULLIF(c.mod_key, '''')::VARCHAR,
+       s.shape_name, ps.grams, ROUND(c.old_cpg, 5), ROUND(c.new_cpg, 5),
+       ROUND(c.old_cpg * ps.grams, 4), ROUND(c.new_cpg * ps.grams, 4),
+       ROUND((c.new_cpg - c.old_cpg) * ps.grams, 4),
+       ROUND(100 * (c.new_cpg - c.old_cpg) / NULLIF(c.old_cpg, 0), 2),
+       c.missing_costs
+  FROM costed AS c
+  JOIN products AS pr ON c.product_id = pr.product_id
+  JOIN product_shapes AS ps ON c.product_id = ps.product_id
+  JOIN shapes AS s ON ps.shape_id = s.shape_id
+ ORDER BY c.scenario, pr.product_name, c.mod_key, s.shape_name;'
+LANGUAGE SQL
+STABLE
+PARALLEL SAFE;
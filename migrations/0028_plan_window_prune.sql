@@ -0,0 +1,35 @@
+--roll_production_plan moved the window forward but left the rows for
+--bake dates before it, so production_plan grew by a day of rows every day
+--and kept figures for dates no trigger maintains any more. The roll now
+--deletes them in the same transaction that moves the window.
+
+--usage: SELECT roll_production_plan();      -- today through today + 13
+CREATE OR REPLACE FUNCTION roll_production_plan(days INTEGER DEFAULT 14)
+       RETURNS void AS
+    $$
+    DECLARE
+        w production_plan_window%ROWTYPE;
+        new_from DATE := now()::date;
+        new_to DATE := now()::date + days - 1;
+        had_window BOOLEAN;
+    BEGIN
+        SELECT * INTO w FROM production_plan_window FOR UPDATE;
+        had_window := FOUND;
+
+        DELETE FROM production_plan WHERE bake_date < new_from;
+
+        IF NOT had_window OR w.from_date > new_from OR w.to_date < new_from THEN
+            PERFORM rebuild_production_plan(new_from, new_to);
+            RETURN;
+        END IF;
+
+        UPDATE production_plan_window
+           SET from_date = new_from, to_date = GREATEST(w.to_date, new_to);
+        IF new_to > w.to_date THEN
+            PERFORM refresh_production_plan(w.to_date + 1, new_to);
+        END IF;
+    END;
+    $$ LANGUAGE plpgsql;
+
+
+SELECT roll_production_plan();
@@ -0,0 +1,53 @@
+--fuzzy_search set pg_trgm.similarity_threshold for the rest of the
+--caller's transaction, so a later % in the same transaction quietly used
+--the last threshold passed here. It now puts the caller's setting back
+--once its results are collected. The % operator stays, since it is what
+--lets the trigram indexes find the candidates; filtering on similarity()
+--instead would scan every name.
+
+--ranked typo-tolerant lookup across parties, products, ingredients and
+--shapes through the trigram indexes; threshold is the pg_trgm similarity
+--cutoff (0 to 1) and k the number of results
+--usage: SELECT * FROM fuzzy_search('madsin sourdoh');
+--       SELECT * FROM fuzzy_search('kamut', ARRAY['product'], 3, 0.2);
+CREATE OR REPLACE FUNCTION fuzzy_search(query text,
+       kinds text[] DEFAULT ARRAY['party', 'product', 'ingredient', 'shape'],
+       k INTEGER DEFAULT 5, threshold real DEFAULT 0.3)
+       RETURNS TABLE (kind text, id uuid, name VARCHAR, score real) AS $$
+       DECLARE
+              --missing until pg_trgm is first loaded in this session
+              caller_threshold text :=
+                     COALESCE(current_setting('pg_trgm.similarity_threshold', true), '0.3');
+       BEGIN
+              PERFORM set_config('pg_trgm.similarity_threshold', threshold::text, true);
+              RETURN QUERY
+                 SELECT m.kind, m.id, m.name, m.score
+                   FROM ((SELECT 'party'::text, p.party_id, p.party_name,
+                                 similarity(p.party_name, query)
+                            FROM parties AS p
+                           WHERE 'party' = ANY(kinds) AND p.party_name % query
+                           ORDER BY 4 DESC LIMIT k)
+                         UNION ALL
+                         (SELECT 'product'::text, pr.product_id, pr.product_name,
+                                 similarity(pr.product_name, query)
+                            FROM products AS pr
+                           WHERE 'product' = ANY(kinds) AND pr.product_name % query
+                           ORDER BY 4 DESC LIMIT k)
+                         UNION ALL
+                         (SELECT 'ingredient'::text, i.ingredient_id, i.ingredient_name,
+                                 similarity(i.ingredient_name, query)
+                            FROM ingredients AS i
+                           WHERE 'ingredient' = ANY(kinds) AND i.ingredient_name % query
+                           ORDER BY 4 DESC LIMIT k)
+                         UNION ALL
+                         (SELECT 'shape'::text, s.shape_id, s.shape_name,
+                                 similarity(s.shape_name, query)
+                            FROM shapes AS s
+                           WHERE 'shape' = ANY(kinds) AND s.shape_name % query
+                           ORDER BY 4 DESC LIMIT k)) AS m (kind, id, name, score)
+                  ORDER BY m.score DESC, m.name
+                  LIMIT k;
+              PERFORM set_config('pg_trgm.similarity_threshold', caller_threshold, true);
+       END;
+$$ LANGUAGE plpgsql;
+
@@ -0,0 +1,54 @@
+import argparse
+import datetime
+from itertools import groupby
+
+import psycopg2.extras
+
+import db
+
+# usage:
+#   python purchasing.py                     # the next 7 bake days
+#   python purchasing.py --start 2020-07-06 --days 14
+
+
+def ingredient_demand(start_date, end_date):
+    """Whole-range ingredient rollup from ingredient_demand() in one round-trip."""
+    with db.cursor(cursor_factory=psycopg2.extras.NamedTupleCursor) as cursor:
+        cursor.execute("SELECT * FROM ingredient_demand(%s, %s)",
+                       (start_date, end_date))
+        return cursor.fetchall()
+
+
+def print_report(rows):
+    total = 0
+    for seller, items in groupby(rows, key=lambda r: r.seller):
+        items = list(items)
+        print(f"\n{seller or 'no known seller'}")
+        for r in items:
+            packs = '' if r.packages is None else \
+                f"{r.packages:>5} x {r.package_grams}g  ${r.spend:>9.2f}"
+            print(f"  {r.ingredient:<28} {r.overall:>10}g  {packs}")
+        spend = sum(r.spend or 0 for r in items)
+        total += spend
+        print(f"  {'':<28} {'':>11}  {'subtotal':>14}  ${spend:>9.2f}")
+    print(f"\ntotal spend ${total:.2f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Ingredient purchasing list for a range of bake dates")
+    parser.add_argument('--start', type=datetime.date.fromisoformat,
+                        default=datetime.date.today(),
+                        help="first bake date (default today)")
+    parser.add_argument('--days', type=int, default=7,
+                        help="number of bake days to cover (default 7)")
+    args = parser.parse_args(argv)
+
+    end = args.start + datetime.timedelta(days=args.days - 1)
+    print(f"Ingredients for bake dates {args.start} thru {end}")
+    print_report(ingredient_demand(args.start, end))
+    db.close_all()
+
+
+if __name__ == '__main__':
+    main()
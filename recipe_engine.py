@@ -0,0 +1,319 @@
+import pickle
+import re
+from collections import namedtuple
+from decimal import Decimal, ROUND_HALF_UP, localcontext
+from fractions import Fraction
+
+import numpy as np
+
+import db
+
+# Client-side formula(), formula_all() and modded_formula() for every
+# product and mod at once. A Snapshot pulls products, recipes, mods, shapes,
+# unit costs and one bake day's plan in a few bulk queries; compute() then
+# scales every recipe variant in one NumPy pass. A snapshot can be pickled
+# and used with no database at all.
+#
+# usage:
+#   snap = Snapshot.fetch()                  # today's plan, like formula()
+#   snap.save('monday.snap')                 # later, offline:
+#   snap = Snapshot.open('monday.snap')
+#   result = snap.compute()
+#   for row in result.formula('rug%'): ...
+#   result.modded_formula('kam%', 'cran%')
+#
+# The numbers match the SQL functions digit for digit. The vector pass runs
+# in float64. A rounded column is only taken from it when the value is
+# clear of a rounding boundary. Anything within TIE_TOLERANCE of x.5 is
+# recomputed in Decimal, following PostgreSQL's numeric rules: the result
+# scale of a division, exact multiplication, and rounding half away from zero.
+#
+# Mod variants follow the variant_ingredients view: a mod row replaces the
+# base row for the same ingredient of that product only.
+
+TIE_TOLERANCE = 1e-6
+
+FormulaRow = namedtuple('FormulaRow', ['product', 'mod', 'bakers_percent', 'ingredient',
+                                       'overall', 'sour', 'poolish', 'soaker', 'final',
+                                       'cost'])
+
+PRODUCTS_SQL = "SELECT product_id, product_name FROM products ORDER BY product_id"
+
+RECIPE_SQL = """
+SELECT di.product_id, NULL AS mod_name, di.ingredient_id, di.bakers_percent,
+       di.percent_in_sour, di.percent_in_poolish, di.percent_in_soaker
+  FROM product_ingredients AS di
+ UNION ALL
+SELECT dm.product_id, dm.mod_name, dm.ingredient_id, dm.bakers_percent,
+       dm.percent_in_sour, dm.percent_in_poolish, dm.percent_in_soaker
+  FROM dough_mods AS dm
+"""
+
+INGREDIENTS_SQL = """
+SELECT i.ingredient_id, i.ingredient_name, i.is_flour, uc.cost_per_g
+  FROM ingredients AS i
+  LEFT JOIN ingredient_unit_cost AS uc ON i.ingredient_id = uc.ingredient_id
+"""
+
+SHAPES_SQL = "SELECT product_id, shape_id, grams FROM product_shapes"
+
+TODAYS_PLAN_SQL = "SELECT product_id, shape_id, amt FROM todays_plan"
+
+PLAN_SQL = "SELECT product_id, shape_id, amt FROM production_plan_rows(%s, %s)"
+
+
+# -- PostgreSQL numeric arithmetic, for rows near a rounding boundary --------
+
+HUNDRED = Decimal(100)
+ONE = Decimal(1)
+
+
+def _dscale(value):
+    return max(0, -value.as_tuple().exponent)
+
+
+def _weight_first(value):
+    """Base-10000 weight and leading digit group, as numeric stores them."""
+    if value == 0:
+        return 0, 0
+    weight = abs(value).adjusted() // 4
+    return weight, int(abs(value).scaleb(-4 * weight))
+
+
+def _round_fraction(value, places):
+    scaled = abs(value) * 10 ** places
+    n = (2 * scaled.numerator + scaled.denominator) // (2 * scaled.denominator)
+    sign = 1 if value < 0 and n else 0
+    return Decimal((sign, tuple(int(d) for d in str(n)), -places))
+
+
+def pg_div(a, b):
+    """numeric / numeric: select_div_scale() then a correctly rounded quotient."""
+    weight1, first1 = _weight_first(a)
+    weight2, first2 = _weight_first(b)
+    qweight = weight1 - weight2
+    if first1 <= first2:
+        qweight -= 1
+    rscale = max(16 - qweight * 4, _dscale(a), _dscale(b), 0)
+    return _round_fraction(Fraction(a) / Fraction(b), min(rscale, 1000))
+
+
+def pg_round(value, places):
+    rounded = value.quantize(Decimal(1).scaleb(-places), rounding=ROUND_HALF_UP)
+    return rounded.copy_abs() if rounded == 0 else rounded
+
+
+def exact_row(batch_weight, bakers_percent, total_bp, sour, poolish, soaker):
+    """One formula() row in numeric arithmetic: overall, sour, poolish, soaker, final."""
+    with localcontext() as ctx:
+        ctx.prec = 2000
+        g = pg_div(batch_weight * bakers_percent, total_bp)
+        return (pg_round(g, 0),
+                pg_round(pg_div(g * sour, HUNDRED), 0),
+                pg_round(pg_div(g * poolish, HUNDRED), 1),
+                pg_round(pg_div(g * soaker, HUNDRED), 0),
+                pg_round(g * (ONE - pg_div(sour + poolish + soaker, HUNDRED)), 0))
+
+
+# -- snapshot ----------------------------------------------------------------
+
+def _like(pattern):
+    """Case-insensitive matcher for a SQL LIKE pattern."""
+    parts = re.split(r'(%|_)', pattern.lower())
+    regex = ''.join('.*' if p == '%' else '.' if p == '_' else re.escape(p) for p in parts)
+    return re.compile(regex + r'\Z', re.DOTALL).match
+
+
+class Snapshot:
+    """Everything compute() needs, in flat arrays indexed by position."""
+
+    def __init__(self, products, recipe, ingredients, shapes, plan):
+        self.product_ids = [r[0] for r in products]
+        self.product_names = [r[1] for r in products]
+        product_at = {pid: n for n, pid in enumerate(self.product_ids)}
+
+        self.ingredient_ids = [r[0] for r in ingredients]
+        self.ingredient_names = [r[1] for r in ingredients]
+        self.is_flour = np.array([r[2] for r in ingredients], dtype=bool)
+        self.cost_per_g = [r[3] for r in ingredients]
+        ingredient_at = {iid: n for n, iid in enumerate(self.ingredient_ids)}
+
+        self.row_product = np.array([product_at[r[0]] for r in recipe], dtype=np.int64)
+        self.row_mod = [r[1] for r in recipe]
+        self.row_ingredient = np.array([ingredient_at[r[2]] for r in recipe], dtype=np.int64)
+        self.row_bp = np.array([r[3] for r in recipe], dtype=object)
+        self.row_sour = np.array([r[4] for r in recipe], dtype=object)
+        self.row_poolish = np.array([r[5] for r in recipe], dtype=object)
+        self.row_soaker = np.array([r[6] for r in recipe], dtype=object)
+
+        grams = {(r[0], r[1]): r[2] for r in shapes}
+        # amt * grams summed per product is exact in integers: plan amounts
+        # are whole numbers
+        self.batch_weight = np.zeros(len(self.product_ids), dtype=np.int64)
+        self.has_orders = np.zeros(len(self.product_ids), dtype=bool)
+        for pid, sid, amt in plan:
+            n = product_at[pid]
+            self.batch_weight[n] += int(amt) * grams[(pid, sid)]
+            self.has_orders[n] = True
+
+    @classmethod
+    def fetch(cls, bake_date=None):
+        """Load a snapshot; bake_date None reads todays_plan like formula()."""
+        with db.cursor() as cursor:
+            cursor.execute(PRODUCTS_SQL)
+            products = cursor.fetchall()
+            cursor.execute(RECIPE_SQL)
+            recipe = cursor.fetchall()
+            cursor.execute(INGREDIENTS_SQL)
+            ingredients = cursor.fetchall()
+            cursor.execute(SHAPES_SQL)
+            shapes = cursor.fetchall()
+            if bake_date is None:
+                cursor.execute(TODAYS_PLAN_SQL)
+            else:
+                cursor.execute(PLAN_SQL, (bake_date, bake_date))
+            plan = cursor.fetchall()
+        return cls(products, recipe, ingredients, shapes, plan)
+
+    def save(self, path):
+        with open(path, 'wb') as f:
+            pickle.dump(self, f)
+
+    @classmethod
+    def open(cls, path):
+        with open(path, 'rb') as f:
+            return pickle.load(f)
+
+    def variants(self):
+        """Row positions of every base recipe and every mod laid over its base.
+
+        Returns (variant_product, variant_mod, rows, row_variant).
+        """
+        base = np.array([m is None for m in self.row_mod])
+        base_rows = np.flatnonzero(base)
+        variant_product = list(range(len(self.product_ids)))
+        variant_mod = [None] * len(self.product_ids)
+        rows = [base_rows]
+        row_variant = [self.row_product[base_rows]]
+
+        mods = {}
+        for n in np.flatnonzero(~base):
+            mods.setdefault((int(self.row_product[n]), self.row_mod[n]), []).append(n)
+        for (product, mod), mod_rows in sorted(mods.items()):
+            v = len(variant_product)
+            variant_product.append(product)
+            variant_mod.append(mod)
+            mod_rows = np.array(mod_rows, dtype=np.int64)
+            kept = base_rows[(self.row_product[base_rows] == product)
+                             & ~np.isin(self.row_ingredient[base_rows],
+                                        self.row_ingredient[mod_rows])]
+            for part in (mod_rows, kept):
+                rows.append(part)
+                row_variant.append(np.full(len(part), v, dtype=np.int64))
+        return (np.array(variant_product, dtype=np.int64), variant_mod,
+                np.concatenate(rows).astype(np.int64), np.concatenate(row_variant))
+
+    def compute(self):
+        variant_product, variant_mod, rows, row_variant = self.variants()
+
+        bp = self.row_bp[rows]
+        # baker's percents are NUMERIC(5,2): hundredths add up exactly
+        bp_h = np.array([int(x.scaleb(2)) for x in bp], dtype=np.int64)
+        total_h = np.zeros(len(variant_product), dtype=np.int64)
+        np.add.at(total_h, row_variant, bp_h)
+
+        weight = self.batch_weight[variant_product[row_variant]].astype(np.float64)
+        sour = self.row_sour[rows].astype(np.float64)
+        poolish = self.row_poolish[rows].astype(np.float64)
+        soaker = self.row_soaker[rows].astype(np.float64)
+
+        g = weight * bp_h / total_h[row_variant]
+        raw = [(g, 0), (g * sour / 100, 0), (g * poolish / 100, 1), (g * soaker / 100, 0),
+               (g * (1 - (sour + poolish + soaker) / 100), 0)]
+        columns = []
+        near_tie = np.zeros(len(rows), dtype=bool)
+        for value, places in raw:
+            scaled = value * 10 ** places
+            distance = np.abs(np.abs(scaled) - np.floor(np.abs(scaled)) - 0.5)
+            near_tie |= distance < TIE_TOLERANCE
+            columns.append(np.sign(scaled) * np.floor(np.abs(scaled) + 0.5))
+
+        as_decimal = [[Decimal(int(x)).scaleb(-places) + 0 for x in col]
+                      for col, (_, places) in zip(columns, raw)]
+        for n in np.flatnonzero(near_tie):
+            v = row_variant[n]
+            exact = exact_row(Decimal(int(self.batch_weight[variant_product[v]])), bp[n],
+                              Decimal(int(total_h[v])).scaleb(-2), self.row_sour[rows[n]],
+                              self.row_poolish[rows[n]], self.row_soaker[rows[n]])
+            for col, value in zip(as_decimal, exact):
+                col[n] = value
+
+        return Result(self, variant_product, variant_mod, rows, row_variant,
+                      total_h, as_decimal, int(near_tie.sum()))
+
+
+class Result:
+    """Scaled formulas for every variant; rows come back in formula() order."""
+
+    def __init__(self, snap, variant_product, variant_mod, rows, row_variant, total_h,
+                 columns, exact_rows):
+        self.snap = snap
+        self.variant_product = variant_product
+        self.variant_mod = variant_mod
+        self.rows = rows
+        self.row_variant = row_variant
+        self.total_h = total_h
+        self.columns = columns
+        # how many rows needed the Decimal path
+        self.exact_rows = exact_rows
+
+    def total_bp(self, variant):
+        """bak_per() / bak_per2() for one variant."""
+        return Decimal(int(self.total_h[variant])).scaleb(-2)
+
+    def batch_weight(self, product):
+        """get_batch_weight() for one product position."""
+        return Decimal(int(self.snap.batch_weight[product]))
+
+    def _rows(self, variants, key):
+        snap = self.snap
+        picked = np.flatnonzero(np.isin(self.row_variant, variants))
+        order = sorted(picked, key=lambda n: (
+            key(self.row_variant[n]),
+            not snap.is_flour[snap.row_ingredient[self.rows[n]]],
+            -snap.row_bp[self.rows[n]],
+            snap.ingredient_names[snap.row_ingredient[self.rows[n]]]))
+        for n in order:
+            v = self.row_variant[n]
+            r = self.rows[n]
+            ingredient = snap.row_ingredient[r]
+            overall, sour, poolish, soaker, final = (col[n] for col in self.columns)
+            cpg = snap.cost_per_g[ingredient]
+            yield FormulaRow(snap.product_names[self.variant_product[v]], self.variant_mod[v],
+                             snap.row_bp[r], snap.ingredient_names[ingredient], overall, sour,
+                             poolish, soaker, final, None if cpg is None else overall * cpg)
+
+    def formula(self, pattern):
+        """Like formula(pattern): base recipes of products matching a LIKE pattern."""
+        match = _like(pattern)
+        names = self.snap.product_names
+        wanted = [v for v, p in enumerate(self.variant_product)
+                  if self.variant_mod[v] is None and match(names[p].lower())]
+        return list(self._rows(wanted, key=lambda v: self.snap.product_ids[self.variant_product[v]]))
+
+    def formula_all(self):
+        """Like formula_all(): every product on the plan, by product name."""
+        wanted = [v for v, p in enumerate(self.variant_product)
+                  if self.variant_mod[v] is None and self.snap.has_orders[p]]
+        return list(self._rows(wanted, key=lambda v: self.snap.product_names[self.variant_product[v]]))
+
+    def modded_formula(self, product_pattern, mod_pattern):
+        """Like modded_formula(): mods matching mod_pattern on matching products."""
+        product_match = _like(product_pattern)
+        mod_match = _like(mod_pattern)
+        names = self.snap.product_names
+        wanted = [v for v, p in enumerate(self.variant_product)
+                  if self.variant_mod[v] is not None and product_match(names[p].lower())
+                  and mod_match(self.variant_mod[v].lower())]
+        return list(self._rows(wanted, key=lambda v: (self.snap.product_ids[self.variant_product[v]],
+                                                      self.variant_mod[v])))
@@ -0,0 +1,91 @@
+import psycopg2
+
+import db
+
+# Name -> uuid lookups with the same rules as pid(), prid(), iid() and sid():
+# an exact case-insensitive match wins, otherwise the first LIKE match.
+# Hits are cached in-process; the name_change triggers send a NOTIFY on
+# every write to the four tables and the matching cache entries are dropped
+# before the next lookup.
+#
+# usage:
+#   resolve('party', 'Blow')
+#   resolve_many('product', ['rugbrod', 'kamut%'])
+
+KINDS = {
+    'party': ('parties', 'party_id', 'party_name'),
+    'product': ('products', 'product_id', 'product_name'),
+    'ingredient': ('ingredients', 'ingredient_id', 'ingredient_name'),
+    'shape': ('shapes', 'shape_id', 'shape_name'),
+}
+
+TABLE_KINDS = {table: kind for kind, (table, _, _) in KINDS.items()}
+
+RESOLVE_SQL = """
+SELECT n.name, m.id
+  FROM unnest(%s::text[]) AS n (name)
+  LEFT JOIN LATERAL
+       ((SELECT {id} FROM {table}
+          WHERE LOWER({col}) = LOWER(n.name) LIMIT 1)
+        UNION ALL
+        (SELECT {id} FROM {table}
+          WHERE LOWER({col}) LIKE LOWER(n.name) LIMIT 1)
+        LIMIT 1) AS m (id) ON TRUE
+"""
+
+_cache = {kind: {} for kind in KINDS}
+_listener = None
+
+
+def _listen():
+    global _listener
+    if _listener is None or _listener.closed:
+        _listener = psycopg2.connect(**db.connect_args())
+        _listener.autocommit = True
+        with _listener.cursor() as cursor:
+            cursor.execute("LISTEN name_change")
+        # anything cached before we were listening can't be trusted
+        clear()
+
+
+def _drain():
+    global _listener
+    try:
+        _listen()
+        _listener.poll()
+    except psycopg2.Error:
+        _listener = None
+        clear()
+        return
+    while _listener.notifies:
+        note = _listener.notifies.pop()
+        kind = TABLE_KINDS.get(note.payload)
+        if kind:
+            _cache[kind].clear()
+
+
+def clear(kind=None):
+    for k in ([kind] if kind else KINDS):
+        _cache[k].clear()
+
+
+def resolve_many(kind, names):
+    """Return {name: uuid or None} for every name, in at most one query."""
+    table, id_col, name_col = KINDS[kind]
+    _drain()
+    cache = _cache[kind]
+    found = {name: cache[name.lower()] for name in names if name.lower() in cache}
+    missing = list({name for name in names if name not in found})
+    if missing:
+        with db.cursor() as cursor:
+            cursor.execute(RESOLVE_SQL.format(id=id_col, table=table, col=name_col),
+                           (missing,))
+            for name, found_id in cursor.fetchall():
+                found[name] = found_id
+                if found_id is not None:
+                    cache[name.lower()] = found_id
+    return found
+
+
+def resolve(kind, name):
+    return resolve_many(kind, [name])[name]
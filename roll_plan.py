@@ -0,0 +1,39 @@
+import argparse
+import sys
+
+import db
+
+# Daily upkeep for the materialized production plan: move the window the
+# plan triggers maintain so it starts today, computing only the new dates
+# and dropping the rows for bake dates that have passed.
+# Safe to run more than once a day; a second run finds nothing to add.
+#
+# usage:
+#   python roll_plan.py                # today through today + 13
+#   python roll_plan.py --days 21
+#
+# e.g. from cron, shortly after midnight:
+#   5 0 * * *  cd /srv/bread && python roll_plan.py
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Roll the production plan window forward")
+    parser.add_argument('--days', type=int, default=14,
+                        help="bake days to keep materialized, starting today (default 14)")
+    args = parser.parse_args(argv)
+    if args.days < 1:
+        parser.error("--days must be at least 1")
+
+    with db.cursor() as cursor:
+        cursor.execute("SELECT roll_production_plan(%s)", (args.days,))
+        cursor.execute("SELECT from_date, to_date FROM production_plan_window")
+        from_date, to_date = cursor.fetchone()
+    print(f"production plan kept for {from_date} through {to_date}")
+    return 0
+
+
+if __name__ == '__main__':
+    try:
+        sys.exit(main())
+    finally:
+        db.close_all()
@@ -0,0 +1,42 @@
+import psycopg2.extras
+
+import db
+
+# Typo-tolerant lookups through fuzzy_search() and the trigram indexes.
+#
+# usage:
+#   fuzzy('madsin sourdoh')
+#   fuzzy('kamut', kinds=['product'], k=3, threshold=0.2)
+#   party_id = did_you_mean('party', 'Woodmen')
+
+THRESHOLD = 0.3
+
+
+def fuzzy(text, kinds=None, k=5, threshold=THRESHOLD):
+    """Best matches as (kind, id, name, score) rows, highest score first."""
+    with db.cursor(cursor_factory=psycopg2.extras.NamedTupleCursor) as cursor:
+        if kinds is None:
+            cursor.execute("SELECT * FROM fuzzy_search(%s, k => %s, threshold => %s)",
+                           (text, k, threshold))
+        else:
+            cursor.execute("SELECT * FROM fuzzy_search(%s, %s, %s, %s)",
+                           (text, list(kinds), k, threshold))
+        return cursor.fetchall()
+
+
+def did_you_mean(kind, text, k=5):
+    """Offer the closest names of one kind and return the chosen id, or None."""
+    matches = fuzzy(text, [kind], k)
+    if not matches:
+        print(f"No {kind} found that looks like {text!r}")
+        return None
+    print(f"No {kind} named {text!r}. Did you mean:")
+    for n, match in enumerate(matches, start=1):
+        print(f"    {n}) {match.name}")
+    print("    0) none of these")
+    choice = ''
+    while not choice.isdigit() or int(choice) > len(matches):
+        choice = input("pick a number: ")
+    if choice == '0':
+        return None
+    return matches[int(choice) - 1].id
@@ -0,0 +1,488 @@
+--sample data for a development database, loaded by: python bread.py --seed
+
+SET timezone = 'US/Central';
+
+INSERT INTO parties (party_type, party_name)
+VALUES 
+       ('i', 'Blow'),
+       ('i', 'Bar'),
+       ('o', 'Madison Sourdough'),
+       ('o', 'Meadowlark Organics'),
+       ('o', 'Woodmans'),
+       ('o', 'Willy St Coop'),
+       ('o', 'Costco'),
+       ('o', 'Kirkland'),
+       ('o', 'King Arthur'),
+       ('o', 'King Oscar'),
+       ('o', 'Redmond'),
+       ('o', 'LeSaffre'),
+       ('o', 'Siggis'),
+       ('o', 'Amazon'),
+       ('o', 'Montana Flour & Grain'),
+       ('o', 'New Glarus Brewery'),
+       ('o', 'Eden'),
+       ('o', 'Terrasoul'),
+       ('o', '4th & Heart'),
+       ('o', 'Ceylon Flavors'),
+       ('o', 'Now'),
+       ('o', 'Viva Naturals'),
+       ('o', 'Red Boat'),
+       ('o', 'Vitruvian'),
+       ('o', 'OrgaNICK'),
+       ('o', 'Willow Creek'),
+       ('o', 'FGO'),
+       ('o', 'The Spice Lab'),
+       ('o', 'Penzeys'),
+       ('o', 'Sassy Cow'),
+       ('o', 'Rani Brands'),
+       ('o', 'Dept of Revenue'),
+       ('o', 'OFood'),
+       ('o', 'Westside Farmers Market'),
+       ('i', 'Latte')
+;
+
+
+INSERT INTO zip_codes (zip, city, state)
+VALUES (53705, 'Madison', 'WI'),
+       (53703, 'Madison', 'WI'),
+       (53562, 'Middleton', 'WI')
+;
+
+INSERT INTO phones (party_id, phone_type, phone_no)
+VALUES 
+       (pid('Blow'), 'm', '555-1212'),
+       (pid('Blow'), 'w', '608-555-0000'),
+       (pid('Madison Sourdough'), 'b', '608-442-8009'),
+       (pid('Woodmans'), 'b', '608-555-1111'),
+       (pid('Bar'), 'm', '608-555-2222'),
+       (pid('Meadowlark Organics'), 'b', '608-555-3333'),
+       (pid('Bar'), 'e', '608-555-1234'),
+       (pid('Willy St Coop'), 'f', '608-000-0000')
+;
+
+INSERT INTO people_st (party_id, first_name)
+VALUES ((SELECT party_id FROM parties WHERE party_name = 'Blow' AND now() - modified < interval '10 sec'), 'Joe'),
+       ((SELECT party_id FROM parties WHERE party_name = 'Bar' AND now() - modified < interval '10 sec'), 'Foo'),
+       ((SELECT party_id FROM parties WHERE party_name = 'Latte' AND now() - modified < interval '10 sec'), 'Moka-Choka')
+;
+
+            --shapes
+INSERT INTO shapes (shape_name)
+VALUES 
+       ('12" boule'),
+       ('walter 25'),
+       ('16" pizza'),
+       ('baguette'),
+       ('truffle'),
+       ('100 grams'),
+       ('7" pita'),
+       ('hard rolls')
+;
+
+            --products
+INSERT INTO products (product_name, lead_time_days, is_dough)
+     VALUES
+            ('cranberry walnut', 2, TRUE),
+            ('pizza dough', 1, TRUE),
+            ('five day', 5, TRUE),
+            ('goji almond nyt', 2, TRUE),
+            ('rugbrod', 2, TRUE),
+            ('yeastie nuts', 0, FALSE),
+            ('cao cao truffles', 0, FALSE),
+            ('kamut sourdough', 2, TRUE),
+            ('leverpostej', 0, False),
+            ('pita bread', 1, TRUE)
+;
+
+
+INSERT INTO product_instructions (product_id, sequence, directions)
+     VALUES
+            (prid('leverpostej'), 0, 'have butcher grind liver and bacon/pork fat'),
+            (prid('leverpostej'), 1, 'weigh dry spices in mixing bowl'),
+            (prid('leverpostej'), 2, 'weigh milk, eggs, flour and whisk well'),
+            (prid('leverpostej'), 3, 'melt ghee & process in food processor with onions, shrooms, anchovies, hot sauce, ginger/garlic'),
+            (prid('leverpostej'), 4, 'coat baking pan with butter, then shake flour all the way around on all inside surfaces'),
+            (prid('leverpostej'), 5, 'gently fold all ingredients in large bowl, do not over-mix; pour into buttered/floured pan'),
+            (prid('leverpostej'), 6, 'bake in bain-marie at 350 F until internal temp is 176 F'),
+            (prid('leverpostej'), 7, 'if setting up in smoker, preheat on stove; in smoker--lid off dutch oven, add smoke wood'),
+            (prid('leverpostej'), 8, 'Place in an ice water bath for 45 minutes, then cover with wrap and chill in frig'),
+            (prid('cao%'), 1, 'grind spices in spice grinder'),
+            (prid('cao%'), 2, 'grind spices in juicer'),
+            (prid('cao%'), 3, 'add salt to nuts'),
+            (prid('cao%'), 4, 'grind nuts/salt/spices in juicer twice'),
+            (prid('cao%'), 5, 'alternate fruit with nut mixture in grinder'),
+            (prid('cao%'), 6, 'repeat previous step'),
+            (prid('cao%'), 7, 'alternate cao cao with nut/fruit mixter SLOWLY little at a time'),
+            (prid('cao%'), 8, 'repeat previous step'),
+            (prid('cao%'), 9, 'melt ghee/coconut oil, add monk fruit, one drop per truffle, and add to dries'),
+            (prid('cao%'), 10, 'form into balls and place on silpat and freeze for 30 min'),
+            (prid('cao%'), 11, 'wrap in wax paper')
+;
+
+--ingredients (use lower case)
+INSERT INTO ingredients (ingredient_name, is_flour)
+     VALUES 
+            ('bolted red fife flour', TRUE),
+            ('kamut flour', TRUE),
+            ('kamut berries', TRUE),
+            ('sprouted kamut berries', TRUE),
+            ('rye flour', TRUE),
+            ('all purpose flour', TRUE),
+            ('bread flour', TRUE),
+            ('water', FALSE),
+            ('high extraction flour', TRUE),
+            ('sea salt', FALSE),
+            ('leaven', FALSE),
+            ('saf-instant yeast', FALSE),
+            ('dried cranberries', FALSE),
+            ('walnuts', FALSE),
+            ('almonds', FALSE),
+            ('cashews', FALSE),
+            ('pistachios', FALSE),
+            ('turkey red flour', TRUE),
+            ('filmjolk', FALSE),
+            ('barley malt syrup', FALSE),
+            ('sprouted rye berries', FALSE),
+            ('sprouted spelt berries', FALSE),
+            ('whole flax seeds', FALSE),
+            ('ground flax seeds', FALSE),
+            ('sesame seeds', FALSE),
+            ('sunflower seeds', FALSE),
+            ('black sesame seeds', FALSE),
+            ('kefir whey', FALSE),
+            ('chia seeds', FALSE),
+            ('goji berries', FALSE),
+            ('dates', FALSE),
+            ('cardamom', FALSE),
+            ('smoked paprika', FALSE),
+            ('turmeric', FALSE),
+            ('ceylon cinnamon', FALSE),
+            ('nutmeg', FALSE),
+            ('monk fruit extract', FALSE),
+            ('red boat salt', FALSE),
+            ('anchovies', FALSE),
+            ('coconut oil', FALSE),
+            ('ghee', FALSE),
+            ('liver', FALSE),
+            ('heavy cream', FALSE),
+            ('whole milk', FALSE),
+            ('bacon', FALSE),
+            ('eggs', FALSE),
+            ('mushrooms', FALSE),
+            ('onions', FALSE),
+            ('fermented ginger/garlic', FALSE),
+            ('fermented hot sauce', FALSE),
+            ('black pepper', FALSE),
+            ('nutritional yeast', FALSE),
+            ('raw cao cao powder', FALSE),
+            ('anchovy sauce', FALSE),
+            ('pumpkin seeds', FALSE)
+;
+
+            --ingredient_costs
+INSERT INTO ingredient_costs (ingredient_id, maker_id, mio, seller_id, sio, cost, grams)
+     VALUES 
+            (iid('bolted red fife flour'), pid('Meadowlark%'), 'o', pid('Meadowlark%'), 'o', 7.00, 907),
+            (iid('kamut flour'), pid('Madison Sourdough'), 'o', pid('Madison Sourdough'), 'o', 5.20, 907),
+            (iid('kamut berries'), pid('Montana F%'), 'o', pid('Montana F%'), 'o', 29.15, 4536),
+            (iid('sprouted kamut berries'), pid('Montana F%'), 'o', pid('Montana F%'), 'o', 29.15, 4536),
+            (iid('rye flour'), pid('Madison Sourdough'), 'o', pid('Madison Sourdough'), 'o', 5.20, 907),
+            (iid('all purpose flour'), pid('King Arthur'), 'o', pid('Woodmans'), 'o', 2.20, 907),
+            (iid('bread flour'), pid('King Arthur'), 'o', pid('Woodmans'), 'o', 2.20, 907),
+            (iid('water'), pid('Woodmans'), 'o', pid('Woodmans'), 'o', .55, 3785),
+            (iid('kefir whey'), pid('Sassy Cow'), 'o', pid('Woodmans'), 'o', 7.00, 3900),
+            (iid('high extraction flour'), pid('Madison Sour%'), 'o', pid('Madison Sour%'), 'o', 5.20, 907),
+            (iid('sea salt'), pid('Redmond'), 'o', pid('Willy St%'), 'o', 1.25, 450),
+            (iid('leaven'), pid('Blow'), 'i', pid('Blow'), 'i', .75, 300),
+            (iid('saf-instant yeast'), pid('LeSaffre'), 'o', pid('Willy St Coop'), 'o', 2.50, 450),
+            (iid('dried cranberries'), pid('Willy St Coop'), 'o', pid('Willy St Coop'), 'o', 7.50, 450),
+            (iid('walnuts'), pid('Willy St Coop'), 'o', pid('Willy St Coop'), 'o', 7.50, 450),
+            (iid('almonds'), pid('Kirkland'), 'o', pid('Costco'), 'o', 10, 1360),
+            (iid('pistachios'), pid('Kirkland'), 'o', pid('Costco'), 'o', 10, 1360),
+            (iid('cashews'), pid('Kirkland'), 'o', pid('Costco'), 'o', 16.99, 1135),
+            (iid('turkey red flour'), pid('Meadowlark%'), 'o', pid('Meadowlark%'), 'o', 7.00, 907),
+            (iid('filmjolk'), pid('Siggis'), 'o', pid('Woodmans'), 'o', 4.00, 2000),
+            (iid('barley malt syrup'), pid('Eden'), 'o', pid('Willy St Coop'), 'o', 4.00, 566),
+            (iid('sprouted rye berries'), pid('Blow'), 'i', pid('Blow'), 'i', 1.50, 450),
+            (iid('sprouted spelt berries'), pid('Blow'), 'i', pid('Blow'), 'i', 1.50, 450),
+            (iid('whole flax seeds'), pid('Willy St Coop'), 'o', pid('Willy St Coop'), 'o', 3.00, 450),
+            (iid('ground flax seeds'), pid('Willy St Coop'), 'o', pid('Willy St Coop'), 'o', 3.00, 450),
+            (iid('sesame seeds'), pid('Willy St Coop'), 'o', pid('Willy St Coop'), 'o', 3.50, 450),
+            (iid('black sesame seeds'), pid('Terrasoul'), 'o', pid('Amazon'), 'o', 12.95, 907),
+            (iid('sunflower seeds'), pid('Terrasoul'), 'o', pid('Amazon'), 'o', 10.95, 907),
+            (iid('chia seeds'), pid('Terrasoul'), 'o', pid('Amazon'), 'o', 10.75, 1134),
+            (iid('anchovies'), pid('King Oscar'), 'o', pid('Amazon'), 'o', 12.30, 224),
+            (iid('goji berries'), pid('Terrasoul'), 'o', pid('Amazon'), 'o', 13.85, 454),
+            (iid('dates'), pid('Terrasoul'), 'o', pid('Amazon'), 'o', 14.95, 907),
+            (iid('nutritional yeast'), pid('Terrasoul'), 'o', pid('Amazon'), 'o', 8.43, 170),
+            (iid('raw cao cao powder'), pid('Terrasoul'), 'o', pid('Amazon'), 'o', 19.99, 1362),
+            (iid('coconut oil'), pid('Viva Naturals'), 'o', pid('Amazon'), 'o', 13.22, 473),
+            (iid('ghee'), pid('4th & Heart'), 'o', pid('Amazon'), 'o', 17.11, 454),
+            (iid('cardamom'), pid('Rani Brands'), 'o', pid('Amazon'), 'o', 13.99, 100),
+            (iid('red boat salt'), pid('Red Boat'), 'o', pid('Amazon'), 'o', 19.95, 250),
+            (iid('monk fruit extract'), pid('Now'), 'o', pid('Amazon'), 'o', 11.43, 59),
+            (iid('ceylon cinnamon'), pid('Ceylon Flavors'), 'o', pid('Amazon'), 'o', 10.99, 99),
+            (iid('nutmeg'), pid('Ceylon Flavors'), 'o', pid('Amazon'), 'o', 6.95, 100),
+            (iid('turmeric'), pid('FGO'), 'o', pid('Amazon'), 'o', 8.99, 226),
+            (iid('smoked paprika'), pid('The Spice Lab'), 'o', pid('Amazon'), 'o', 8.95, 130),
+            (iid('liver'), pid('Woodmans'), 'o', pid('Woodmans'), 'o', 5.00, 454),
+            (iid('heavy cream'), pid('Sassy%'), 'o', pid('Woodmans'), 'o', 4.50, 454),
+            (iid('whole milk'), pid('Sassy%'), 'o', pid('Woodmans'), 'o', 4.00, 1950),
+            (iid('bacon'), pid('Willow C%'), 'o', pid('Vitruvian'), 'o', 11.00, 454),
+            (iid('eggs'), pid('OrgaNICK%'), 'o', pid('Vitruvian'), 'o', 4.00, 600),
+            (iid('mushrooms'), pid('Vitruvian%'), 'o', pid('Vitruvian'), 'o', 10.00, 454),
+            (iid('onions'), pid('Woodmans%'), 'o', pid('Woodmans'), 'o', 2.00, 454),
+            (iid('fermented ginger/garlic'), pid('Blow'), 'i', pid('Blow'), 'i', 2.00, 454),
+            (iid('fermented hot sauce'), pid('Blow'), 'i', pid('Blow'), 'i', 2.00, 454),
+            (iid('black pepper'), pid('Penzeys'), 'o', pid('Penzeys'), 'o', 8.69, 94),
+            (iid('anchovy sauce'), pid('OFood'), 'o', pid('Amazon'), 'o', 14.38, 1000),
+            (iid('pumpkin seeds'), pid('Terrasoul'), 'o', pid('Amazon'), 'o', 13.75, 907)
+;
+
+INSERT INTO staff_st (party_id, party_type, ssn, is_active, hire_date,
+       street_no, street, zip)
+VALUES (pid('Blow'), 'i', '123-45-6789', TRUE, '2019-10-01', '2906', 'Barlow St', 53705),
+       (pid('Bar'), 'i', '121-21-2121', FALSE, '2017-12-30', '924', 'Williamson St', 53703),
+       (pid('Latte'), 'i', '123-45-6666', TRUE, '2019-12-07', '2906', 'Barlow St', 53705)
+;
+
+INSERT INTO organization_st (party_id, party_type, org_type)
+VALUES (pid('Madison Sourdough'), 'o', 'b'),
+       (pid('Meadowlark Organics'), 'o', 'b'),
+       (pid('Woodmans'), 'o', 'b'),
+       (pid('Willy St Coop'), 'o', 'c'),
+       (pid('King Arthur'), 'o', 'b'),
+       (pid('Dept of Revenue'), 'o', 'g'),
+       (pid('Westside Farmers Market'), 'o', 'n'),
+       (pid('Siggis'), 'o', 'b'),
+       (pid('Eden'), 'o', 'b'),
+       (pid('Redmond'), 'o', 'b'),
+       (pid('LeSaffre'), 'o', 'b')
+;
+
+INSERT INTO ein_numbs (party_id, party_type, ein)
+VALUES (pid('Madison Sourdough'), 'o', '01-23456789'),
+       (pid('Meadowlark Organics'), 'o', '11-11111111')
+;
+
+INSERT INTO emails (party_id, email_type, email)
+VALUES (pid('Blow'), 'p', 'bubba@gmail.com'),
+       (pid('Dept of Revenue'), 'w', 'punkinhead_sucks@traitors.com')
+;
+
+
+            --product_shapes (use lower case)
+INSERT INTO product_shapes (product_id, shape_id, grams)
+     VALUES (prid('kamut sourdough'), sid('12" boule'), 1600),
+            (prid('rugbrod'), sid('walter 25'), 1150),
+            (prid('pita bread'), sid('7" pita'), 105),
+            (prid('goji almond nyt'), sid('12" boule'), 1600),
+            (prid('five%'), sid('12" boule'), 1600),
+            (prid('cao cao%'), sid('truffle'), 24),
+            (prid('yeastie%'), sid('100 g%'), 100),
+            (prid('cranberry walnut'), sid('12" boule'), 1600),
+            (prid('cranberry walnut'), sid('hard rolls'), 120),
+            (prid('leverpostej'), sid('walter 25'), 1255),
+            (prid('pizza dough'), sid('16" pizza'), 400)
+;
+            
+           --product_ingredients(use lower case)products without preferments
+INSERT INTO product_ingredients (product_id, ingredient_id, bakers_percent)
+     VALUES (prid('cao%'), iid('raw cao cao powder'), 100),
+            (prid('cao%'), iid('ghee'), 33.35),
+            (prid('cao%'), iid('coconut oil'), 33.35),
+            (prid('cao%'), iid('dates'), 65),
+            (prid('cao%'), iid('almonds'), 13.74),
+            (prid('cao%'), iid('pumpkin seeds'), 26.43),
+            (prid('cao%'), iid('pistachios'), 26.43),
+            (prid('cao%'), iid('goji berries'), 13.3),
+            (prid('cao%'), iid('ceylon cinnamon'), 2.7),
+            (prid('cao%'), iid('sea salt'), 1.3),
+            (prid('cao%'), iid('red boat salt'), 1.3),
+            (prid('cao%'), iid('cardamom'), 0.67),
+            (prid('cao%'), iid('monk fruit extract'), 0.43),
+            (prid('yeastie%'), iid('almonds'), 100),
+            (prid('yeastie%'), iid('cashews'), 100),
+            (prid('yeastie%'), iid('coconut oil'), 77.8),
+            (prid('yeastie%'), iid('goji%'), 69.4),
+            (prid('yeastie%'), iid('nutritional%'), 45),
+            (prid('yeastie%'), iid('smoked paprika'), 2),
+            (prid('yeastie%'), iid('turmeric'), 2),
+            (prid('yeastie%'), iid('sea salt'), 2),
+            (prid('leverpostej'), iid('liver'), 100),
+            (prid('leverpostej'), iid('onions'), 19),
+            (prid('leverpostej'), iid('mushrooms'), 19),
+            (prid('leverpostej'), iid('ghee'), 19),
+            (prid('leverpostej'), iid('eggs'), 22),
+            (prid('leverpostej'), iid('bacon'), 40),
+            (prid('leverpostej'), iid('whole milk'), 32),
+            (prid('leverpostej'), iid('kamut flour'), 12.7),
+            (prid('leverpostej'), iid('red boat salt'), 1.5),
+            (prid('leverpostej'), iid('smoked paprika'), 0.8),
+            (prid('leverpostej'), iid('black pepper'), 0.3),
+            (prid('leverpostej'), iid('nutmeg'), 0.2),
+            (prid('leverpostej'), iid('anchovies'), 6.0),
+            (prid('leverpostej'), iid('fermented hot sauce'), 2.0),
+            (prid('leverpostej'), iid('fermented ginger/garlic'), 1.5)
+;
+
+            --product_ingredients(use lower case)
+INSERT INTO product_ingredients (product_id, ingredient_id, bakers_percent,
+            percent_in_sour, percent_in_poolish, percent_in_soaker)
+     VALUES (prid('kamut sourdough'), iid('kamut flour'), 60, 0, 0, 20),
+            (prid('kamut sourdough'), iid('high extraction flour'), 40, 33, 0, 20),
+            (prid('kamut sourdough'), iid('sprouted kamut berries'), 25, 0, 0, 0),
+            (prid('kamut sourdough'), iid('water'), 80, 20, 0, 18),
+            (prid('kamut sourdough'), iid('sea salt'), 2.2, 0, 0, 0),
+            (prid('cranberry walnut'), iid('kamut flour'), 40, 0, 0, 20),
+            (prid('cranberry walnut'), iid('all purpose flour'), 20, 36, 0, 0),
+            (prid('cranberry walnut'), iid('high extraction flour'), 40, 36, 0, 20),
+            (prid('cranberry walnut'), iid('water'), 70, 22, 0, 18),
+            (prid('cranberry walnut'), iid('sea salt'), 2.0, 0, 0, 0),
+            (prid('cranberry walnut'), iid('dried cranberries'), 25, 0, 0, 0),
+            (prid('cranberry walnut'), iid('walnuts'), 25, 0, 0, 0),
+            (prid('goji almond nyt'), iid('kamut flour'), 45, 0, 0, 40),
+            (prid('goji almond nyt'), iid('sprouted kamut berries'), 25, 0, 0, 0),
+            (prid('goji almond nyt'), iid('rye flour'), 10, 0, 0, 0),
+            (prid('goji almond nyt'), iid('high extraction flour'), 45, 12, 0, 28),
+            (prid('goji almond nyt'), iid('water'), 75, 5.4, 0, 30.6),
+            (prid('goji almond nyt'), iid('sea salt'), 2.0, 0, 0, 0),
+            (prid('goji almond nyt'), iid('goji berries'), 25, 0, 0, 0),
+            (prid('goji almond nyt'), iid('almonds'), 25, 0, 0, 0),
+            (prid('pita bread'), iid('bolted red fife flour'), 50, 0, 0, 0),
+            (prid('pita bread'), iid('all purpose flour'), 50, 5.4, 0, 0),
+            (prid('pita bread'), iid('water'), 64, 2.4, 0, 0),
+            (prid('pita bread'), iid('sea salt'), 1.9, 0, 0, 0),
+            (prid('pizza dough'), iid('bread flour'), 30, 0, 25, 0),
+            (prid('pizza dough'), iid('kamut flour'), 40, 0, 0, 0),
+            (prid('pizza dough'), iid('high extraction flour'), 30, 0, 0, 0),
+            (prid('pizza dough'), iid('water'), 68, 0, 20, 0),
+            (prid('pizza dough'), iid('sea salt'), 1.9, 0, 0, 0),
+            (prid('pizza dough'), iid('saf-instant yeast'), .05, 0, 100, 0),
+            (prid('rugbrod'), iid('rye flour'), 100, 27.3, 0, 0),
+            (prid('rugbrod'), iid('water'), 100, 45, 0, 18),
+            (prid('rugbrod'), iid('sunflower seeds'), 7.3, 0, 0, 100),
+            (prid('rugbrod'), iid('black sesame seeds'), 5.4, 0, 0, 100),
+            (prid('rugbrod'), iid('whole flax seeds'), 3.5, 0, 0, 100),
+            (prid('rugbrod'), iid('chia seeds'), 5.4, 0, 0, 100),
+            (prid('rugbrod'), iid('pumpkin seeds'), 36.4, 0, 0, 100),
+            (prid('rugbrod'), iid('ground flax seeds'), 6.36, 0, 0, 0),
+            (prid('rugbrod'), iid('sprouted kamut berries'), 29, 0, 0, 0),
+            (prid('rugbrod'), iid('kefir whey'), 40, 0, 0, 100),
+            (prid('rugbrod'), iid('sea salt'), 3.5, 0, 0, 0)
+;
+
+
+--any ingredient in this table will supercede dough_ingredient values
+--otherwise, all dough_ingredient values will be used
+INSERT INTO dough_mods (mod_name, product_id, ingredient_id, bakers_percent,
+       percent_in_sour, percent_in_poolish, percent_in_soaker)
+       VALUES ('cranberry', prid('kamut sourdough'), iid('dried cranberries'), 20, 0, 0, 0),
+              ('cranberry', prid('kamut sourdough'), iid('water'), 75, 20, 0, 18),
+              ('cranberry', prid('kamut sourdough'), iid('sea salt'), 2.0, 0, 0, 0)
+;
+
+            --special_orders
+INSERT INTO special_orders (delivery_date, customer_id, io, product_id,
+            shape_id, amt, modified)
+       VALUES 
+        --goji almond
+            --((SELECT now()::date + interval '2 days'), pid('Blow'), 'i', prid('goji%'), 
+                --sid('12" boule'), 1, (SELECT now())),
+
+        --five
+            ((SELECT now()::date + interval '5 days'), pid('Blow'), 'i', prid('five%'), 
+                sid('12" boule'), 1, (SELECT now())),
+
+        --kamut
+            ((SELECT now()::date + interval '2 days'), pid('Blow'), 'i', prid('kamut sourdough'), 
+                sid('12" boule'), 1, (SELECT now())),
+
+        --pizza
+            ((SELECT now()::date + interval '1 day'), pid('Blow'), 'i', prid('pizza dough'), 
+                sid('16" pizza'), 6, (SELECT now())),
+
+        --pita bread
+            ((SELECT now()::date + interval '1 day'), pid('Blow'), 'i', prid('pita bread'), 
+                sid('7" pita'), 8, (SELECT now())),
+
+        --pita bread
+            ((SELECT now()::date + interval '1 day'), pid('Bar'), 'i', prid('pita bread'), 
+                sid('7" pita'), 4, (SELECT now())),
+        
+        --rugbrod
+            --((SELECT now()::date + interval '2 days'), pid('Blow'), 'i', prid('rugbrod'), 
+                --sid('walter 25'), 2, (SELECT now())),
+
+        --cranberry walnut
+            ((SELECT now()::date + interval '2 days'), pid('Blow'), 'i', prid('cranberry walnut'), 
+                sid('hard rolls'), 4, (SELECT now())),
+        
+        --cranberry walnut
+            ((SELECT now()::date + interval '2 days'), pid('Blow'), 'i', prid('cranberry walnut'), 
+                sid('12" boule'), 1, (SELECT now()))
+;
+
+INSERT INTO days_of_week (dow_id, dow_names)
+       VALUES
+            (1, 'Mon'),
+            (2, 'Tue'),
+            (3, 'Wed'),
+            (4, 'Thu'),
+            (5, 'Fri'),
+            (6, 'Sat'),
+            (0, 'Sun')
+;
+
+--one row per item, the amount for each day from Sun (amts[1]) to Sat (amts[7])
+INSERT INTO standing_weekly (customer_id, io, product_id, shape_id, amts, modified)
+       VALUES
+            (pid('Blow'), 'i', prid('yeastie%'), sid('100%'), '{1,1,1,1,1,1,1}', (SELECT now())),
+            (pid('Blow'), 'i', prid('cao%'), sid('truffle'), '{50,50,50,50,50,50,50}', (SELECT now())),
+            (pid('Blow'), 'i', prid('goji%'), sid('12" boule'), '{1,1,1,1,1,1,1}', (SELECT now())),
+            (pid('Blow'), 'i', prid('kamut%'), sid('12" boule'), '{4,2,2,1,1,1,1}', (SELECT now())),
+            (pid('Blow'), 'i', prid('rugbrod'), sid('walter 25'), '{2,2,2,2,2,2,2}', (SELECT now())),
+            (pid('Blow'), 'i', prid('leverpostej'), sid('walter 25'), '{1,1,1,1,1,1,1}', (SELECT now()))
+;
+
+--make temporary change to standing orders
+INSERT INTO tmp_chng (day_of_week, customer_id, product_id, shape_id, start_date, resume_date, percent_multiplier)
+       VALUES
+            (1, pid('Blow'), prid('kamut sourdough'), sid('12" boule'), 
+            (SELECT now()::date + interval '2 days'), (SELECT now()::date + interval '7 days'), 50),
+        
+            (2, pid('Blow'), prid('kamut sourdough'), sid('12" boule'), 
+            (SELECT now()::date + interval '2 days'), (SELECT now()::date + interval '7 days'), 50),
+
+            (3, pid('Blow'), prid('kamut sourdough'), sid('12" boule'), 
+            (SELECT now()::date + interval '2 days'), (SELECT now()::date + interval '7 days'), 200),
+
+            (4, pid('Blow'), prid('kamut sourdough'), sid('12" boule'), 
+            (SELECT now()::date + interval '2 days'), (SELECT now()::date + interval '7 days'), 150),
+        
+            (5, pid('Blow'), prid('kamut sourdough'), sid('12" boule'), 
+            (SELECT now()::date + interval '8 days'), (SELECT now()::date + interval '14 days'), 300),
+
+            (6, pid('Blow'), prid('kamut sourdough'), sid('12" boule'), 
+            (SELECT now()::date + interval '2 days'), (SELECT now()::date + interval '7 days'), 200),
+
+            (0, pid('Blow'), prid('kamut sourdough'), sid('12" boule'), 
+            (SELECT now()::date + interval '2 days'), (SELECT now()::date + interval '7 days'), 50)
+;
+
+--Sunday's kamut
+UPDATE standing_weekly
+   SET amts[1] = 2
+ WhERE customer_id = pid('Blow')
+   AND product_id = prid('kam%');
+
+
+UPDATE parties
+SET party_name = 'Dept of Shenanigans'
+WHERE party_name Like 'Dept%';
+
+UPDATE ingredient_costs
+   SET cost = 6.00
+ WHERE ingredient_id = iid('kamut flour');
+
+SELECT rebuild_production_plan(now()::date, now()::date + 13);
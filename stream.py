@@ -0,0 +1,175 @@
+import argparse
+import itertools
+import json
+import os
+import sys
+from collections import namedtuple
+
+import db
+
+# Large results without holding them in memory. Queries run on a named
+# (server-side) cursor, and rows come over ITERSIZE at a time, so memory
+# stays flat however many rows there are. Rows are namedtuples, which carry
+# no per-row __dict__; columns() hands back the same data a batch at a time
+# as one tuple per column.
+#
+# usage:
+#   for row in rows("SELECT * FROM cost_change_list"):
+#       print(row.item, row.new_cost)
+#   for batch in columns("SELECT * FROM standing_change_history", itersize=10000):
+#       sum(batch['new_amt'])
+#   with open('costs.json', 'w') as f:
+#       write_json(f, "SELECT * FROM cost_change_list")
+#
+#   python stream.py cost_change_list > costs.csv
+#   python stream.py standing_change_history --since 2020-01-01 --format jsonl -o hist.jsonl
+#   python stream.py special_orders --since 2020-06-01 --until 2020-09-01 --format json
+#   python stream.py --query "SELECT * FROM formula_all()" --format csv
+
+# rows per round trip; bigger is faster and uses more memory
+ITERSIZE = int(os.environ.get('PGSTREAM_ITERSIZE', 2000))
+
+# name: (query, the column --since and --until filter on, its type)
+EXPORTS = {
+    'cost_change_list': ("SELECT * FROM cost_change_list", 'change_time', 'timestamptz'),
+    'standing_change_history': ("SELECT * FROM standing_change_history",
+                                'change_time', 'timestamptz'),
+    'special_orders': ("""
+SELECT * FROM
+       (SELECT so.delivery_date, p.party_name AS customer, pr.product_name AS product,
+               s.shape_name AS shape, so.amt, so.created, so.modified
+          FROM special_orders AS so
+          JOIN parties AS p ON so.customer_id = p.party_id
+          JOIN products AS pr ON so.product_id = pr.product_id
+          JOIN shapes AS s ON so.shape_id = s.shape_id) AS so""",
+                       'delivery_date', 'date'),
+}
+
+_cursor_names = itertools.count(1)
+
+
+def batches(sql, params=None, itersize=ITERSIZE):
+    """Yield (column names, list of up to itersize tuples) from a server-side cursor.
+
+    The connection stays checked out until the generator is exhausted or
+    closed; leaving the loop early closes the cursor and ends the read.
+    """
+    with db.connection() as conn:
+        with conn.cursor(name=f'stream_{os.getpid()}_{next(_cursor_names)}') as cursor:
+            cursor.itersize = itersize
+            cursor.execute(sql, params)
+            names = None
+            while True:
+                fetched = cursor.fetchmany(itersize)
+                if names is None:
+                    # a named cursor has no description until the first fetch
+                    names = [d[0] for d in cursor.description]
+                if not fetched:
+                    return
+                yield names, fetched
+
+
+def rows(sql, params=None, itersize=ITERSIZE):
+    """Yield every row as a namedtuple; column names that aren't identifiers
+    are renamed _0, _1, ... by position."""
+    row_type = None
+    for names, fetched in batches(sql, params, itersize):
+        if row_type is None:
+            row_type = namedtuple('Row', names, rename=True)
+        for row in fetched:
+            yield row_type._make(row)
+
+
+def columns(sql, params=None, itersize=ITERSIZE):
+    """Yield {column name: tuple of values} for each batch of rows."""
+    for names, fetched in batches(sql, params, itersize):
+        yield dict(zip(names, zip(*fetched)))
+
+
+def write_csv(f, sql, params=None):
+    """COPY the query's result to f as CSV with a header.
+
+    COPY streams straight from the server, so this needs no named cursor
+    and is the fastest way out.
+    """
+    with db.cursor() as cursor:
+        query = cursor.mogrify(sql, params).decode()
+        cursor.copy_expert(f"COPY ({query}) TO STDOUT WITH (FORMAT csv, HEADER)", f)
+
+
+def write_json(f, sql, params=None, itersize=ITERSIZE, lines=False):
+    """Write rows to f as one JSON array of objects, or JSON lines; returns the row count.
+
+    Numbers, dates and times that JSON has no type for are written as strings.
+    """
+    count = 0
+    if not lines:
+        f.write('[')
+    for names, fetched in batches(sql, params, itersize):
+        for row in fetched:
+            text = json.dumps(dict(zip(names, row)), default=str)
+            if lines:
+                f.write(text + '\n')
+            else:
+                f.write((',\n' if count else '\n') + text)
+            count += 1
+    if not lines:
+        f.write('\n]\n' if count else ']\n')
+    return count
+
+
+def export_query(name, since=None, until=None):
+    """The SQL and parameters for a named export limited to [since, until)."""
+    sql, column, kind = EXPORTS[name]
+    where = []
+    params = {}
+    if since is not None:
+        where.append(f"{column} >= %(since)s::{kind}")
+        params['since'] = since
+    if until is not None:
+        where.append(f"{column} < %(until)s::{kind}")
+        params['until'] = until
+    if where:
+        sql += "\n WHERE " + " AND ".join(where)
+    return sql + f"\n ORDER BY {column}", params or None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Stream a large query or export to CSV or JSON")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('export', nargs='?', choices=sorted(EXPORTS),
+                        help="what to export")
+    source.add_argument('--query', help="any SELECT, instead of a named export")
+    parser.add_argument('--since', help="first date or time to include")
+    parser.add_argument('--until', help="first date or time to leave out")
+    parser.add_argument('--format', choices=['csv', 'json', 'jsonl'], default='csv')
+    parser.add_argument('-o', '--out', help="output file (default stdout)")
+    parser.add_argument('--itersize', type=int, default=ITERSIZE,
+                        help=f"rows fetched per round trip (default {ITERSIZE})")
+    args = parser.parse_args(argv)
+
+    if args.query is not None:
+        if args.since or args.until:
+            parser.error("--since and --until only apply to a named export")
+        sql, params = args.query, None
+    else:
+        sql, params = export_query(args.export, args.since, args.until)
+
+    out = open(args.out, 'w', newline='') if args.out else sys.stdout
+    try:
+        if args.format == 'csv':
+            write_csv(out, sql, params)
+        else:
+            count = write_json(out, sql, params, args.itersize, lines=args.format == 'jsonl')
+            print(f"{count} rows", file=sys.stderr)
+    finally:
+        if args.out:
+            out.close()
+    return 0
+
+
+if __name__ == '__main__':
+    try:
+        sys.exit(main())
+    finally:
+        db.close_all()